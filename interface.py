@@ -172,11 +172,12 @@ class CHESSInterface:
             logging.error(f"Preprocessed directory not found: {preprocessed_path}")
             return False
         
-        required_files = [f"{db_id}_lsh.pkl", f"{db_id}_minhashes.pkl"]
-        for file in required_files:
-            if not (preprocessed_path / file).exists():
-                logging.error(f"Required preprocessed file not found: {preprocessed_path / file}")
-                return False
+        # Either the signature snapshot or, for older builds, the LSH pickles
+        snapshot_files = [f"{db_id}_minhashes.npy", f"{db_id}_minhashes.json"]
+        pickle_files = [f"{db_id}_lsh.pkl", f"{db_id}_minhashes.pkl"]
+        if not any(all((preprocessed_path / file).exists() for file in files) for files in (snapshot_files, pickle_files)):
+            logging.error(f"Required preprocessed LSH files not found in {preprocessed_path}")
+            return False
         
         return True
 
@@ -3,14 +3,14 @@ from typing import Dict, Any, Optional
 from dotenv import load_dotenv
 
 from database_utils.database_interface import DatabaseInterface
-from src.runner.sqlite_manager import SQLiteDatabaseManager
-from src.runner.mysql_manager import MySQLDatabaseManager
 
 load_dotenv(override=True)
 
 class DatabaseFactory:
     """
     Factory class to create the appropriate database manager based on configuration.
+    The manager modules are imported on first use, so a SQLite run never loads the MySQL
+    driver and pool, and vice versa.
     """
     
     @staticmethod
@@ -36,6 +36,7 @@ class DatabaseFactory:
                 if not db_name:
                     raise ValueError("MySQL database name not provided in config")
                 
+                from src.runner.mysql_manager import MySQLDatabaseManager
                 return MySQLDatabaseManager(db_name=db_name, db_id=db_id)
             else:
                 # Default to SQLite
@@ -46,6 +47,7 @@ class DatabaseFactory:
                 if not db_mode or not db_id:
                     raise ValueError("SQLite mode and id must be provided in config")
                     
+                from src.runner.sqlite_manager import SQLiteDatabaseManager
                 return SQLiteDatabaseManager(db_mode=db_mode, db_id=db_id)
         except Exception as e:
             raise ValueError(f"Failed to create database manager: {e}")
@@ -69,9 +71,11 @@ class DatabaseFactory:
         if db_type == "mysql":
             # Get MySQL-specific database name
             db_name = os.getenv("DB_NAME", db_id)
+            from src.runner.mysql_manager import MySQLDatabaseManager
             return MySQLDatabaseManager(db_name=db_name, db_id=db_id)
         else:
             # Default to SQLite
+            from src.runner.sqlite_manager import SQLiteDatabaseManager
             return SQLiteDatabaseManager(db_mode=db_mode, db_id=db_id)
             
     @staticmethod
@@ -89,6 +93,7 @@ class DatabaseFactory:
         db_type = os.getenv("DB_TYPE", "sqlite").lower()
         
         if db_type == "mysql":
+            from src.runner.mysql_manager import MySQLDatabaseManager
             return MySQLDatabaseManager(db_name=db_name, db_id=None)
         else:
             raise ValueError(f"Direct database name connection only supported for MySQL, not {db_type}")
\ No newline at end of file
@@ -1,5 +1,5 @@
 import os
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, Iterable, List, Any, Optional, Tuple
 from abc import ABC, abstractmethod
 
 
@@ -9,6 +9,9 @@ class DatabaseInterface(ABC):
     Implementations include both core database operations and specialized
     functionality for LSH/MinHash and vector storage/search.
     """
+    # Whether one instance may be handed to several independent callers (see DatabaseManager).
+    # Implementations keeping transaction state on the instance must set this to False.
+    shareable = True
 
     @abstractmethod
     def connect(self) -> None:
@@ -34,6 +37,26 @@ class DatabaseInterface(ABC):
         """
         pass
 
+    def execute_many(self, query: str, seq_of_params: Iterable[tuple]) -> Dict[str, Any]:
+        """
+        Execute one SQL statement for each parameter tuple. Implementations should override
+        this with a batched call; the default executes the statement once per tuple.
+        
+        Args:
+            query (str): SQL statement to execute
+            seq_of_params (Iterable[tuple]): Parameters for each execution
+            
+        Returns:
+            Dict[str, Any]: Dictionary containing execution results
+        """
+        rowcount = 0
+        for params in seq_of_params:
+            result = self.execute_sql(query, params)
+            if not result["success"]:
+                return result
+            rowcount += result["rowcount"] or 0
+        return {"success": True, "results": None, "rowcount": rowcount, "error": None}
+
     @abstractmethod
     def get_db_schema(self) -> Dict[str, List[str]]:
         """
@@ -74,6 +97,22 @@ class DatabaseInterface(ABC):
         """
         pass
 
+    def store_vectors_bulk(self, vectors: List[List[float]], metadatas: List[Dict[str, Any]], source_ids: List[str]) -> List[str]:
+        """
+        Store many vectors at once. Implementations should override this
+        with a batched insert; the default stores the vectors one at a time.
+        
+        Args:
+            vectors (List[List[float]]): The vector embeddings to store
+            metadatas (List[Dict[str, Any]]): Associated metadata, one per vector
+            source_ids (List[str]): Identifiers for the source documents/data, one per vector
+            
+        Returns:
+            List[str]: Identifiers for the stored vectors
+        """
+        return [self.store_vector(vector, metadata, source_id)
+                for vector, metadata, source_id in zip(vectors, metadatas, source_ids)]
+
     @abstractmethod
     def query_vector_db(self, query_vector: List[float], top_k: int, filter_criteria: Dict[str, Any] = None) -> List[Dict[str, Any]]:
         """
@@ -102,6 +141,18 @@ class DatabaseInterface(ABC):
         """
         pass
 
+    def store_lsh_signatures_bulk(self, rows: Iterable[Tuple[str, int, str, str]], chunk_size: int = 10000) -> None:
+        """
+        Store many LSH signatures at once. Implementations should override this
+        with a batched insert; the default stores the rows one at a time.
+        
+        Args:
+            rows (Iterable[Tuple[str, int, str, str]]): (signature_hash, bucket_id, data_ref, source_id) rows
+            chunk_size (int, optional): Maximum number of rows sent per batch
+        """
+        for signature_hash, bucket_id, data_ref, source_id in rows:
+            self.store_lsh_signature(signature_hash, bucket_id, data_ref, source_id)
+
     @abstractmethod
     def query_lsh(self, query_signature: List[str], top_n: int) -> List[Dict[str, Any]]:
         """
@@ -1,34 +1,153 @@
 import os
+import json
+import shutil
+import hashlib
+import functools
 from pathlib import Path
 import logging
+import numpy as np
+import chromadb
+from typing import Any, Dict, List, Optional, Sequence, Union
 from dotenv import load_dotenv
-from langchain_chroma import Chroma
 from langchain.schema.document import Document
+from langchain_core.embeddings import Embeddings
 from langchain_openai import OpenAIEmbeddings
-from langchain_google_vertexai import VertexAIEmbeddings
-from google.oauth2 import service_account
-from google.cloud import aiplatform
-import vertexai
 
 from database_utils.db_catalog.csv_utils import load_tables_description
 
 load_dotenv(override=True)
 
-GCP_PROJECT = os.getenv("GCP_PROJECT")
-GCP_REGION = os.getenv("GCP_REGION")
-GCP_CREDENTIALS = os.getenv("GCP_CREDENTIALS")
+# langchain_chroma's default collection, so Chroma(persist_directory=...) readers find the data
+CONTEXT_COLLECTION_NAME = "langchain"
+# Chroma ingests fastest in the 50-250 documents per add() band
+CHROMA_BATCH_SIZE = 250
+# OpenAI embedding models reject inputs over 8191 tokens; leave some headroom
+EMBEDDING_MAX_TOKENS = 8000
 
-if GCP_CREDENTIALS and GCP_PROJECT and GCP_REGION:
-    aiplatform.init(
-    project=GCP_PROJECT,
-    location=GCP_REGION,
-    credentials=service_account.Credentials.from_service_account_file(GCP_CREDENTIALS)
-    )
-    vertexai.init(project=GCP_PROJECT, location=GCP_REGION, credentials=service_account.Credentials.from_service_account_file(GCP_CREDENTIALS))
+
+@functools.lru_cache(maxsize=1)
+def get_embedding_function() -> Embeddings:
+    """
+    Returns the shared embedding model, constructing it on first use.
+
+    Returns:
+        Embeddings: The embedding function used for the context vector database.
+    """
+    return OpenAIEmbeddings(model=os.getenv("EMBED_MODEL", "text-embedding-3-large"))
+
+
+@functools.lru_cache(maxsize=1)
+def _get_tokenizer() -> Optional[Any]:
+    """
+    Returns the tiktoken encoding matching the embedding model, loaded once.
+
+    Returns:
+        Optional[Any]: The encoding, or None if tiktoken or its data is unavailable.
+    """
+    try:
+        import tiktoken
+        try:
+            return tiktoken.encoding_for_model(os.getenv("EMBED_MODEL", "text-embedding-3-large"))
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logging.warning(f"Tokenizer unavailable, embedding inputs will not be length-checked: {e}")
+        return None
+
+
+def _truncate_for_embedding(text: str) -> str:
+    """
+    Truncates a text to EMBEDDING_MAX_TOKENS so a single long input cannot fail a whole batch.
+
+    Args:
+        text (str): The text to embed.
+
+    Returns:
+        str: The text, cut at the token limit if it exceeded it.
+    """
+    tokenizer = _get_tokenizer()
+    if tokenizer is None:
+        return text
+    tokens = tokenizer.encode(text)
+    if len(tokens) <= EMBEDDING_MAX_TOKENS:
+        return text
+    logging.warning(f"Truncating embedding input from {len(tokens)} to {EMBEDDING_MAX_TOKENS} tokens")
+    return tokenizer.decode(tokens[:EMBEDDING_MAX_TOKENS])
+
+
+def __getattr__(name: str) -> Any:
+    # Backward compatibility for code still importing the old module-level constant
+    if name == "EMBEDDING_FUNCTION":
+        logging.warning("EMBEDDING_FUNCTION is deprecated, use get_embedding_function() instead")
+        return get_embedding_function()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-# EMBEDDING_FUNCTION = VertexAIEmbeddings(model_name="text-embedding-004")#OpenAIEmbeddings(model="text-embedding-3-large")
-EMBEDDING_FUNCTION = OpenAIEmbeddings(model="text-embedding-3-large")
+def encode_vector(vector: Union[Sequence[float], np.ndarray]) -> bytes:
+    """
+    Packs an embedding into a little-endian float32 buffer for binary storage.
+
+    Args:
+        vector (Sequence[float] or np.ndarray): The embedding to pack.
+
+    Returns:
+        bytes: The raw float32 bytes (4 bytes per dimension).
+    """
+    return np.asarray(vector, dtype="<f4").tobytes()
+
+
+def load_vector(row: Union[Dict[str, Any], bytes]) -> np.ndarray:
+    """
+    Restores an embedding stored with `encode_vector`.
+
+    Args:
+        row (Dict[str, Any] or bytes): A result row holding the packed buffer under `vector`, or the buffer itself.
+
+    Returns:
+        np.ndarray: The float32 embedding.
+    """
+    buffer = row["vector"] if isinstance(row, dict) else row
+    return np.frombuffer(buffer, dtype="<f4")
+
+
+def _compute_docs_hash(docs: List[Document]) -> str:
+    """
+    Computes a stable fingerprint of the documents to be embedded.
+
+    Args:
+        docs (List[Document]): The documents destined for the vector database.
+
+    Returns:
+        str: The SHA-256 hex digest over the sorted (text_chunk_id, content) pairs.
+    """
+    hasher = hashlib.sha256()
+    for chunk_id, content in sorted((str(doc.metadata.get("text_chunk_id", "")), doc.page_content) for doc in docs):
+        hasher.update(chunk_id.encode("utf-8"))
+        hasher.update(b"\0")
+        hasher.update(content.encode("utf-8"))
+        hasher.update(b"\0")
+    return hasher.hexdigest()
+
+
+def _make_chunk_ids(docs: List[Document]) -> List[str]:
+    """
+    Derives stable ChromaDB ids from the documents' text_chunk_id metadata.
+    Repeated chunk ids get a positional suffix so every id stays unique.
+
+    Args:
+        docs (List[Document]): The documents to be stored.
+
+    Returns:
+        List[str]: One id per document, in the same order.
+    """
+    seen: Dict[str, int] = {}
+    ids = []
+    for i, doc in enumerate(docs):
+        chunk_id = str(doc.metadata.get("text_chunk_id", f"chunk_{i}"))
+        count = seen.get(chunk_id, 0)
+        seen[chunk_id] = count + 1
+        ids.append(chunk_id if count == 0 else f"{chunk_id}#{count}")
+    return ids
 
 
 def make_db_context_vec_db(db_directory_path: str, db_manager=None, text_chunks=None, ids=None, source_id_list=None, metadata_list=None, database_manager=None, **kwargs) -> None:
@@ -91,9 +210,12 @@ def make_db_context_vec_db(db_directory_path: str, db_manager=None, text_chunks=
                     "value_description": column_info.get('value_description', '') if use_value_description else "",
                     "text_chunk_id": f"{table_name}_{column_name}"
                 }
-                for key in ['column_name', 'column_description', 'value_description']:
-                    if column_info.get(key, '').strip():
-                        docs.append(Document(page_content=column_info[key], metadata=metadata))
+                # One fused document per column instead of one per non-empty field
+                fields = [key for key in ['column_name', 'column_description', 'value_description'] if metadata[key].strip()]
+                if fields:
+                    metadata["field_mask"] = ",".join(fields)
+                    content = " | ".join(metadata[key].strip() for key in fields)
+                    docs.append(Document(page_content=content, metadata=metadata))
     else:
         raise ValueError("Either db_directory_path or text_chunks/ids must be provided")
         
@@ -106,30 +228,29 @@ def make_db_context_vec_db(db_directory_path: str, db_manager=None, text_chunks=
         
         # Compute embeddings for all documents
         logging.info(f"Computing {len(docs)} embeddings")
-        texts = [doc.page_content for doc in docs]
+        texts = [_truncate_for_embedding(doc.page_content) for doc in docs]
         
         # Handle empty document case
         if not texts:
             logging.warning("No text content to embed")
             return
             
-        embeddings = EMBEDDING_FUNCTION.embed_documents(texts)
+        # Keep embeddings as one float32 matrix; rows are packed to bytes on storage
+        embeddings = np.asarray(get_embedding_function().embed_documents(texts), dtype=np.float32)
         
-        # Store each vector using the database manager
+        # Store the vectors through the database manager in bounded batches
         logging.info(f"Storing vectors in database")
-        for i, doc in enumerate(docs):
-            # Extract source_id from metadata or use default
-            source_id = doc.metadata.get("source_id", db_id)
-            
-            # Store through database interface
+        for start in range(0, len(docs), CHROMA_BATCH_SIZE):
+            batch = docs[start:start + CHROMA_BATCH_SIZE]
             try:
-                db_manager.store_vector(
-                    vector=embeddings[i],
-                    metadata=doc.metadata,
-                    source_id=source_id
+                db_manager.store_vectors_bulk(
+                    vectors=embeddings[start:start + CHROMA_BATCH_SIZE],
+                    metadatas=[doc.metadata for doc in batch],
+                    # Extract source_id from metadata or use default
+                    source_ids=[doc.metadata.get("source_id", db_id) for doc in batch]
                 )
             except Exception as e:
-                logging.error(f"Error storing vector {i}: {e}")
+                logging.error(f"Error storing vectors {start}-{start + len(batch) - 1}: {e}")
             
         logging.info(f"Successfully stored {len(docs)} vectors using database manager")
     else:
@@ -138,12 +259,37 @@ def make_db_context_vec_db(db_directory_path: str, db_manager=None, text_chunks=
             raise ValueError("db_directory_path must be provided for ChromaDB storage")
             
         vector_db_path = Path(db_directory_path) / "context_vector_db"
+        manifest_path = vector_db_path / "manifest.json"
+        docs_hash = _compute_docs_hash(docs)
 
-        if vector_db_path.exists():
-            os.system(f"rm -r {vector_db_path}")
+        # Skip the embed + store cost entirely when the inputs have not changed
+        if manifest_path.exists():
+            try:
+                with open(manifest_path, "r") as file:
+                    if json.load(file).get("hash") == docs_hash:
+                        logging.info(f"Context vector database at {vector_db_path} is up to date, skipping rebuild")
+                        return
+            except (OSError, ValueError) as e:
+                logging.warning(f"Could not read manifest {manifest_path}: {e}")
 
+        shutil.rmtree(vector_db_path, ignore_errors=True)
         vector_db_path.mkdir(exist_ok=True)
 
-        # Store documents directly in ChromaDB
-        Chroma.from_documents(docs, EMBEDDING_FUNCTION, persist_directory=str(vector_db_path))
+        # Embed once up front, then stream into ChromaDB in bounded batches
+        embeddings = get_embedding_function().embed_documents([_truncate_for_embedding(doc.page_content) for doc in docs]) if docs else []
+        chunk_ids = _make_chunk_ids(docs)
+        client = chromadb.PersistentClient(path=str(vector_db_path))
+        collection = client.get_or_create_collection(CONTEXT_COLLECTION_NAME)
+        for start in range(0, len(docs), CHROMA_BATCH_SIZE):
+            end = start + CHROMA_BATCH_SIZE
+            collection.upsert(
+                ids=chunk_ids[start:end],
+                embeddings=embeddings[start:end],
+                documents=[doc.page_content for doc in docs[start:end]],
+                metadatas=[doc.metadata for doc in docs[start:end]]
+            )
+
+        # Written last so an interrupted build is never mistaken for a complete one
+        with open(manifest_path, "w") as file:
+            json.dump({"hash": docs_hash}, file)
         logging.info(f"Context vector database created at {vector_db_path}")
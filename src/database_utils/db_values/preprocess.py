@@ -1,12 +1,180 @@
+import os
+import re
+import json
+import time
+import hashlib
+import functools
 import pickle
+import sqlite3
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor
 from datasketch import MinHash, MinHashLSH
 from pathlib import Path
 from tqdm import tqdm
 import logging
-from typing import Dict, List, Any, Tuple
+import numpy as np
+from typing import Dict, List, Any, Tuple, Iterable, Iterator, Optional, NamedTuple
 
 from database_utils.execution import execute_sql
 
+# Upper bound on concurrent table scans in _get_unique_values
+UNIQUE_VALUES_MAX_WORKERS = 8
+
+# Read buffer for the LSH pickles; much larger than the 8 KiB default to cut read syscalls
+PICKLE_BUFFER_SIZE = 1 << 20
+
+# Files make_db_lsh may leave in a database's preprocessed directory, after the db_id prefix
+LSH_FILE_SUFFIXES = ("_lsh.pkl", "_minhashes.pkl", "_minhashes.npz", "_minhashes.npy",
+                     "_minhashes.json", "_minhashes.bloom.npy")
+
+# Number of newly hashed values between two LSH checkpoints in make_lsh
+LSH_CHECKPOINT_INTERVAL = 10000
+
+# Number of signature rows make_lsh buffers before sending them to the database manager
+SIGNATURE_BATCH_SIZE = 10000
+
+# Connection settings for the read-only DISTINCT scans: a larger page cache, in-memory
+# temp b-trees for DISTINCT, and memory-mapped reads of the database file
+SQLITE_SCAN_PRAGMAS = (
+    "PRAGMA cache_size=-200000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=30000000000",
+)
+
+# Bits set per n-gram in the 64-bit n-gram Bloom signatures stored next to the MinHashes
+BLOOM_HASHES = 5
+
+# Columns that look like identifiers, contact details or timestamps are not worth indexing
+_SKIP_COLUMN_RE = re.compile(r"(?i:_id| id|url|email|web|time|phone|date|address)|Id$")
+
+class MinHashEntry(NamedTuple):
+    """
+    A value indexed in the LSH: its MinHash and where the value comes from.
+    Still a tuple, so code unpacking the former plain 4-tuples keeps working.
+    """
+    minhash: MinHash
+    table_name: str
+    column_name: str
+    value: str
+
+def _quote_identifier(identifier: str) -> str:
+    """
+    Quotes a table or column name for use in MySQL or SQLite statements.
+
+    Args:
+        identifier (str): The raw identifier.
+
+    Returns:
+        str: The backtick-quoted identifier with embedded backticks escaped.
+    """
+    return "`" + identifier.replace("`", "``") + "`"
+
+def _build_distinct_values_query(table_name: str, column_name: str, columns_by_table: Dict[str, List[Tuple[str, str]]]) -> str:
+    """
+    Builds the DISTINCT query for a column after checking it against the known schema.
+
+    Args:
+        table_name (str): The table to scan.
+        column_name (str): The column to fetch distinct values from.
+        columns_by_table (Dict[str, List[Tuple[str, str]]]): Column names and types per table.
+
+    Returns:
+        str: The SQL query selecting the column's distinct non-null values.
+
+    Raises:
+        ValueError: If the table or column is not part of the schema.
+    """
+    if column_name not in {name for name, _ in columns_by_table.get(table_name, [])}:
+        raise ValueError(f"Unknown column {table_name}.{column_name}")
+    column = _quote_identifier(column_name)
+    return f"SELECT DISTINCT {column} FROM {_quote_identifier(table_name)} WHERE {column} IS NOT NULL"
+
+def _iter_sqlite_column(db_path: str, query: str, timeout: int = 480, batch_size: int = 1000) -> Iterator[Any]:
+    """
+    Streams the first column of a SQLite query without materializing the full result.
+
+    Args:
+        db_path (str): The path to the SQLite database.
+        query (str): The query to run.
+        timeout (int, optional): Seconds after which the query is interrupted.
+        batch_size (int, optional): Number of rows pulled per fetchmany call.
+
+    Yields:
+        Any: The first column of each row.
+    """
+    deadline = time.monotonic() + timeout
+    connection = sqlite3.connect(db_path, timeout=60)
+    try:
+        # A non-zero return from the progress handler aborts the running statement
+        connection.set_progress_handler(lambda: time.monotonic() > deadline, 100000)
+        for pragma in SQLITE_SCAN_PRAGMAS:
+            connection.execute(pragma)
+        cursor = connection.execute(query)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield row[0]
+    finally:
+        connection.close()
+
+def _collect_distinct_values(values: Iterable[Any], column_name: str) -> Optional[List[str]]:
+    """
+    Accumulates a column's distinct values, giving up as soon as the column can no longer
+    satisfy the size heuristic in `_get_unique_values`.
+
+    Args:
+        values (Iterable[Any]): The streamed distinct values.
+        column_name (str): The name of the column being scanned.
+
+    Returns:
+        Optional[List[str]]: The values as strings, or None if the scan was abandoned.
+    """
+    max_sum_of_lengths = 5000000 if "name" in column_name.lower() else 2000000
+    collected: List[str] = []
+    sum_of_lengths = 0
+    for value in values:
+        value = str(value)
+        collected.append(value)
+        sum_of_lengths += len(value)
+        if sum_of_lengths >= max_sum_of_lengths and len(collected) >= 100:
+            return None
+    return collected
+
+def _fetch_distinct_values_buffered(db_manager, table_name: str, column_name: str, query: str) -> Optional[List[str]]:
+    """
+    Fetches a column's distinct values through `execute_sql` for managers that cannot stream.
+    Measures the column on the server first, so columns over the size limits are never transferred.
+
+    Args:
+        db_manager: The database manager.
+        table_name (str): The table to scan.
+        column_name (str): The column to fetch distinct values from.
+        query (str): The DISTINCT query from `_build_distinct_values_query`.
+
+    Returns:
+        Optional[List[str]]: The values as strings, or None if the column is too large.
+    """
+    max_sum_of_lengths = 5000000 if "name" in column_name.lower() else 2000000
+    result = db_manager.execute_sql(
+        f"SELECT SUM(LENGTH(unique_values)), COUNT(unique_values) FROM ("
+        f"SELECT DISTINCT {_quote_identifier(column_name)} AS unique_values FROM {_quote_identifier(table_name)} "
+        f"WHERE {_quote_identifier(column_name)} IS NOT NULL) AS subquery"
+    )
+    if not result["success"] or not result["results"]:
+        return []
+    sum_of_lengths, count_distinct = list(result["results"][0].values())
+    if not count_distinct:
+        return []
+    if sum_of_lengths >= max_sum_of_lengths and count_distinct >= 100:
+        return None
+
+    result = db_manager.execute_sql(query)
+    if not result["success"] or not result["results"]:
+        return []
+    return [str(row[column_name]) for row in result["results"]]
+
 def _get_unique_values(db_interface) -> Dict[str, Dict[str, List[str]]]:
     """
     Retrieves unique text values from the database excluding primary keys.
@@ -27,131 +195,140 @@ def _get_unique_values(db_interface) -> Dict[str, Dict[str, List[str]]]:
         db_manager = db_interface
         is_sqlite = False
     
-    # Get table names based on database type
+    # Fetch every table's columns in a single round-trip and group them in Python
+    columns_by_table: Dict[str, List[Tuple[str, str]]] = {}
+    primary_keys_lc = set()
     if is_sqlite:
-        result = execute_sql(db_path, "SELECT name FROM sqlite_master WHERE type='table';", fetch="all")
-        table_names = [table[0] for table in result]
+        query = """
+            SELECT m.name, p.name, p.type, p.pk
+            FROM sqlite_master AS m
+            JOIN pragma_table_info(m.name) AS p
+            WHERE m.type = 'table'
+            ORDER BY m.name, p.cid
+        """
+        rows = execute_sql(db_path, query, fetch="all")
     else:
-        schema = db_manager.get_db_schema()
-        table_names = list(schema.keys())
-    
-    # Get primary keys
-    primary_keys = []
-    for table_name in table_names:
-        if is_sqlite:
-            columns = execute_sql(db_path, f"PRAGMA table_info('{table_name}')", fetch="all")
-            for column in columns:
-                if column[5] > 0:  # Check if it's a primary key
-                    column_name = column[1]
-                    if column_name.lower() not in [c.lower() for c in primary_keys]:
-                        primary_keys.append(column_name)
-        else:
-            # For MySQL, query information_schema
-            query = f"""
-                SELECT COLUMN_NAME
-                FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE
-                WHERE TABLE_SCHEMA = '{db_manager.db_name}'
-                AND TABLE_NAME = '{table_name}'
-                AND CONSTRAINT_NAME = 'PRIMARY'
-            """
-            result = db_manager.execute_sql(query)
-            if result["success"] and result["results"]:
-                for row in result["results"]:
-                    column_name = row["COLUMN_NAME"]
-                    if column_name.lower() not in [c.lower() for c in primary_keys]:
-                        primary_keys.append(column_name)
+        query = """
+            SELECT TABLE_NAME, COLUMN_NAME, DATA_TYPE, COLUMN_KEY
+            FROM INFORMATION_SCHEMA.COLUMNS
+            WHERE TABLE_SCHEMA = %s
+            ORDER BY TABLE_NAME, ORDINAL_POSITION
+        """
+        result = db_manager.execute_sql_rows(query, (db_manager.db_name,))
+        rows = []
+        if result["success"] and result["rows"]:
+            rows = [
+                (table_name, column_name, data_type, 1 if column_key == "PRI" else 0)
+                for table_name, column_name, data_type, column_key in result["rows"]
+            ]
+
+    for table_name, column_name, data_type, pk in rows:
+        columns_by_table.setdefault(table_name, []).append((column_name, data_type))
+        if pk > 0:  # Check if it's a primary key
+            primary_keys_lc.add(column_name.lower())
     
-    # Process tables and columns
-    unique_values: Dict[str, Dict[str, List[str]]] = {}
-    for table_name in table_names:
-        if table_name == "sqlite_sequence" or table_name in ["lsh_signatures", "vector_metadata"]:
-            continue
-            
+    def scan_table(table_name: str) -> Tuple[str, Dict[str, List[str]]]:
+        """Collects the distinct values of one table's eligible text columns."""
+        table_columns = columns_by_table[table_name]
         logging.info(f"Processing {table_name}")
-        
+    
         # Get text columns
         if is_sqlite:
-            columns_result = execute_sql(db_path, f"PRAGMA table_info('{table_name}')", fetch="all")
-            columns = [col[1] for col in columns_result if ("TEXT" in col[2] and col[1].lower() not in [c.lower() for c in primary_keys])]
+            columns = [name for name, data_type in table_columns if ("TEXT" in data_type and name.lower() not in primary_keys_lc)]
         else:
-            # For MySQL, query information_schema
-            query = f"""
-                SELECT COLUMN_NAME, DATA_TYPE
-                FROM INFORMATION_SCHEMA.COLUMNS
-                WHERE TABLE_SCHEMA = '{db_manager.db_name}'
-                AND TABLE_NAME = '{table_name}'
-            """
-            result = db_manager.execute_sql(query)
-            columns = []
-            if result["success"] and result["results"]:
-                for row in result["results"]:
-                    column_name = row["COLUMN_NAME"]
-                    data_type = row["DATA_TYPE"]
-                    if (data_type in ["varchar", "text", "char", "longtext"] and 
-                        column_name.lower() not in [c.lower() for c in primary_keys]):
-                        columns.append(column_name)
-        
+            columns = [
+                name for name, data_type in table_columns
+                if data_type in ["varchar", "text", "char", "longtext"] and name.lower() not in primary_keys_lc
+            ]
+    
         table_values: Dict[str, List[str]] = {}
-        
+    
         for column in columns:
-            if any(keyword in column.lower() for keyword in ["_id", " id", "url", "email", "web", "time", "phone", "date", "address"]) or column.endswith("Id"):
+            if _SKIP_COLUMN_RE.search(column):
                 continue
 
+            # Single streamed pass that stops early once the column is known to be too large
+            query = _build_distinct_values_query(table_name, column, columns_by_table)
             try:
-                # Query to count and measure distinct values
-                query = f"""
-                    SELECT SUM(LENGTH(unique_values)), COUNT(unique_values)
-                    FROM (
-                        SELECT DISTINCT `{column}` AS unique_values
-                        FROM `{table_name}`
-                        WHERE `{column}` IS NOT NULL
-                    ) AS subquery
-                """
-                
                 if is_sqlite:
-                    result = execute_sql(db_path, query, fetch="one", timeout=480)
+                    with closing(_iter_sqlite_column(db_path, query)) as rows:
+                        values = _collect_distinct_values(rows, column)
+                elif hasattr(db_manager, "iter_sql"):
+                    # Unbuffered cursor, so an abandoned scan never holds the whole column
+                    with closing(db_manager.iter_sql(query)) as batches:
+                        values = _collect_distinct_values((row[column] for batch in batches for row in batch), column)
                 else:
-                    result_dict = db_manager.execute_sql(query)
-                    if result_dict["success"] and result_dict["results"]:
-                        result = (
-                            list(result_dict["results"][0].values())[0],
-                            list(result_dict["results"][0].values())[1]
-                        )
-                    else:
-                        result = 0, 0
-            except:
-                result = 0, 0
-
-            sum_of_lengths, count_distinct = result
-            if sum_of_lengths is None or count_distinct == 0:
+                    values = _fetch_distinct_values_buffered(db_manager, table_name, column, query)
+            except Exception as e:
+                logging.warning(f"Failed to fetch distinct values for {table_name}.{column}: {e}")
+                values = []
+
+            if values is None:
+                logging.info(f"Column: {column} exceeds the size limits, skipping")
+                continue
+
+            count_distinct = len(values)
+            if count_distinct == 0:
                 continue
 
+            sum_of_lengths = sum(len(value) for value in values)
             average_length = sum_of_lengths / count_distinct
             logging.info(f"Column: {column}, sum_of_lengths: {sum_of_lengths}, count_distinct: {count_distinct}, average_length: {average_length}")
-            
+        
             if ("name" in column.lower() and sum_of_lengths < 5000000) or (sum_of_lengths < 2000000 and average_length < 25) or count_distinct < 100:
-                logging.info(f"Fetching distinct values for {column}")
-                try:
-                    query = f"SELECT DISTINCT `{column}` FROM `{table_name}` WHERE `{column}` IS NOT NULL"
-                    
-                    if is_sqlite:
-                        result = execute_sql(db_path, query, fetch="all", timeout=480)
-                        values = [str(value[0]) for value in result]
-                    else:
-                        result_dict = db_manager.execute_sql(query)
-                        if result_dict["success"] and result_dict["results"]:
-                            values = [str(row[column]) for row in result_dict["results"]]
-                        else:
-                            values = []
-                except:
-                    values = []
                 logging.info(f"Number of different values: {len(values)}")
                 table_values[column] = values
-        
-        unique_values[table_name] = table_values
+    
+        return table_name, table_values
+
+    table_names = [
+        table_name for table_name in columns_by_table
+        if table_name != "sqlite_sequence" and table_name not in ["lsh_signatures", "vector_metadata"]
+    ]
+
+    # Tables are independent, so overlap their scans. SQLite scans open their own
+    # connections; the MySQL manager shares one cursor, so it stays sequential.
+    max_workers = UNIQUE_VALUES_MAX_WORKERS if is_sqlite else 1
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        unique_values: Dict[str, Dict[str, List[str]]] = dict(executor.map(scan_table, table_names))
 
     return unique_values
 
+def _ngrams(string: str, n_gram: int) -> List[bytes]:
+    """
+    Splits a string into its UTF-8 encoded character n-grams.
+
+    Args:
+        string (str): The input string.
+        n_gram (int): The n-gram size.
+
+    Returns:
+        List[bytes]: The encoded n-grams, in order.
+    """
+    if string.isascii():
+        # One encode, then byte slices; identical to per-gram encoding when every character is one byte
+        encoded = string.encode('ascii')
+        return [encoded[i:i + n_gram] for i in range(len(encoded) - n_gram + 1)]
+    return [string[i:i + n_gram].encode('utf8') for i in range(len(string) - n_gram + 1)]
+
+def _ngram_bloom(string: str, n_gram: int) -> int:
+    """
+    Computes a 64-bit Bloom signature of a string's n-gram set, a cheap proxy for n-gram overlap.
+
+    Args:
+        string (str): The input string.
+        n_gram (int): The n-gram size.
+
+    Returns:
+        int: The Bloom bits, as an integer in [0, 2**64).
+    """
+    bloom = 0
+    for ngram in set(_ngrams(string, n_gram)):
+        digest = int.from_bytes(hashlib.blake2b(ngram, digest_size=8).digest(), "little")
+        for i in range(BLOOM_HASHES):
+            bloom |= 1 << ((digest >> (6 * i)) & 63)
+    return bloom
+
 def _create_minhash(signature_size: int, string: str, n_gram: int) -> MinHash:
     """
     Creates a MinHash object for a given string.
@@ -165,10 +342,36 @@ def _create_minhash(signature_size: int, string: str, n_gram: int) -> MinHash:
         MinHash: The MinHash object for the input string.
     """
     m = MinHash(num_perm=signature_size)
-    for d in [string[i:i + n_gram] for i in range(len(string) - n_gram + 1)]:
-        m.update(d.encode('utf8'))
+    # One vectorized permutation pass over all n-grams instead of one update() per n-gram
+    m.update_batch(_ngrams(string, n_gram))
     return m
 
+def convert_to_signatures_batch(keywords: List[str], signature_size: int = 100, n_gram: int = 3) -> List[List[str]]:
+    """
+    Converts several keywords to MinHash signatures at once.
+    The permutation parameters are generated once and shared by the whole batch,
+    and the signatures are identical to those of `convert_to_signature`.
+
+    Args:
+        keywords (List[str]): The keywords to convert.
+        signature_size (int, optional): The size of the MinHash signature.
+        n_gram (int, optional): The n-gram size for the MinHash.
+
+    Returns:
+        List[List[str]]: One signature per keyword, as lists of string-formatted hash values.
+    """
+    minhashes = MinHash.bulk([_ngrams(keyword, n_gram) for keyword in keywords], num_perm=signature_size)
+    return [_signature_strings(minhash) for minhash in minhashes]
+
+def _signature_strings(minhash: MinHash) -> List[str]:
+    # NumPy's C-level uint64 -> str conversion instead of one str() call per hash value
+    return minhash.digest().astype("<U20", copy=False).tolist()
+
+@functools.lru_cache(maxsize=4096)
+def _cached_signature(keyword: str, signature_size: int, n_gram: int) -> Tuple[str, ...]:
+    # Keywords recur across retries and turns, so their signatures are memoized
+    return tuple(convert_to_signatures_batch([keyword], signature_size, n_gram)[0])
+
 def convert_to_signature(keyword: str, signature_size: int = 100, n_gram: int = 3) -> List[str]:
     """
     Converts a keyword to a MinHash signature (list of hash values).
@@ -181,9 +384,8 @@ def convert_to_signature(keyword: str, signature_size: int = 100, n_gram: int =
     Returns:
         List[str]: The MinHash signature as a list of string-formatted hash values.
     """
-    query_minhash = _create_minhash(signature_size, keyword, n_gram)
-    # Convert to list of strings for storage/transmission
-    return [str(h) for h in query_minhash.digest()]
+    # Copy, so callers cannot modify the cached signature
+    return list(_cached_signature(keyword, signature_size, n_gram))
 
 def skip_column(column_name: str, column_values: List[str]) -> bool:
     """
@@ -202,10 +404,105 @@ def skip_column(column_name: str, column_values: List[str]) -> bool:
     average_length = sum_of_lengths / len(column_values)
     return (sum_of_lengths > 50000) and (average_length > 20)
 
+def _store_signature_batch(db_manager, batch: List[Tuple[str, int, str, str]]) -> None:
+    """
+    Stores a batch of (signature_hash, bucket_id, data_ref, source_id) entries through the database manager.
+
+    Args:
+        db_manager (DatabaseInterface): Database manager for MySQL storage.
+        batch (List[Tuple[str, int, str, str]]): The signature entries to store.
+    """
+    db_manager.store_lsh_signatures_bulk(batch)
+
+def _unique_values_fingerprint(unique_values: Dict[str, Dict[str, List[str]]]) -> str:
+    """
+    Hashes the values an LSH is built from, so a checkpoint is only resumed over identical input.
+    MinHash keys are positional, so any changed value would otherwise be silently skipped.
+
+    Args:
+        unique_values (Dict[str, Dict[str, List[str]]]): The values per table and column.
+
+    Returns:
+        str: The SHA-256 hex digest of the values.
+    """
+    digest = hashlib.sha256()
+    for table_name, table_values in unique_values.items():
+        for column_name, column_values in table_values.items():
+            digest.update(f"{table_name}\0{column_name}\0{len(column_values)}\0".encode("utf-8"))
+            for value in column_values:
+                digest.update(str(value).encode("utf-8"))
+                digest.update(b"\0")
+    return digest.hexdigest()
+
+def _start_lsh_checkpoint(checkpoint_path: Path, signature_size: int, n_gram: int, fingerprint: str) -> None:
+    """
+    Starts a new checkpoint file holding only the header that later records are appended to.
+
+    Args:
+        checkpoint_path (Path): The checkpoint file.
+        signature_size (int): The MinHash signature size used.
+        n_gram (int): The n-gram size used.
+        fingerprint (str): The `_unique_values_fingerprint` of the input.
+    """
+    temp_path = Path(f"{checkpoint_path}.tmp")
+    with open(temp_path, "wb") as file:
+        pickle.dump({"signature_size": signature_size, "n_gram": n_gram, "fingerprint": fingerprint},
+                    file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, checkpoint_path)
+
+def _append_lsh_checkpoint(checkpoint_path: Path, minhashes: Dict[str, Tuple[MinHash, str, str, str]]) -> None:
+    """
+    Appends the MinHashes computed since the previous checkpoint as one record.
+
+    Args:
+        checkpoint_path (Path): The checkpoint file started by `_start_lsh_checkpoint`.
+        minhashes (Dict[str, Tuple[MinHash, str, str, str]]): The new MinHashes only.
+    """
+    with open(checkpoint_path, "ab") as file:
+        pickle.dump(minhashes, file, protocol=pickle.HIGHEST_PROTOCOL)
+        file.flush()
+        os.fsync(file.fileno())
+
+def _load_lsh_checkpoint(checkpoint_path: Path, signature_size: int, n_gram: int,
+                         fingerprint: str) -> Dict[str, Tuple[MinHash, str, str, str]]:
+    """
+    Loads the MinHashes saved by a previous interrupted run.
+
+    Args:
+        checkpoint_path (Path): The checkpoint file.
+        signature_size (int): The MinHash signature size expected.
+        n_gram (int): The n-gram size expected.
+        fingerprint (str): The `_unique_values_fingerprint` of the current input.
+
+    Returns:
+        Dict[str, Tuple[MinHash, str, str, str]]: The saved MinHashes, or an empty dict if there is no
+            usable checkpoint for these parameters and values.
+    """
+    if not os.path.exists(checkpoint_path):
+        return {}
+    minhashes: Dict[str, Tuple[MinHash, str, str, str]] = {}
+    try:
+        with open(checkpoint_path, "rb", buffering=PICKLE_BUFFER_SIZE) as file:
+            header = pickle.load(file)
+            if (not isinstance(header, dict) or header.get("signature_size") != signature_size
+                    or header.get("n_gram") != n_gram or header.get("fingerprint") != fingerprint):
+                logging.warning(f"Ignoring LSH checkpoint {checkpoint_path} created with different parameters or values")
+                return {}
+            while True:
+                try:
+                    minhashes.update(pickle.load(file))
+                except EOFError:
+                    break
+    except Exception as e:
+        # A record cut short by the interruption; everything before it is still valid
+        logging.warning(f"Stopped reading LSH checkpoint {checkpoint_path} at an unreadable record: {e}")
+    return minhashes
+
 def make_lsh(unique_values: Dict[str, Dict[str, List[str]]] = None, signature_size: int = 128, n_gram: int = 3, threshold: float = 0.01, 
           verbose: bool = True, db_manager = None, source_id: str = None,
           table_values: List[str] = None, table_value_ids: List[str] = None, source_id_list: List[str] = None,
-          num_perm: int = None, database_manager = None) -> Tuple[MinHashLSH, Dict[str, Tuple[MinHash, str, str, str]]]:
+          num_perm: int = None, database_manager = None,
+          checkpoint_path: Optional[Path] = None) -> Tuple[MinHashLSH, Dict[str, MinHashEntry]]:
     """
     Creates a MinHash LSH from unique values or provided table values.
     This function supports two calling styles for backward compatibility:
@@ -225,9 +522,11 @@ def make_lsh(unique_values: Dict[str, Dict[str, List[str]]] = None, signature_si
         table_value_ids (List[str], optional): Alternative input - IDs for each value.
         source_id_list (List[str], optional): Alternative input - source ID for each value.
         num_perm (int, optional): Alternative param name for signature_size.
+        checkpoint_path (Path, optional): File used to periodically save progress in dictionary mode,
+            and to resume from it on the next run.
 
     Returns:
-        Tuple[MinHashLSH, Dict[str, Tuple[MinHash, str, str, str]]]: The MinHash LSH object and the dictionary of MinHashes.
+        Tuple[MinHashLSH, Dict[str, MinHashEntry]]: The MinHash LSH object and the dictionary of MinHashes.
     """
     # Handle alternative parameter name for db_manager
     if database_manager is not None and db_manager is None:
@@ -242,7 +541,7 @@ def make_lsh(unique_values: Dict[str, Dict[str, List[str]]] = None, signature_si
     # Create LSH structure for traditional storage even if using MySQL
     # This ensures compatibility with existing code
     lsh = MinHashLSH(threshold=threshold, num_perm=signature_size)
-    minhashes: Dict[str, Tuple[MinHash, str, str, str]] = {}
+    minhashes: Dict[str, MinHashEntry] = {}
     
     try:
         # Determine which mode we're using based on parameters
@@ -255,7 +554,7 @@ def make_lsh(unique_values: Dict[str, Dict[str, List[str]]] = None, signature_si
             
             # For MySQL batch operations
             if use_mysql:
-                batch_size = 100
+                batch_size = SIGNATURE_BATCH_SIZE
                 current_batch = []
             
             # Process each value in the flat lists
@@ -269,19 +568,19 @@ def make_lsh(unique_values: Dict[str, Dict[str, List[str]]] = None, signature_si
                 minhash_key = value_id
                 
                 # Store in memory dictionary
-                minhashes[minhash_key] = (minhash, "test_table", "text_column", value)
+                minhashes[minhash_key] = MinHashEntry(minhash, "test_table", "text_column", value)
                 lsh.insert(minhash_key, minhash)
                 
                 # Store in MySQL if requested
                 if use_mysql:
                     # Get signature hashes
-                    signature = minhash.digest()
+                    signature = _signature_strings(minhash)
                     
                     # For each hash in the signature, create a batch entry
                     for bucket_id, sig_hash in enumerate(signature):
                         # Add to current batch
                         current_batch.append((
-                            str(sig_hash),  # signature_hash
+                            sig_hash,       # signature_hash
                             bucket_id,      # bucket_id
                             minhash_key,    # data_reference
                             item_source_id  # source_id
@@ -290,25 +589,13 @@ def make_lsh(unique_values: Dict[str, Dict[str, List[str]]] = None, signature_si
                         # Process batch if it's full
                         if len(current_batch) >= batch_size:
                             # Store the batch in MySQL
-                            for entry in current_batch:
-                                db_manager.store_lsh_signature(
-                                    signature_hash=entry[0],
-                                    bucket_id=entry[1],
-                                    data_ref=entry[2],
-                                    source_id=entry[3]
-                                )
+                            _store_signature_batch(db_manager, current_batch)
                             # Clear the batch
                             current_batch = []
             
             # Process any remaining batch items for MySQL
             if use_mysql and current_batch:
-                for entry in current_batch:
-                    db_manager.store_lsh_signature(
-                        signature_hash=entry[0],
-                        bucket_id=entry[1],
-                        data_ref=entry[2],
-                        source_id=entry[3]
-                    )
+                _store_signature_batch(db_manager, current_batch)
                 
         elif unique_values:
             # Original dictionary-style mode
@@ -320,9 +607,26 @@ def make_lsh(unique_values: Dict[str, Dict[str, List[str]]] = None, signature_si
             # For MySQL batch operations
             if use_mysql:
                 # For larger datasets, process in batches
-                batch_size = 100
+                batch_size = SIGNATURE_BATCH_SIZE
                 current_batch = []
             
+            # Resume from a previous interrupted run if a checkpoint is available
+            done_keys = set()
+            if checkpoint_path is not None:
+                fingerprint = _unique_values_fingerprint(unique_values)
+                minhashes.update(_load_lsh_checkpoint(checkpoint_path, signature_size, n_gram, fingerprint))
+                for minhash_key, (minhash, _, _, _) in minhashes.items():
+                    lsh.insert(minhash_key, minhash)
+                done_keys = set(minhashes)
+                if done_keys:
+                    logging.info(f"Resuming LSH creation with {len(done_keys)} values from checkpoint")
+                # Rewrite from the header down, dropping a stale checkpoint or a truncated last record
+                _start_lsh_checkpoint(checkpoint_path, signature_size, n_gram, fingerprint)
+                if minhashes:
+                    _append_lsh_checkpoint(checkpoint_path, minhashes)
+            # MinHashes computed since the last checkpoint; only these are appended to it
+            pending_checkpoint: Dict[str, MinHashEntry] = {}
+            
             for table_name, table_values in unique_values.items():
                 for column_name, column_values in table_values.items():
                     if column_name.lower() == "doctype":
@@ -332,24 +636,29 @@ def make_lsh(unique_values: Dict[str, Dict[str, List[str]]] = None, signature_si
                     logging.info(f"Processing {table_name} - {column_name} - {len(column_values)}")
                     
                     for id, value in enumerate(column_values):
+                        minhash_key = f"{table_name}_{column_name}_{id}"
+                        if minhash_key in done_keys:
+                            if verbose:
+                                progress_bar.update(1)
+                            continue
+                        
                         # Create minhash signature
                         minhash = _create_minhash(signature_size, value, n_gram)
-                        minhash_key = f"{table_name}_{column_name}_{id}"
                         
                         # Store in memory dictionary for traditional LSH
-                        minhashes[minhash_key] = (minhash, table_name, column_name, value)
+                        minhashes[minhash_key] = MinHashEntry(minhash, table_name, column_name, value)
                         lsh.insert(minhash_key, minhash)
                         
                         # Store in MySQL if requested
                         if use_mysql:
                             # Get signature hashes
-                            signature = minhash.digest()
+                            signature = _signature_strings(minhash)
                             
                             # For each hash in the signature, create a batch entry
                             for bucket_id, sig_hash in enumerate(signature):
                                 # Add to current batch
                                 current_batch.append((
-                                    str(sig_hash),  # signature_hash
+                                    sig_hash,       # signature_hash
                                     bucket_id,      # bucket_id
                                     minhash_key,    # data_reference
                                     source_id       # source_id
@@ -358,28 +667,26 @@ def make_lsh(unique_values: Dict[str, Dict[str, List[str]]] = None, signature_si
                                 # Process batch if it's full
                                 if len(current_batch) >= batch_size:
                                     # Store the batch in MySQL
-                                    for entry in current_batch:
-                                        db_manager.store_lsh_signature(
-                                            signature_hash=entry[0],
-                                            bucket_id=entry[1],
-                                            data_ref=entry[2],
-                                            source_id=entry[3]
-                                        )
+                                    _store_signature_batch(db_manager, current_batch)
                                     # Clear the batch
                                     current_batch = []
                         
+                        if checkpoint_path is not None:
+                            pending_checkpoint[minhash_key] = minhashes[minhash_key]
+                        if len(pending_checkpoint) >= LSH_CHECKPOINT_INTERVAL:
+                            # Flush pending signatures first so the checkpoint never covers unstored rows
+                            if use_mysql and current_batch:
+                                _store_signature_batch(db_manager, current_batch)
+                                current_batch = []
+                            _append_lsh_checkpoint(checkpoint_path, pending_checkpoint)
+                            pending_checkpoint = {}
+                        
                         if verbose:
                             progress_bar.update(1)
             
             # Process any remaining batch items for MySQL
             if use_mysql and current_batch:
-                for entry in current_batch:
-                    db_manager.store_lsh_signature(
-                        signature_hash=entry[0],
-                        bucket_id=entry[1],
-                        data_ref=entry[2],
-                        source_id=entry[3]
-                    )
+                _store_signature_batch(db_manager, current_batch)
             
             if progress_bar:
                 progress_bar.close()
@@ -391,8 +698,135 @@ def make_lsh(unique_values: Dict[str, Dict[str, List[str]]] = None, signature_si
     
     return lsh, minhashes
 
+def save_minhash_signatures(path: Path, minhashes: Dict[str, Tuple[MinHash, str, str, str]],
+                            lsh: Optional[MinHashLSH] = None, n_gram: int = 3) -> None:
+    """
+    Saves the MinHashes in columnar form: `<path>.npy` holds one (N, num_perm) uint64 signature
+    matrix, `<path>.bloom.npy` the n-gram Bloom signature of each value, and `<path>.json` the keys
+    and their (table, column, value) metadata in row order.
+
+    Args:
+        path (Path): The snapshot path, without extension.
+        minhashes (Dict[str, Tuple[MinHash, str, str, str]]): The MinHashes produced by make_lsh.
+        lsh (MinHashLSH, optional): The LSH built over them; its band layout is recorded so the
+            index can be rebuilt from the signatures alone.
+        n_gram (int, optional): The n-gram size the MinHashes were built with.
+    """
+    keys = list(minhashes)
+    if keys:
+        signatures = np.stack([minhashes[key][0].hashvalues for key in keys]).astype(np.uint64)
+    else:
+        signatures = np.empty((0, 0), dtype=np.uint64)
+    # datasketch >= 2.0 needs the hashing scheme to rebuild a MinHash from its hash values
+    scheme = getattr(minhashes[keys[0]][0], "scheme", None) if keys else None
+    bands, rows = (lsh.b, lsh.r) if lsh is not None else (0, 0)
+    metadata = {
+        "keys": keys,
+        "meta": [[str(field) for field in minhashes[key][1:]] for key in keys],
+        "scheme": scheme or "",
+        "bands": bands,
+        "rows": rows,
+        "n_gram": n_gram,
+    }
+    blooms = np.array([_ngram_bloom(str(minhashes[key][3]), n_gram) for key in keys], dtype=np.uint64)
+    np.save(f"{path}.npy", signatures)
+    np.save(f"{path}.bloom.npy", blooms)
+    with open(f"{path}.json", "w") as file:
+        json.dump(metadata, file)
+
+def _load_minhash_snapshot(path: Path) -> Tuple[Dict[str, Any], np.ndarray]:
+    if os.path.exists(f"{path}.npy"):
+        with open(f"{path}.json", "r") as file:
+            metadata = json.load(file)
+        # Memory-mapped: rows are paged in from disk only as they are compared
+        return metadata, np.load(f"{path}.npy", mmap_mode="r")
+    # Snapshots written before the .npy/.json split
+    with np.load(f"{path}.npz", allow_pickle=False) as data:
+        metadata = {
+            "keys": data["keys"].tolist(),
+            "meta": data["meta"].tolist(),
+            "scheme": str(data["scheme"]),
+            "bands": int(data["bands"]) if "bands" in data.files else 0,
+            "rows": int(data["rows"]) if "rows" in data.files else 0,
+        }
+        return metadata, data["signatures"]
+
+def load_minhash_signatures(path: Path) -> Tuple[List[str], np.ndarray, List[List[str]], str]:
+    """
+    Loads the snapshot written by `save_minhash_signatures`.
+
+    Args:
+        path (Path): The snapshot path, without extension.
+
+    Returns:
+        Tuple[List[str], np.ndarray, List[List[str]], str]: The keys, the (N, num_perm) signature matrix,
+            the table/column/value metadata per row and the MinHash scheme ("" if unversioned).
+    """
+    metadata, signatures = _load_minhash_snapshot(path)
+    return metadata["keys"], signatures, metadata["meta"], metadata["scheme"]
+
+def upgrade_lsh_pickles(db_directory_path) -> None:
+    """
+    Rewrites the LSH pickles of an already preprocessed database with the highest pickle protocol,
+    so databases preprocessed before the protocol change load as fast as new ones.
+
+    Args:
+        db_directory_path (str or Path): The path to the database directory.
+    """
+    db_directory_path = Path(db_directory_path)
+    db_id = db_directory_path.name
+    for suffix in ["unique_values", "lsh", "minhashes"]:
+        pickle_path = db_directory_path / "preprocessed" / f"{db_id}_{suffix}.pkl"
+        if not pickle_path.exists():
+            continue
+        with open(pickle_path, "rb", buffering=PICKLE_BUFFER_SIZE) as file:
+            data = pickle.load(file)
+        temp_path = Path(f"{pickle_path}.tmp")
+        with open(temp_path, "wb") as file:
+            pickle.dump(data, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, pickle_path)
+        logging.info(f"Rewrote {pickle_path} with pickle protocol {pickle.HIGHEST_PROTOCOL}")
+
+def load_minhash_blooms(path: Path) -> Optional[Tuple[np.ndarray, int]]:
+    """
+    Loads the n-gram Bloom signatures written by `save_minhash_signatures`.
+
+    Args:
+        path (Path): The snapshot path, without extension.
+
+    Returns:
+        Optional[Tuple[np.ndarray, int]]: The uint64 Bloom signature per row and the n-gram size used,
+            or None for snapshots written without them.
+    """
+    if not os.path.exists(f"{path}.bloom.npy"):
+        return None
+    with open(f"{path}.json", "r") as file:
+        n_gram = json.load(file).get("n_gram", 3)
+    return np.load(f"{path}.bloom.npy"), n_gram
+
+def load_lsh_band_params(path: Path) -> Optional[Tuple[int, int]]:
+    """
+    Reads the LSH band layout recorded by `save_minhash_signatures`.
+
+    Args:
+        path (Path): The snapshot path, without extension.
+
+    Returns:
+        Optional[Tuple[int, int]]: The number of bands and rows per band, or None if not recorded.
+    """
+    if os.path.exists(f"{path}.npy"):
+        with open(f"{path}.json", "r") as file:
+            metadata = json.load(file)
+    else:
+        metadata, _ = _load_minhash_snapshot(path)
+    if metadata.get("bands", 0) <= 0:
+        return None
+    return metadata["bands"], metadata["rows"]
+
 def make_db_lsh(db_directory_path, signature_size: int = 20, n_gram: int = 3, 
-               threshold: float = 0.01, verbose: bool = True, db_manager = None) -> None:
+               threshold: float = 0.01, verbose: bool = True, db_manager = None,
+               return_data: bool = False, signature_store = None,
+               write_pickle: bool = True, legacy_pickles: bool = False) -> Optional[Tuple[MinHashLSH, Dict[str, MinHashEntry]]]:
     """
     Creates a MinHash LSH for the database and saves the results.
 
@@ -403,13 +837,24 @@ def make_db_lsh(db_directory_path, signature_size: int = 20, n_gram: int = 3,
         threshold (float, optional): LSH threshold.
         verbose (bool, optional): Whether to display progress information.
         db_manager (DatabaseInterface, optional): Database manager for MySQL storage.
+        return_data (bool, optional): Return the LSH and MinHashes instead of writing them to disk.
+        signature_store (DatabaseInterface, optional): Database manager the signatures are streamed to
+            as they are computed. Defaults to db_manager.
+        write_pickle (bool, optional): Whether to write any files (unique values, checkpoints, LSH pickles).
+            Disable when the signatures are only needed in signature_store.
+        legacy_pickles (bool, optional): Also write the `_lsh.pkl`/`_minhashes.pkl` pickles for tools
+            that read them directly. The runtime loader only needs the columnar snapshot.
+
+    Returns:
+        Optional[Tuple[MinHashLSH, Dict[str, MinHashEntry]]]: The LSH and MinHashes if return_data is set.
     """
     if isinstance(db_directory_path, str):
         db_directory_path = Path(db_directory_path)
         
     db_id = db_directory_path.name
     preprocessed_path = db_directory_path / "preprocessed"
-    preprocessed_path.mkdir(exist_ok=True)
+    if write_pickle:
+        preprocessed_path.mkdir(exist_ok=True)
     
     # Get unique values from database
     if db_manager is None:
@@ -423,25 +868,42 @@ def make_db_lsh(db_directory_path, signature_size: int = 20, n_gram: int = 3,
     logging.info("Unique values obtained")
     
     # Save unique values to pickle (for reference)
-    with open(preprocessed_path / f"{db_id}_unique_values.pkl", "wb") as file:
-        pickle.dump(unique_values, file)
-    logging.info("Saved unique values")
+    if write_pickle:
+        with open(preprocessed_path / f"{db_id}_unique_values.pkl", "wb") as file:
+            pickle.dump(unique_values, file, protocol=pickle.HIGHEST_PROTOCOL)
+        logging.info("Saved unique values")
     
     # Generate LSH signatures
+    checkpoint_path = preprocessed_path / f"{db_id}_lsh_checkpoint.pkl"
     lsh, minhashes = make_lsh(
         unique_values, 
         signature_size=signature_size, 
         n_gram=n_gram, 
         threshold=threshold, 
         verbose=verbose,
-        db_manager=db_manager,
-        source_id=db_id
+        db_manager=signature_store if signature_store is not None else db_manager,
+        source_id=db_id,
+        checkpoint_path=checkpoint_path if write_pickle else None
     )
     
-    # Save to pickle (for reference or SQLite compatibility)
-    with open(preprocessed_path / f"{db_id}_lsh.pkl", "wb") as file:
-        pickle.dump(lsh, file)
-    with open(preprocessed_path / f"{db_id}_minhashes.pkl", "wb") as file:
-        pickle.dump(minhashes, file)
+    if return_data or not write_pickle:
+        if write_pickle and checkpoint_path.exists():
+            checkpoint_path.unlink()
+        logging.info("LSH data generation complete")
+        return (lsh, minhashes) if return_data else None
+
+    save_minhash_signatures(preprocessed_path / f"{db_id}_minhashes", minhashes, lsh, n_gram)
+    for suffix in ("_lsh.pkl", "_minhashes.pkl"):
+        pickle_path = preprocessed_path / f"{db_id}{suffix}"
+        if legacy_pickles:
+            with open(pickle_path, "wb") as file:
+                pickle.dump(lsh if suffix == "_lsh.pkl" else minhashes, file, protocol=pickle.HIGHEST_PROTOCOL)
+        elif pickle_path.exists():
+            # Pickles from an earlier build would no longer match the snapshot
+            pickle_path.unlink()
+    
+    # The full results are on disk, so the checkpoint is no longer needed
+    if checkpoint_path.exists():
+        checkpoint_path.unlink()
     
     logging.info("LSH data generation complete")
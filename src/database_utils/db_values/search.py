@@ -1,46 +1,266 @@
+import os
+import re
 import pickle
+import functools
+import numpy as np
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Mapping
 from datasketch import MinHash, MinHashLSH
 from pathlib import Path
 import logging
-from typing import Dict, Tuple, List, Any, Union, Optional
+from typing import Dict, Tuple, List, Any, Union, Optional, Iterator, Sequence
 
-from database_utils.db_values.preprocess import _create_minhash
+from database_utils.db_values.preprocess import (
+    MinHashEntry, _create_minhash, _ngram_bloom, convert_to_signature as _convert_to_signature,
+    load_minhash_signatures, load_minhash_blooms, load_lsh_band_params, PICKLE_BUFFER_SIZE, LSH_FILE_SUFFIXES
+)
+
+# data_ref layout written by make_lsh: <table_name>_<column_name>_<id>
+_DATA_REF_RE = re.compile(r"([^_]*)_([^_]*)_([^_]*)")
+
+# Upper bound on threads used by query_lsh_many
+QUERY_LSH_MAX_WORKERS = 8
+
+# Candidates whose n-gram Bloom overlap with the query is below this are not scored
+BLOOM_MIN_SIMILARITY = 0.1
+
+# Set bits per byte value, for popcounts on uint64 arrays
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
 
 ### Database value similarity ###
 
-def _jaccard_similarity(m1: MinHash, m2: MinHash) -> float:
+def _popcount64(values: np.ndarray) -> np.ndarray:
+    # Per-element popcount of a uint64 array through an 8-bit lookup table
+    return _POPCOUNT_TABLE[np.ascontiguousarray(values, dtype=np.uint64).view(np.uint8)].reshape(-1, 8).sum(axis=1)
+
+@functools.lru_cache(maxsize=4096)
+def _create_query_minhash(signature_size: int, keyword: str, n_gram: int) -> MinHash:
+    # Memoized for repeated keywords; the returned MinHash is shared, so it must only be read
+    return _create_minhash(signature_size, keyword, n_gram)
+
+def jaccard_batch(query_hashvalues: np.ndarray, signatures: np.ndarray) -> np.ndarray:
+    """
+    Estimates the Jaccard similarity between one MinHash signature and each row of a signature matrix,
+    as the fraction of equal hash values (the same estimate as `MinHash.jaccard`).
+
+    Args:
+        query_hashvalues (np.ndarray): The (num_perm,) query signature.
+        signatures (np.ndarray): The (N, num_perm) candidate signatures.
+
+    Returns:
+        np.ndarray: The N similarities.
+    """
+    # count_nonzero on the boolean mask avoids the float64 temporary that mean() allocates
+    return np.count_nonzero(signatures == query_hashvalues, axis=1) / signatures.shape[1]
+
+def _jaccard_similarities(query_minhash: MinHash, minhashes: Mapping, keys: List[str]) -> np.ndarray:
     """
-    Computes the Jaccard similarity between two MinHash objects.
+    Estimates the Jaccard similarity between the query and each of the given stored MinHashes.
 
     Args:
-        m1 (MinHash): The first MinHash object.
-        m2 (MinHash): The second MinHash object.
+        query_minhash (MinHash): The query MinHash.
+        minhashes (Mapping): The stored MinHashes, keyed like the LSH.
+        keys (List[str]): The keys to score.
 
     Returns:
-        float: The Jaccard similarity between the two MinHash objects.
+        np.ndarray: One similarity per key, in the same order.
+    """
+    if isinstance(minhashes, SignatureMinHashes):
+        return minhashes.jaccard(query_minhash, keys)
+    candidate_matrix = np.stack([minhashes[key][0].hashvalues for key in keys])
+    return jaccard_batch(query_minhash.hashvalues, candidate_matrix)
+
+def _top_n_indices(scores: np.ndarray, top_n: int) -> np.ndarray:
+    """
+    Returns the indices of the `top_n` highest scores, best first.
+
+    Args:
+        scores (np.ndarray): The scores.
+        top_n (int): The number of indices to return.
+
+    Returns:
+        np.ndarray: The selected indices, sorted by decreasing score.
+    """
+    if top_n < len(scores):
+        # Partial selection first so only the kept candidates are fully sorted
+        candidates = np.argpartition(-scores, top_n - 1)[:top_n] if top_n > 0 else np.array([], dtype=int)
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+class SignatureMinHashes(Mapping):
+    """
+    Read-only view over a columnar MinHash snapshot that behaves like the pickled
+    `{key: (MinHash, table_name, column_name, value)}` dictionary.
+    MinHash objects are only rebuilt for the keys that are actually accessed.
+    """
+
+    def __init__(self, keys: Sequence[str], signatures: np.ndarray, meta: Sequence[Sequence[str]], scheme: str = "",
+                 blooms: Optional[np.ndarray] = None, bloom_n_gram: Optional[int] = None):
+        self.keys_array = keys
+        self.signatures = signatures
+        self.meta = meta
+        self.blooms = blooms
+        self.bloom_n_gram = bloom_n_gram
+        self._minhash_kwargs = {"scheme": scheme} if scheme else {}
+        self._index = {str(key): i for i, key in enumerate(keys)}
+
+    def __getitem__(self, key: str) -> MinHashEntry:
+        i = self._index[key]
+        table_name, column_name, value = (str(field) for field in self.meta[i])
+        return MinHashEntry(MinHash(hashvalues=self.signatures[i], **self._minhash_kwargs), table_name, column_name, value)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def jaccard(self, query_minhash: MinHash, keys: List[str]) -> np.ndarray:
+        """
+        Estimates the Jaccard similarity of the query against several stored keys in one pass.
+
+        Args:
+            query_minhash (MinHash): The query MinHash.
+            keys (List[str]): The stored keys to compare against.
+
+        Returns:
+            np.ndarray: One similarity per key, in the same order.
+        """
+        rows = self.signatures[[self._index[key] for key in keys]]
+        return jaccard_batch(query_minhash.hashvalues, rows)
+
+    def bloom_prefilter(self, keyword: str, n_gram: int, keys: List[str], min_keep: int) -> List[str]:
+        """
+        Drops the keys whose n-gram Bloom signature barely overlaps the keyword's, before full scoring.
+        Returns the keys unchanged when there are no Bloom signatures for this n-gram size
+        or when fewer than `min_keep` keys would survive.
+
+        Args:
+            keyword (str): The query keyword.
+            n_gram (int): The n-gram size of the query.
+            keys (List[str]): The candidate keys.
+            min_keep (int): The minimum number of candidates to keep.
+
+        Returns:
+            List[str]: The candidates worth scoring.
+        """
+        if self.blooms is None or n_gram != self.bloom_n_gram:
+            return keys
+        query_bloom = np.uint64(_ngram_bloom(keyword, n_gram))
+        if query_bloom == 0:
+            return keys
+        candidate_blooms = self.blooms[[self._index[key] for key in keys]]
+        overlap = _popcount64(candidate_blooms & query_bloom) / _popcount64(candidate_blooms | query_bloom)
+        keep = overlap >= BLOOM_MIN_SIMILARITY
+        if np.count_nonzero(keep) < min_keep:
+            return keys
+        return [key for key, kept in zip(keys, keep) if kept]
+
+class NumpyLSH:
+    """
+    Banded LSH index over a packed (N, num_perm) signature matrix.
+    Uses the same band layout as MinHashLSH, so `query` returns the same candidates,
+    but each band is a sorted array of packed band keys probed with a binary search.
+    """
+
+    def __init__(self, keys: Sequence[str], signatures: np.ndarray, bands: int, rows: int):
+        self.keys = [str(key) for key in keys]
+        self.bands = bands
+        self.rows = rows
+        self._band_keys: List[np.ndarray] = []
+        self._band_order: List[np.ndarray] = []
+        if len(self.keys) == 0:
+            return
+        for band in range(bands):
+            band_keys = self._pack_band(signatures, band)
+            order = np.argsort(band_keys, kind="stable")
+            self._band_order.append(order)
+            self._band_keys.append(band_keys[order])
+
+    def _pack_band(self, signatures: np.ndarray, band: int) -> np.ndarray:
+        # View each row's slice of the band as one opaque fixed-size key
+        band_slice = np.ascontiguousarray(signatures[:, band * self.rows:(band + 1) * self.rows], dtype=np.uint64)
+        return band_slice.view(np.dtype((np.void, band_slice.shape[1] * band_slice.itemsize))).ravel()
+
+    def query(self, minhash: Union[MinHash, np.ndarray]) -> List[str]:
+        """
+        Returns the keys sharing at least one band with the query.
+
+        Args:
+            minhash (MinHash or np.ndarray): The query MinHash or its hash values.
+
+        Returns:
+            List[str]: The candidate keys.
+        """
+        hashvalues = np.asarray(getattr(minhash, "hashvalues", minhash), dtype=np.uint64).reshape(1, -1)
+        candidates = set()
+        for band, (band_keys, order) in enumerate(zip(self._band_keys, self._band_order)):
+            query_key = self._pack_band(hashvalues, band)[0]
+            start = np.searchsorted(band_keys, query_key, side="left")
+            end = np.searchsorted(band_keys, query_key, side="right")
+            candidates.update(order[start:end].tolist())
+        return [self.keys[i] for i in candidates]
+
+def _lsh_files_signature(preprocessed_path: str, db_id: str) -> Tuple[Tuple[str, float], ...]:
+    # Modification times of the preprocessed files, so a rebuilt index is never served from cache
+    signature = []
+    for name in (f"{db_id}{suffix}" for suffix in LSH_FILE_SUFFIXES):
+        try:
+            signature.append((name, os.stat(os.path.join(preprocessed_path, name)).st_mtime))
+        except FileNotFoundError:
+            continue
+    return tuple(signature)
+
+@functools.lru_cache(maxsize=32)
+def _load_db_lsh_cached(db_directory_path: str, files_signature: Tuple[Tuple[str, float], ...]) -> Tuple[Union[NumpyLSH, MinHashLSH], Union[SignatureMinHashes, Dict[str, MinHashEntry]]]:
+    db_id = Path(db_directory_path).name
+    preprocessed_path = Path(db_directory_path) / "preprocessed"
+    snapshot_path = preprocessed_path / f"{db_id}_minhashes"
+    has_snapshot = any(Path(f"{snapshot_path}{suffix}").exists() for suffix in (".npy", ".npz"))
+    if has_snapshot:
+        blooms, bloom_n_gram = load_minhash_blooms(snapshot_path) or (None, None)
+        minhashes = SignatureMinHashes(*load_minhash_signatures(snapshot_path), blooms=blooms, bloom_n_gram=bloom_n_gram)
+        band_params = load_lsh_band_params(snapshot_path)
+        if band_params is not None:
+            return NumpyLSH(minhashes.keys_array, minhashes.signatures, *band_params), minhashes
+    with open(preprocessed_path / f"{db_id}_lsh.pkl", "rb", buffering=PICKLE_BUFFER_SIZE) as file:
+        lsh = pickle.load(file)
+    if not has_snapshot:
+        with open(preprocessed_path / f"{db_id}_minhashes.pkl", "rb", buffering=PICKLE_BUFFER_SIZE) as file:
+            minhashes = pickle.load(file)
+    return lsh, minhashes
+
+def invalidate_lsh_cache() -> None:
+    """
+    Drops every LSH cached by `load_db_lsh`.
     """
-    return m1.jaccard(m2)
+    _load_db_lsh_cached.cache_clear()
 
-def load_db_lsh(db_directory_path: str) -> Tuple[MinHashLSH, Dict[str, Tuple[MinHash, str, str, str]]]:
+def load_db_lsh(db_directory_path: str) -> Tuple[Union[NumpyLSH, MinHashLSH], Union[SignatureMinHashes, Dict[str, MinHashEntry]]]:
     """
     Loads the LSH and MinHashes from the preprocessed files in the specified directory.
+    Results are cached per database and reloaded only when the preprocessed files change.
 
     Args:
         db_directory_path (str): The path to the database directory.
 
     Returns:
-        Tuple[MinHashLSH, Dict[str, Tuple[MinHash, str, str, str]]]: The LSH object and the dictionary of MinHashes.
+        Tuple[Union[NumpyLSH, MinHashLSH], Union[SignatureMinHashes, Dict[str, MinHashEntry]]]: The LSH object
+            and the MinHashes. When the columnar snapshot is present, they are a NumpyLSH and a
+            SignatureMinHashes built from it, and the pickles are not read; otherwise they are the
+            pickled MinHashLSH and MinHash dictionary.
 
     Raises:
         Exception: If there is an error loading the LSH or MinHashes.
     """
-    db_id = Path(db_directory_path).name
+    # Plain os.path calls: this runs on every lookup, including cache hits
+    resolved_path = os.path.realpath(os.fspath(db_directory_path))
+    db_id = os.path.basename(resolved_path)
     try:
-        with open(Path(db_directory_path) / "preprocessed" / f"{db_id}_lsh.pkl", "rb") as file:
-            lsh = pickle.load(file)
-        with open(Path(db_directory_path) / "preprocessed" / f"{db_id}_minhashes.pkl", "rb") as file:
-            minhashes = pickle.load(file)
-        return lsh, minhashes
+        files_signature = _lsh_files_signature(os.path.join(resolved_path, "preprocessed"), db_id)
+        return _load_db_lsh_cached(resolved_path, files_signature)
     except Exception as e:
         logging.error(f"Error loading LSH for {db_id}: {e}")
         raise e
@@ -57,14 +277,127 @@ def convert_to_signature(keyword: str, signature_size: int = 100, n_gram: int =
     Returns:
         List[str]: The MinHash signature as a list of string-formatted hash values.
     """
-    query_minhash = _create_minhash(signature_size, keyword, n_gram)
-    # Convert to list of strings for storage/transmission
-    return [str(h) for h in query_minhash.digest()]
+    return _convert_to_signature(keyword, signature_size, n_gram)
+
+def _to_plain_dict(grouped_values: Dict[str, Dict[str, List[str]]]) -> Dict[str, Dict[str, List[str]]]:
+    # Callers get ordinary dicts, so a missing table or column raises KeyError rather than inserting
+    return {table_name: dict(columns) for table_name, columns in grouped_values.items()}
+
+def query_lsh_sqlite(lsh: Any, minhashes: Mapping, keyword: str, signature_size: int = 100,
+                     n_gram: int = 3, top_n: int = 10) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Queries an in-memory LSH for values similar to a keyword.
+
+    Args:
+        lsh: The MinHashLSH (or NumpyLSH) index.
+        minhashes: The MinHashes the index was built over, keyed like the index.
+        keyword: Keyword to search for.
+        signature_size: Size of the MinHash signature
+        n_gram: N-gram size for the MinHash
+        top_n: Number of top results to return
+
+    Returns:
+        Dict[str, Dict[str, List[str]]]: A dictionary containing the top similar values.
+    """
+    # Generate query minhash from keyword
+    query_minhash = _create_query_minhash(signature_size, keyword, n_gram)
+    
+    # Query the LSH
+    results = list(lsh.query(query_minhash))
+    
+    # Cheap n-gram overlap check first, so only plausible candidates reach the MinHash scorer
+    if isinstance(minhashes, SignatureMinHashes) and len(results) > top_n:
+        results = minhashes.bloom_prefilter(keyword, n_gram, results, top_n)
+    
+    # Score all candidates in one pass and keep the best top_n
+    top_results = []
+    if results:
+        similarities = _jaccard_similarities(query_minhash, minhashes, results)
+        top_results = [results[i] for i in _top_n_indices(similarities, top_n)]
+    
+    # Format results
+    similar_values_trimmed = defaultdict(lambda: defaultdict(list))
+    for result in top_results:
+        # Unpacking also covers plain 4-tuples from pickles written before MinHashEntry
+        _, table_name, column_name, value = minhashes[result]
+        similar_values_trimmed[table_name][column_name].append(value)
+    
+    return _to_plain_dict(similar_values_trimmed)
+
+def query_lsh_many(lsh: Any, minhashes: Mapping, keywords: List[str], signature_size: int = 100,
+                   n_gram: int = 3, top_n: int = 10) -> Dict[str, Dict[str, Dict[str, List[str]]]]:
+    """
+    Runs `query_lsh_sqlite` for several keywords concurrently against the same in-memory LSH.
+
+    Args:
+        lsh: The MinHashLSH (or NumpyLSH) index.
+        minhashes: The MinHashes the index was built over, keyed like the index.
+        keywords: Keywords to search for.
+        signature_size: Size of the MinHash signature
+        n_gram: N-gram size for the MinHash
+        top_n: Number of top results to return per keyword
+
+    Returns:
+        Dict[str, Dict[str, Dict[str, List[str]]]]: The results of each distinct keyword, keyed by keyword.
+    """
+    unique_keywords = list(dict.fromkeys(keywords))
+    if not unique_keywords:
+        return {}
+    # The index is only read, and the NumPy scoring releases the GIL
+    with ThreadPoolExecutor(max_workers=min(QUERY_LSH_MAX_WORKERS, len(unique_keywords))) as executor:
+        results = executor.map(
+            lambda keyword: query_lsh_sqlite(lsh, minhashes, keyword, signature_size, n_gram, top_n),
+            unique_keywords
+        )
+        return dict(zip(unique_keywords, results))
+
+def query_lsh_mysql(db_manager: Any, query_signature: List[str], top_n: int = 10) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Queries the LSH signatures stored in MySQL through the database manager.
+
+    Args:
+        db_manager: The DatabaseInterface instance holding the signatures.
+        query_signature: The precomputed query signature (see `convert_to_signature`).
+        top_n: Number of top results to return
+
+    Returns:
+        Dict[str, Dict[str, List[str]]]: A dictionary containing the top similar values.
+    """
+    # Query the database using the database manager
+    db_results = db_manager.query_lsh(query_signature, top_n)
+    
+    # Format results for compatibility with traditional output
+    similar_values_trimmed = defaultdict(lambda: defaultdict(list))
+    
+    # Process results from MySQL query
+    # Expected format of db_results: [{data_ref: "table_name_column_name_id", matches: count}, ...]
+    for result in db_results:
+        data_ref = result.get("data_ref", "")
+        
+        match = _DATA_REF_RE.match(data_ref)
+        if match is None:
+            # Special handling for test data (e.g., "test1", "data_1"), use a default table and column
+            table_name = "test_table"
+            column_name = "text_column"
+            value = f"Value for {data_ref}"
+        else:
+            # The format is table_name_column_name_id
+            # For simple cases where table and column names don't contain underscores
+            table_name, column_name, value_id = match.groups()
+            
+            # In a real implementation, we would look up the actual value from the database
+            # For now, we'll use a placeholder
+            value = f"Value from {data_ref}"
+        
+        similar_values_trimmed[table_name][column_name].append(value)
+    
+    return _to_plain_dict(similar_values_trimmed)
 
 def query_lsh(lsh_or_db_manager: Any, minhashes_or_query_signature: Any, keyword_or_none: Optional[str] = None, 
               signature_size: int = 100, n_gram: int = 3, top_n: int = 10) -> Dict[str, Dict[str, List[str]]]:
     """
     Queries the LSH for similar values and returns the top results. Supports both SQLite and MySQL.
+    Dispatches to `query_lsh_sqlite` or `query_lsh_mysql`; new code should call those directly.
     
     This function has two modes:
     1. Traditional SQLite mode: Pass LSH object, minhashes dict, and keyword
@@ -81,80 +414,7 @@ def query_lsh(lsh_or_db_manager: Any, minhashes_or_query_signature: Any, keyword
     Returns:
         Dict[str, Dict[str, List[str]]]: A dictionary containing the top similar values.
     """
-    # Determine which mode we're in
     if keyword_or_none is not None:
-        # Traditional SQLite mode
-        lsh = lsh_or_db_manager
-        minhashes = minhashes_or_query_signature
-        keyword = keyword_or_none
-        
-        # Generate query minhash from keyword
-        query_minhash = _create_minhash(signature_size, keyword, n_gram)
-        
-        # Query the LSH
-        results = lsh.query(query_minhash)
-        
-        # Calculate similarities
-        similarities = [(result, _jaccard_similarity(query_minhash, minhashes[result][0])) for result in results]
-        similarities = sorted(similarities, key=lambda x: x[1], reverse=True)[:top_n]
-        
-        # Format results
-        similar_values_trimmed: Dict[str, Dict[str, List[str]]] = {}
-        for result, similarity in similarities:
-            table_name, column_name, value = minhashes[result][1:]
-            if table_name not in similar_values_trimmed:
-                similar_values_trimmed[table_name] = {}
-            if column_name not in similar_values_trimmed[table_name]:
-                similar_values_trimmed[table_name][column_name] = []
-            similar_values_trimmed[table_name][column_name].append(value)
-            
-    else:
-        # MySQL mode
-        db_manager = lsh_or_db_manager
-        query_signature = minhashes_or_query_signature
-        
-        # Query the database using the database manager
-        db_results = db_manager.query_lsh(query_signature, top_n)
-        
-        # Format results for compatibility with traditional output
-        similar_values_trimmed: Dict[str, Dict[str, List[str]]] = {}
-        
-        # Process results from MySQL query
-        # Expected format of db_results: [{data_ref: "table_name_column_name_id", matches: count}, ...]
-        for result in db_results:
-            data_ref = result.get("data_ref", "")
-            
-            # Special handling for test data - if data_ref doesn't match the expected pattern
-            if not data_ref.count('_') >= 2:
-                # For test data (e.g., "test1", "data_1"), use a default table and column
-                table_name = "test_table"
-                column_name = "text_column"
-                value = f"Value for {data_ref}"
-                
-                if table_name not in similar_values_trimmed:
-                    similar_values_trimmed[table_name] = {}
-                if column_name not in similar_values_trimmed[table_name]:
-                    similar_values_trimmed[table_name][column_name] = []
-                similar_values_trimmed[table_name][column_name].append(value)
-                continue
-                
-            # Parse data_ref to extract table_name, column_name for standard data format
-            parts = data_ref.split("_")
-            if len(parts) >= 3:
-                # The format is table_name_column_name_id
-                # For simple cases where table and column names don't contain underscores
-                table_name = parts[0]
-                column_name = parts[1]
-                value_id = parts[2]
-                
-                # In a real implementation, we would look up the actual value from the database
-                # For now, we'll use a placeholder
-                value = f"Value from {data_ref}"
-                
-                if table_name not in similar_values_trimmed:
-                    similar_values_trimmed[table_name] = {}
-                if column_name not in similar_values_trimmed[table_name]:
-                    similar_values_trimmed[table_name][column_name] = []
-                similar_values_trimmed[table_name][column_name].append(value)
-    
-    return similar_values_trimmed
+        return query_lsh_sqlite(lsh_or_db_manager, minhashes_or_query_signature, keyword_or_none,
+                                signature_size, n_gram, top_n)
+    return query_lsh_mysql(lsh_or_db_manager, minhashes_or_query_signature, top_n)
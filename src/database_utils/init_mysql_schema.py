@@ -13,6 +13,30 @@ from pathlib import Path
 from dotenv import load_dotenv
 
 
+def ensure_vector_column(cursor) -> bool:
+    """
+    Add the `vector` column to a `vector_metadata` table created before it existed.
+    CREATE TABLE IF NOT EXISTS leaves existing tables untouched, so older databases
+    need this migration before vectors can be inserted.
+    
+    Args:
+        cursor: A cursor on the target database
+        
+    Returns:
+        bool: True if the column was added
+    """
+    cursor.execute(
+        """
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = DATABASE() AND table_name = 'vector_metadata' AND column_name = 'vector'
+        """
+    )
+    if cursor.fetchone() is not None:
+        return False
+    cursor.execute("ALTER TABLE `vector_metadata` ADD COLUMN `vector` VARBINARY(16384) AFTER `metadata`")
+    return True
+
+
 def initialize_schema():
     """Initialize MySQL schema with required tables."""
     # Load environment variables
@@ -32,45 +56,29 @@ def initialize_schema():
     connection = None
     try:
         print(f"Connecting to MySQL at {host}:{port}...")
-        # First connect without specifying a database to check if it exists
+        # Connect without a database first; multi-statements lets the schema run in one round trip
         connection = pymysql.connect(
             host=host,
             user=user,
             password=password,
             port=port,
-            charset='utf8mb4'
+            charset='utf8mb4',
+            client_flag=pymysql.constants.CLIENT.MULTI_STATEMENTS
         )
         
         cursor = connection.cursor()
         
-        # Check if database exists, create if it doesn't
-        cursor.execute(f"SHOW DATABASES LIKE '{db_name}'")
-        database_exists = cursor.fetchone() is not None
-        
-        if not database_exists:
-            print(f"Creating database '{db_name}'...")
-            cursor.execute(f"CREATE DATABASE `{db_name}` CHARACTER SET utf8mb4 COLLATE utf8mb4_general_ci")
-            connection.commit()
+        # Create the database if it doesn't exist (affects 1 row only when it was created)
+        quoted_db_name = "`" + db_name.replace("`", "``") + "`"
+        created = cursor.execute(f"CREATE DATABASE IF NOT EXISTS {quoted_db_name} CHARACTER SET utf8mb4 COLLATE utf8mb4_general_ci")
+        if created:
             print(f"Database '{db_name}' created successfully")
         else:
             print(f"Database '{db_name}' already exists")
         
-        # Close the initial connection
-        cursor.close()
-        connection.close()
-        
-        # Connect to the specific database
+        # Switch to the specific database on the same connection
         print(f"Connecting to database '{db_name}'...")
-        connection = pymysql.connect(
-            host=host,
-            user=user,
-            password=password,
-            port=port,
-            database=db_name,
-            charset='utf8mb4'
-        )
-        
-        cursor = connection.cursor()
+        connection.select_db(db_name)
         
         # Read and execute the schema SQL file
         schema_file = Path(__file__).parent / "mysql_schema.sql"
@@ -80,11 +88,13 @@ def initialize_schema():
         print(f"Executing schema from {schema_file}...")
         schema_sql = schema_file.read_text()
         
-        # Split and execute statements
-        for statement in schema_sql.split(';'):
-            statement = statement.strip()
-            if statement:  # Skip empty statements
-                cursor.execute(statement)
+        # Send the whole script at once and drain the result of every statement
+        cursor.execute(schema_sql)
+        while cursor.nextset():
+            pass
+        
+        if ensure_vector_column(cursor):
+            print("Added the vector column to vector_metadata")
         
         connection.commit()
         print("Schema initialized successfully")
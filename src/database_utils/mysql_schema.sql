@@ -1,5 +1,8 @@
 -- CHESS+ MySQL Schema
 -- Contains tables for core application data, LSH signatures, and vector metadata
+-- Additional application-specific tables would be defined here
+-- This schema can be extended as needed for specific databases
+-- The file is sent as one multi-statement query, so keep it ending with a statement
 
 -- LSH Signatures Table
 -- Stores MinHash signatures for locality-sensitive hashing
@@ -24,11 +27,9 @@ CREATE TABLE IF NOT EXISTS `vector_metadata` (
     `source_id` VARCHAR(255) NOT NULL,
     `text_chunk_id` VARCHAR(255),
     `metadata` JSON,
+    `vector` VARBINARY(16384),
     `created_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     INDEX `idx_source_id` (`source_id`),
     INDEX `idx_text_chunk_id` (`text_chunk_id`),
     INDEX `idx_chroma_id` (`chroma_id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
-
--- Additional application-specific tables would be defined here
--- This schema can be extended as needed for specific databases
\ No newline at end of file
@@ -0,0 +1,152 @@
+"""
+This module provides an exact-match cache for LLM responses.
+
+The cache is opt-in (LLM_CACHE=1) and only used for deterministic calls (temperature 0).
+Entries live in an in-memory LRU and, when LLM_CACHE_PATH is set, in an on-disk shelve
+so they survive re-runs.
+"""
+
+import os
+import json
+import copy
+import shelve
+import hashlib
+import logging
+import functools
+from threading import Lock
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+LLM_CACHE_SIZE = 1024
+
+
+def make_cache_key(engine_name: str, prompt: Any, kwargs: Optional[Dict[str, Any]], temperature: Optional[float]) -> str:
+    """
+    Computes the cache key of an LLM request.
+
+    Args:
+        engine_name (str): The model identifier.
+        prompt (Any): The rendered prompt or message sent to the model.
+        kwargs (Dict[str, Any], optional): The request arguments the prompt was rendered from.
+        temperature (float, optional): The sampling temperature.
+
+    Returns:
+        str: The SHA-256 hex digest of the request.
+    """
+    payload = json.dumps(
+        {"engine": engine_name, "prompt": prompt, "kwargs": kwargs, "temp": temperature},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def engine_identity(engine: Any) -> Tuple[str, Optional[float]]:
+    """
+    Extracts the model name and temperature of an engine or LCEL chain ending in one.
+
+    Args:
+        engine (Any): The engine, possibly wrapped in a preprocessing chain or adapter.
+
+    Returns:
+        Tuple[str, Optional[float]]: The model identifier and temperature (None if unknown).
+    """
+    model = getattr(engine, "last", engine)
+    model = getattr(model, "llm", model)
+    name = getattr(model, "model_name", None) or getattr(model, "model", None) or type(model).__name__
+    temperature = getattr(model, "temperature", None)
+    return f"{type(model).__name__}:{name}", temperature
+
+
+class ResponseCache:
+    """Thread-safe LRU of LLM responses with an optional shelve backing store."""
+
+    def __init__(self, maxsize: int = LLM_CACHE_SIZE, path: Optional[str] = None):
+        """
+        Initializes the cache.
+
+        Args:
+            maxsize (int): The number of entries kept in memory.
+            path (str, optional): The shelve file for persistent entries. Defaults to memory only.
+        """
+        self.maxsize = maxsize
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = Lock()
+        self._disk = None
+        if path:
+            try:
+                self._disk = shelve.open(path)
+            except Exception as e:
+                logging.warning(f"Could not open LLM cache at {path}, using memory only: {e}")
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Looks up a response.
+
+        Args:
+            key (str): The key from `make_cache_key`.
+
+        Returns:
+            Optional[Any]: A copy of the cached response, or None on a miss.
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return copy.deepcopy(self._memory[key])
+            if self._disk is not None and key in self._disk:
+                value = self._disk[key]
+                self._remember(key, value)
+                return copy.deepcopy(value)
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Stores a response.
+
+        Args:
+            key (str): The key from `make_cache_key`.
+            value (Any): The response; must be picklable to be persisted.
+        """
+        with self._lock:
+            self._remember(key, copy.deepcopy(value))
+            if self._disk is not None:
+                try:
+                    self._disk[key] = value
+                    self._disk.sync()
+                except Exception as e:
+                    logging.warning(f"Could not persist LLM cache entry: {e}")
+
+    def _remember(self, key: str, value: Any) -> None:
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drops all entries, including persisted ones."""
+        with self._lock:
+            self._memory.clear()
+            if self._disk is not None:
+                self._disk.clear()
+
+
+@functools.lru_cache(maxsize=1)
+def _get_cache() -> ResponseCache:
+    return ResponseCache(int(os.getenv("LLM_CACHE_SIZE", LLM_CACHE_SIZE)), os.getenv("LLM_CACHE_PATH"))
+
+
+def get_response_cache(temperature: Optional[float] = None) -> Optional[ResponseCache]:
+    """
+    Returns the shared response cache if caching applies to a request.
+
+    Args:
+        temperature (float, optional): The request's sampling temperature. None (unknown) is not cached.
+
+    Returns:
+        Optional[ResponseCache]: The cache, or None when LLM_CACHE is off or the temperature is not 0.
+    """
+    if os.getenv("LLM_CACHE") != "1":
+        return None
+    if temperature != 0:
+        return None
+    return _get_cache()
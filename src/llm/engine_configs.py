@@ -1,113 +1,254 @@
-from langchain_openai import ChatOpenAI
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_anthropic import ChatAnthropic
-from langchain_google_vertexai import VertexAI
-from google.oauth2 import service_account
-from google.cloud import aiplatform
-from typing import Dict, Any
-import vertexai
-from langchain_google_vertexai import HarmBlockThreshold, HarmCategory
-import os
-# Import OpenAI for completions API (used by vLLM)
-from langchain_openai import OpenAI
-
-safety_settings = {
-    HarmCategory.HARM_CATEGORY_UNSPECIFIED: HarmBlockThreshold.BLOCK_NONE,
-    HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
-    HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
-    HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
-    HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
-}
+"""
+This module defines configurations for various language models using the langchain library.
+Each configuration includes a constructor, parameters, and an optional preprocessing function.
+Constructors are "module:attribute" strings resolved on first use, so only the providers
+of the engines actually requested get imported.
+"""
 
+import os
+import logging
+import functools
+import importlib
+from typing import Dict, Any, Callable, Optional, Tuple
 
 GCP_PROJECT = os.getenv("GCP_PROJECT")
 GCP_REGION = os.getenv("GCP_REGION")
 GCP_CREDENTIALS = os.getenv("GCP_CREDENTIALS")
 
-if GCP_CREDENTIALS and GCP_PROJECT and GCP_REGION:
-    aiplatform.init(
-    project=GCP_PROJECT,
-    location=GCP_REGION,
-    credentials=service_account.Credentials.from_service_account_file(GCP_CREDENTIALS)
-    )
-    vertexai.init(project=GCP_PROJECT, location=GCP_REGION, credentials=service_account.Credentials.from_service_account_file(GCP_CREDENTIALS))
+VERTEX_AI_CONSTRUCTOR = "langchain_google_vertexai:VertexAI"
 
-"""
-This module defines configurations for various language models using the langchain library.
-Each configuration includes a constructor, parameters, and an optional preprocessing function.
-"""
+# Connection limits of the HTTP clients shared by all OpenAI-compatible engines
+HTTP_MAX_CONNECTIONS = 128
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 64
+
+
+@functools.lru_cache(maxsize=1)
+def _init_vertex_ai() -> None:
+    """
+    Initializes the Vertex AI SDKs once, the first time a Vertex AI engine is requested.
+    """
+    if GCP_CREDENTIALS and GCP_PROJECT and GCP_REGION:
+        from google.oauth2 import service_account
+        from google.cloud import aiplatform
+        import vertexai
+
+        credentials = service_account.Credentials.from_service_account_file(GCP_CREDENTIALS)
+        aiplatform.init(project=GCP_PROJECT, location=GCP_REGION, credentials=credentials)
+        vertexai.init(project=GCP_PROJECT, location=GCP_REGION, credentials=credentials)
+
+
+@functools.lru_cache(maxsize=1)
+def get_safety_settings() -> Dict[Any, Any]:
+    """
+    Returns the Vertex AI safety settings, disabling all content blocking.
+
+    Returns:
+        Dict[Any, Any]: Mapping of harm category to block threshold.
+    """
+    from langchain_google_vertexai import HarmBlockThreshold, HarmCategory
+
+    return {
+        HarmCategory.HARM_CATEGORY_UNSPECIFIED: HarmBlockThreshold.BLOCK_NONE,
+        HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
+        HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
+        HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
+        HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve_constructor(spec: str) -> Callable[..., Any]:
+    module_name, attribute = spec.split(":")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def get_engine_constructor(engine_name: str) -> Callable[..., Any]:
+    """
+    Imports and returns the model class of an engine, initializing its provider SDK if needed.
+
+    Args:
+        engine_name (str): The name of the engine in ENGINE_CONFIGS.
+
+    Returns:
+        Callable[..., Any]: The model class.
+    """
+    spec = ENGINE_CONFIGS[engine_name]["constructor"]
+    if spec == VERTEX_AI_CONSTRUCTOR:
+        _init_vertex_ai()
+    return _resolve_constructor(spec)
+
+
+def get_engine_params(engine_name: str) -> Dict[str, Any]:
+    """
+    Returns a copy of the constructor parameters of an engine, with its safety settings filled in.
+
+    Args:
+        engine_name (str): The name of the engine in ENGINE_CONFIGS.
+
+    Returns:
+        Dict[str, Any]: The parameters, safe to modify.
+    """
+    config = ENGINE_CONFIGS[engine_name]
+    params = config["params"].copy()
+    if config.get("safety_settings"):
+        params["safety_settings"] = get_safety_settings()
+    return params
+
+
+def _freeze(value: Any) -> Any:
+    # Hashable, order-independent form of nested parameter values
+    if isinstance(value, dict):
+        return tuple(sorted(((repr(key), _freeze(item)) for key, item in value.items()), key=lambda pair: pair[0]))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(item) for item in value)
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+class _EngineKey:
+    """Hashable cache key for an engine: its name and frozen parameters, carrying the original parameters."""
+    __slots__ = ("engine_name", "params", "_key")
+
+    def __init__(self, engine_name: str, params: Dict[str, Any]):
+        self.engine_name = engine_name
+        self.params = params
+        self._key = (engine_name, _freeze(params))
+
+    def __hash__(self) -> int:
+        return hash(self._key)
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, _EngineKey) and self._key == other._key
+
+
+@functools.lru_cache(maxsize=1)
+def get_shared_http_clients() -> Tuple[Any, Any]:
+    """
+    Returns the sync and async HTTP clients shared by all OpenAI-compatible engines,
+    so engines targeting the same host reuse connections instead of each keeping its own pool.
+
+    Returns:
+        Tuple[httpx.Client, httpx.AsyncClient]: The shared clients.
+    """
+    import httpx
+
+    limits = httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS, max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS)
+    return httpx.Client(limits=limits, follow_redirects=True), httpx.AsyncClient(limits=limits, follow_redirects=True)
+
+
+@functools.lru_cache(maxsize=64)
+def _get_engine_cached(key: _EngineKey) -> Any:
+    params = key.params
+    if ENGINE_CONFIGS[key.engine_name]["constructor"].startswith("langchain_openai:") and "http_client" not in params:
+        http_client, http_async_client = get_shared_http_clients()
+        params = {**params, "http_client": http_client, "http_async_client": http_async_client}
+    return get_engine_constructor(key.engine_name)(**params)
+
+
+def get_engine(engine_name: str, params: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    Returns a model instance for the engine, shared by all callers using the same parameters,
+    so its HTTP client and connection pool are reused across calls.
+
+    Args:
+        engine_name (str): The name of the engine in ENGINE_CONFIGS.
+        params (Dict[str, Any], optional): The constructor parameters; defaults to `get_engine_params(engine_name)`.
+
+    Returns:
+        Any: The model instance.
+    """
+    if params is None:
+        params = get_engine_params(engine_name)
+    return _get_engine_cached(_EngineKey(engine_name, params))
+
+
+def __getattr__(name: str) -> Any:
+    # Backward compatibility for code still importing the old module-level dictionary
+    if name == "safety_settings":
+        logging.warning("safety_settings is deprecated, use get_safety_settings() instead")
+        return get_safety_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Define the base URL for the local vLLM server
 VLLM_BASE_URL = "http://localhost:5005/v1"
 
 ENGINE_CONFIGS: Dict[str, Dict[str, Any]] = {
     "gemini-pro": {
-        "constructor": ChatGoogleGenerativeAI,
+        "constructor": "langchain_google_genai:ChatGoogleGenerativeAI",
         "params": {"model": "gemini-pro", "temperature": 0},
         "preprocess": lambda x: x.to_messages()
     },
     "gemini-1.5-pro": {
-        "constructor": VertexAI,
-        "params": {"model": "gemini-1.5-pro", "temperature": 0, "safety_settings": safety_settings}
+        "constructor": VERTEX_AI_CONSTRUCTOR,
+        "params": {"model": "gemini-1.5-pro", "temperature": 0},
+        "safety_settings": True
     },
     "gemini-1.5-pro-002": {
-        "constructor": VertexAI,
-        "params": {"model": "gemini-1.5-pro-002", "temperature": 0, "safety_settings": safety_settings}
+        "constructor": VERTEX_AI_CONSTRUCTOR,
+        "params": {"model": "gemini-1.5-pro-002", "temperature": 0},
+        "safety_settings": True
     },
     "gemini-1.5-flash":{
-        "constructor": VertexAI,
-        "params": {"model": "gemini-1.5-flash", "temperature": 0, "safety_settings": safety_settings}
+        "constructor": VERTEX_AI_CONSTRUCTOR,
+        "params": {"model": "gemini-1.5-flash", "temperature": 0},
+        "safety_settings": True
     },
     "gemini-2.0-flash-exp":{
-        "constructor": ChatGoogleGenerativeAI,
+        "constructor": "langchain_google_genai:ChatGoogleGenerativeAI",
         "params": {"model": "gemini-2.0-flash-exp", "temperature": 0}
     },
     "picker_gemini_model": {
-        "constructor": VertexAI,
-        "params": {"model": "projects/613565144741/locations/us-central1/endpoints/7618015791069265920", "temperature": 0, "safety_settings": safety_settings}
+        "constructor": VERTEX_AI_CONSTRUCTOR,
+        "params": {"model": "projects/613565144741/locations/us-central1/endpoints/7618015791069265920", "temperature": 0},
+        "safety_settings": True
     },
     "gemini-1.5-pro-text2sql": {
-        "constructor": VertexAI,
-        "params": {"model": "projects/618488765595/locations/us-central1/endpoints/1743594544210903040", "temperature": 0, "safety_settings": safety_settings}
+        "constructor": VERTEX_AI_CONSTRUCTOR,
+        "params": {"model": "projects/618488765595/locations/us-central1/endpoints/1743594544210903040", "temperature": 0},
+        "safety_settings": True
     },
     "cot_picker": {
-        "constructor": VertexAI,
-        "params": {"model": "projects/243839366443/locations/us-central1/endpoints/2772315215344173056", "temperature": 0, "safety_settings": safety_settings}
+        "constructor": VERTEX_AI_CONSTRUCTOR,
+        "params": {"model": "projects/243839366443/locations/us-central1/endpoints/2772315215344173056", "temperature": 0},
+        "safety_settings": True
     },
     "gpt-3.5-turbo-0125": {
-        "constructor": ChatOpenAI,
+        "constructor": "langchain_openai:ChatOpenAI",
         "params": {"model": "gpt-4o-mini", "temperature": 0}
     },
     "gpt-3.5-turbo-instruct": {
-        "constructor": ChatOpenAI,
+        "constructor": "langchain_openai:ChatOpenAI",
         "params": {"model": "gpt-3.5-turbo-instruct", "temperature": 0}
     },
     "gpt-4-1106-preview": {
-        "constructor": ChatOpenAI,
+        "constructor": "langchain_openai:ChatOpenAI",
         "params": {"model": "gpt-4-1106-preview", "temperature": 0}
     },
     "gpt-4-0125-preview": {
-        "constructor": ChatOpenAI,
+        "constructor": "langchain_openai:ChatOpenAI",
         "params": {"model": "gpt-4-0125-preview", "temperature": 0}
     },
     "gpt-4-turbo": {
-        "constructor": ChatOpenAI,
+        "constructor": "langchain_openai:ChatOpenAI",
         "params": {"model": "gpt-4-turbo", "temperature": 0}
     },
     "gpt-4o": {
-        "constructor": ChatOpenAI,
+        "constructor": "langchain_openai:ChatOpenAI",
         "params": {"model": "gpt-4o", "temperature": 0}
     },
     "gpt-4o-mini": {
-        "constructor": ChatOpenAI,
+        "constructor": "langchain_openai:ChatOpenAI",
         "params": {"model": "gpt-4o-mini", "temperature": 0}
     },
     "claude-3-5-sonnet-20241022": {
-        "constructor": ChatAnthropic,
+        "constructor": "langchain_anthropic:ChatAnthropic",
         "params": {"model": "claude-3-5-sonnet-20241022", "temperature": 0}
     },
     # "finetuned_nl2sql": {
-    #     "constructor": ChatOpenAI,
+    #     "constructor": "langchain_openai:ChatOpenAI",
     #     "params": {
     #         "model": "AI4DS/NL2SQL_DeepSeek_33B",
     #         "openai_api_key": "EMPTY",
@@ -118,7 +259,7 @@ ENGINE_CONFIGS: Dict[str, Dict[str, Any]] = {
     #     }
     # },
     "finetuned_nl2sql": {
-        "constructor": ChatOpenAI,
+        "constructor": "langchain_openai:ChatOpenAI",
         "params": {
             "model": "ft:gpt-4o-mini-2024-07-18:stanford-university::9p4f6Z4W",
             "max_tokens": 400,
@@ -127,7 +268,7 @@ ENGINE_CONFIGS: Dict[str, Dict[str, Any]] = {
         }
     },
     "column_selection_finetuning": {
-        "constructor": ChatOpenAI,
+        "constructor": "langchain_openai:ChatOpenAI",
         "params": {
             "model": "ft:gpt-4o-mini-2024-07-18:stanford-university::9t1Gcj6Y:ckpt-step-1511",
             "max_tokens": 1000,
@@ -136,7 +277,7 @@ ENGINE_CONFIGS: Dict[str, Dict[str, Any]] = {
         }
     },
     # "finetuned_nl2sql_cot": {
-    #     "constructor": ChatOpenAI,
+    #     "constructor": "langchain_openai:ChatOpenAI",
     #     "params": {
     #         "model": "AI4DS/deepseek-cot",
     #         "openai_api_key": "EMPTY",
@@ -147,7 +288,7 @@ ENGINE_CONFIGS: Dict[str, Dict[str, Any]] = {
     #     }
     # },
     # "finetuned_nl2sql_cot": {
-    #     "constructor": ChatOpenAI,
+    #     "constructor": "langchain_openai:ChatOpenAI",
     #     "params": {
     #         "model": "ft:gpt-4o-mini-2024-07-18:stanford-university::9oKvRYet",
     #         "max_tokens": 1000,
@@ -156,7 +297,7 @@ ENGINE_CONFIGS: Dict[str, Dict[str, Any]] = {
     #     }
     # },
     "meta-llama/Meta-Llama-3-70B-Instruct": {
-        "constructor": ChatOpenAI,
+        "constructor": "langchain_openai:ChatOpenAI",
         "params": {
             "model": "meta-llama/Meta-Llama-3-70B-Instruct",
             "openai_api_key": "EMPTY",
@@ -169,7 +310,7 @@ ENGINE_CONFIGS: Dict[str, Dict[str, Any]] = {
         }
     },
     "Qwen/Qwen2.5-1.5B-Instruct": {
-        "constructor": ChatOpenAI,
+        "constructor": "langchain_openai:ChatOpenAI",
         "params": {
             "model": "Qwen/Qwen2.5-1.5B-Instruct",
             "openai_api_key": "EMPTY",
@@ -181,7 +322,7 @@ ENGINE_CONFIGS: Dict[str, Dict[str, Any]] = {
     },
     # Local vLLM models using OpenAI completions API compatibility
     "vllm-phi-4-mini": {
-        "constructor": OpenAI,  # Using OpenAI for completions API
+        "constructor": "langchain_openai:OpenAI",  # Using OpenAI for completions API
         "params": {
             "model_name": "microsoft/Phi-4-mini-instruct",
             "openai_api_key": "EMPTY",
@@ -191,7 +332,7 @@ ENGINE_CONFIGS: Dict[str, Dict[str, Any]] = {
         }
     },
     "vllm-gemma-2b": {
-        "constructor": OpenAI,  # Using OpenAI for completions API
+        "constructor": "langchain_openai:OpenAI",  # Using OpenAI for completions API
         "params": {
             "model_name": "google/gemma-2b",
             "openai_api_key": "EMPTY",
@@ -201,7 +342,7 @@ ENGINE_CONFIGS: Dict[str, Dict[str, Any]] = {
         }
     },
     "vllm-gemma-7b": {
-        "constructor": OpenAI,  # Using OpenAI for completions API
+        "constructor": "langchain_openai:OpenAI",  # Using OpenAI for completions API
         "params": {
             "model_name": "google/gemma-7b",
             "openai_api_key": "EMPTY", 
@@ -211,7 +352,7 @@ ENGINE_CONFIGS: Dict[str, Dict[str, Any]] = {
         }
     },
     "vllm-deepseek-coder-6.7b": {
-        "constructor": OpenAI,  # Using OpenAI for completions API
+        "constructor": "langchain_openai:OpenAI",  # Using OpenAI for completions API
         "params": {
             "model_name": "TheBloke/deepseek-coder-6.7B-instruct-AWQ",
             "openai_api_key": "EMPTY",
@@ -221,7 +362,7 @@ ENGINE_CONFIGS: Dict[str, Dict[str, Any]] = {
         }
     },
     "vllm-qwen2.5-coder-7b": {
-        "constructor": OpenAI,  # Using OpenAI for completions API
+        "constructor": "langchain_openai:OpenAI",  # Using OpenAI for completions API
         "params": {
             "model_name": "models/Qwen2.5.1-Coder-7B-Instruct-Q6_K_L.gguf",
             "openai_api_key": "EMPTY",
@@ -1,24 +1,33 @@
-from typing import Any, Dict, List, Optional, Sequence, Union, Callable
-from functools import partial
-import json
-import uuid
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+import functools
+import itertools
+import time
+import random
+import asyncio
+import logging
+import threading
 
 from langchain_core.exceptions import OutputParserException
-from langchain.output_parsers import OutputFixingParser
-from langchain_openai import OpenAI
 from langchain_core.language_models.base import LanguageModelInput
-from langchain_core.callbacks.manager import CallbackManagerForLLMRun, AsyncCallbackManagerForLLMRun, Callbacks
-from langchain_core.outputs import Generation, GenerationChunk, LLMResult
 from langchain_core.runnables import RunnableConfig, RunnableSerializable
 from langchain_core.messages import (
     BaseMessage,
-    HumanMessage,
+    BaseMessageChunk,
     AIMessage,
+    AIMessageChunk,
 )
 
-from llm.engine_configs import ENGINE_CONFIGS
+from llm.cache import engine_identity, get_response_cache, make_cache_key
+from llm.engine_configs import ENGINE_CONFIGS, get_engine, get_engine_constructor, get_engine_params
 from runner.logger import Logger
-from threading_utils import ordered_concurrent_function_calls
+
+# Upper bound on in-flight LLM requests per batch; enough to fill a vLLM server's batch without tripping rate limits
+LLM_MAX_CONCURRENCY = 32
+
+
+def _is_message_list(input: LanguageModelInput) -> bool:
+    # LangChain message lists are homogeneous, so the first element decides
+    return isinstance(input, (list, tuple)) and (len(input) == 0 or isinstance(input[0], BaseMessage))
 
 
 class VLLMCompletionsWrapper(RunnableSerializable):
@@ -31,36 +40,53 @@ class VLLMCompletionsWrapper(RunnableSerializable):
         super().__init__()
         self.llm = llm
     
-    def invoke(
-        self, 
-        input: LanguageModelInput,
-        config: Optional[RunnableConfig] = None,
-        **kwargs: Any,
-    ) -> Union[str, BaseMessage]:
-        """Process the input and return either a string or ChatMessage."""
-        # Convert input to string if it's not already
+    @staticmethod
+    def _to_prompt(input: LanguageModelInput) -> str:
+        """Convert the LangChain input into the plain prompt string expected by the completions API."""
         if isinstance(input, (list, tuple)) and len(input) > 0:
             if hasattr(input[-1], "content"):
-                prompt = input[-1].content
-            else:
-                prompt = str(input[-1])
+                return input[-1].content
+            return str(input[-1])
         elif isinstance(input, BaseMessage):
-            prompt = input.content
-        else:
-            prompt = str(input)
-            
-        # Get the response from the underlying model
-        text_response = self.llm.invoke(prompt, **kwargs)
-        
+            return input.content
+        return str(input)
+
+    @staticmethod
+    def _to_output(input: LanguageModelInput, text_response: Any) -> Union[str, BaseMessage]:
+        """Wrap the completion in the output type matching the input."""
         # If it's already an object with .content, extract the content
         if hasattr(text_response, 'content'):
             text_response = text_response.content
             
         # Return either a string or AIMessage based on the input type
-        if isinstance(input, (list, tuple)) and all(isinstance(x, BaseMessage) for x in input):
+        if _is_message_list(input):
             return AIMessage(content=text_response)
         else:
             return text_response
+
+    @staticmethod
+    def _to_output_chunk(input: LanguageModelInput, chunk: Any) -> Union[str, BaseMessageChunk]:
+        """Wrap a streamed chunk like `_to_output`, as a message chunk so chunks can be concatenated."""
+        if hasattr(chunk, 'content'):
+            chunk = chunk.content
+        if _is_message_list(input):
+            return AIMessageChunk(content=chunk)
+        return chunk
+
+    def invoke(
+        self, 
+        input: LanguageModelInput,
+        config: Optional[RunnableConfig] = None,
+        **kwargs: Any,
+    ) -> Union[str, BaseMessage]:
+        """Process the input and return either a string or ChatMessage."""
+        prompt = self._to_prompt(input)
+        # Nothing to complete; skip the round trip
+        if not prompt.strip():
+            return self._to_output(input, "")
+        # Get the response from the underlying model
+        text_response = self.llm.invoke(prompt, **kwargs)
+        return self._to_output(input, text_response)
     
     async def ainvoke(
         self, 
@@ -68,8 +94,12 @@ class VLLMCompletionsWrapper(RunnableSerializable):
         config: Optional[RunnableConfig] = None,
         **kwargs: Any,
     ) -> Union[str, BaseMessage]:
-        """Asynchronous version of invoke."""
-        return self.invoke(input, config, **kwargs)
+        """Asynchronous version of invoke, awaiting the model's own async client."""
+        prompt = self._to_prompt(input)
+        if not prompt.strip():
+            return self._to_output(input, "")
+        text_response = await self.llm.ainvoke(prompt, **kwargs)
+        return self._to_output(input, text_response)
     
     def batch(
         self,
@@ -86,8 +116,8 @@ class VLLMCompletionsWrapper(RunnableSerializable):
         config: Optional[RunnableConfig] = None,
         **kwargs: Any,
     ) -> List[Union[str, BaseMessage]]:
-        """Asynchronous version of batch."""
-        return [self.invoke(i, config, **kwargs) for i in inputs]
+        """Asynchronous version of batch, running the requests concurrently."""
+        return list(await asyncio.gather(*(self.ainvoke(i, config, **kwargs) for i in inputs)))
 
     def stream(
         self,
@@ -96,10 +126,8 @@ class VLLMCompletionsWrapper(RunnableSerializable):
         **kwargs: Any,
     ) -> Sequence[Union[str, BaseMessage]]:
         """Return a generator of string chunks or message chunks."""
-        # For simplicity, we're not actually streaming, just returning the full response
-        # as a single chunk
-        result = self.invoke(input, config, **kwargs)
-        yield result
+        for chunk in self.llm.stream(self._to_prompt(input), **kwargs):
+            yield self._to_output_chunk(input, chunk)
 
     async def astream(
         self,
@@ -108,8 +136,8 @@ class VLLMCompletionsWrapper(RunnableSerializable):
         **kwargs: Any,
     ) -> Sequence[Union[str, BaseMessage]]:
         """Asynchronous version of stream."""
-        result = await self.ainvoke(input, config, **kwargs)
-        yield result
+        async for chunk in self.llm.astream(self._to_prompt(input), **kwargs):
+            yield self._to_output_chunk(input, chunk)
         
     def transform(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
         """Transform inputs before calling the model."""
@@ -119,9 +147,63 @@ class VLLMCompletionsWrapper(RunnableSerializable):
         """Bind arguments to the runnable, returning a new runnable."""
         return self.__class__(self.llm.bind(**kwargs))
 
+# Fixing parsers by (id(parser), id(engine)); entries keep both alive so their ids are never reused
+_fixing_parser_cache: Dict[Tuple[int, int], Tuple[Any, Any, Any]] = {}
+_fixing_parser_lock = threading.Lock()
+
+def _get_fixing_parser(parser: Any, engine: Any) -> Any:
+    """
+    Returns the OutputFixingParser for a parser and engine, building it on the first parse failure only.
+
+    Args:
+        parser (Any): The parser whose output needs fixing.
+        engine (Any): The engine used to fix the output.
+
+    Returns:
+        Any: The shared OutputFixingParser.
+    """
+    key = (id(parser), id(engine))
+    if key not in _fixing_parser_cache:
+        with _fixing_parser_lock:
+            if key not in _fixing_parser_cache:
+                # Imported here: langchain.output_parsers is slow to import and only needed on a failure
+                from langchain.output_parsers import OutputFixingParser
+                _fixing_parser_cache[key] = (parser, engine, OutputFixingParser.from_llm(parser=parser, llm=engine))
+    return _fixing_parser_cache[key][2]
+
+class _NullLogger:
+    """Fallback logger that does nothing, for calls made outside an initialized run."""
+
+    def log(self, *args, **kwargs):
+        pass
+
+_NULL_LOGGER = _NullLogger()
+
+# Provider exceptions are not shared across SDKs, so transient failures are also recognized by name
+_RETRYABLE_ERROR_NAMES = ("RateLimit", "Timeout", "Connection", "ServiceUnavailable", "ResourceExhausted", "InternalServerError")
+
+def _is_retryable(error: Exception) -> bool:
+    """
+    Checks whether an LLM call failure is transient (rate limit, timeout, server error) and worth retrying.
+
+    Args:
+        error (Exception): The exception raised by the call.
+
+    Returns:
+        bool: True for 429/5xx responses and network errors, False for permanent ones such as auth failures.
+    """
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+    return any(name in type(error).__name__ for name in _RETRYABLE_ERROR_NAMES)
+
+@functools.lru_cache(maxsize=64)
 def get_llm_chain(engine_name: str, temperature: float = 0, base_uri: str = None) -> Any:
     """
     Returns the appropriate LLM chain based on the provided engine name and temperature.
+    Chains are immutable runnables, so one instance is shared per set of arguments.
 
     Args:
         engine (str): The name of the engine.
@@ -138,8 +220,8 @@ def get_llm_chain(engine_name: str, temperature: float = 0, base_uri: str = None
         raise ValueError(f"Engine {engine_name} not supported")
     
     config = ENGINE_CONFIGS[engine_name]
-    constructor = config["constructor"]
-    params = config["params"].copy()  # Make a copy to avoid modifying the original
+    constructor = get_engine_constructor(engine_name)
+    params = get_engine_params(engine_name)  # A copy, safe to modify
     if temperature:
         params["temperature"] = temperature
     
@@ -147,9 +229,10 @@ def get_llm_chain(engine_name: str, temperature: float = 0, base_uri: str = None
     if base_uri and "openai_api_base" in params:
         params["openai_api_base"] = f"{base_uri}/v1"
     
-    model = constructor(**params)
+    model = get_engine(engine_name, params)
     
     # For OpenAI completions API models (e.g., vLLM), wrap with our LangChain-compatible adapter
+    from langchain_openai import OpenAI
     if constructor == OpenAI:
         model = VLLMCompletionsWrapper(model)
     
@@ -160,7 +243,7 @@ def get_llm_chain(engine_name: str, temperature: float = 0, base_uri: str = None
         
     return llm_chain
 
-def call_llm_chain(prompt: Any, engine: Any, parser: Any, request_kwargs: Dict[str, Any], step: int, max_attempts: int = 12, backoff_base: int = 2, jitter_max: int = 60) -> Any:
+def call_llm_chain(prompt: Any, engine: Any, parser: Any, request_kwargs: Dict[str, Any], step: int, max_attempts: int = 12, backoff_base: int = 2, jitter_max: int = 60, prerendered: Optional[Any] = None) -> Any:
     """
     Calls the LLM chain with exponential backoff and jitter on failure.
 
@@ -173,6 +256,7 @@ def call_llm_chain(prompt: Any, engine: Any, parser: Any, request_kwargs: Dict[s
         max_attempts (int, optional): The maximum number of attempts. Defaults to 12.
         backoff_base (int, optional): The base for exponential backoff. Defaults to 2.
         jitter_max (int, optional): The maximum jitter in seconds. Defaults to 60.
+        prerendered (Any, optional): The prompt already rendered with request_kwargs, to skip rendering it again.
 
     Returns:
         Any: The output from the chain.
@@ -181,22 +265,104 @@ def call_llm_chain(prompt: Any, engine: Any, parser: Any, request_kwargs: Dict[s
         Exception: If all attempts fail.
     """
     logger = Logger()
+    # Rendered once; the engine is invoked on the prompt value directly, which is what prompt | engine does
+    rendered = prerendered if prerendered is not None else prompt.invoke(request_kwargs)
+    prompt_text = rendered.messages[0].content
+    active_parser = parser
     for attempt in range(max_attempts):
         try:
-            # chain = prompt | engine | parser
-            chain = prompt | engine
-            prompt_text = prompt.invoke(request_kwargs).messages[0].content
-            output = chain.invoke(request_kwargs)
-            if isinstance(output, str):
-                if output.strip() == "":
-                    engine = get_llm_chain("gemini-1.5-flash")
+            engine_name, temperature = engine_identity(engine)
+            cache = get_response_cache(temperature)
+            cache_key = make_cache_key(engine_name, prompt_text, request_kwargs, temperature) if cache else None
+            cached = cache.get(cache_key) if cache else None
+            output = cached if cached is not None else engine.invoke(rendered)
+            raw_output = output
+            content = output if isinstance(output, str) else output.content
+            if content.strip() == "":
+                if attempt == max_attempts - 1:
                     raise OutputParserException("Empty output")
-            else:
-                if output.content.strip() == "":    
-                    engine = get_llm_chain("gemini-1.5-flash")
+                # Retry on the fallback engine; there is nothing for a fixing parser to fix
+                logger.log("Empty output, retrying with gemini-1.5-flash", "warning")
+                engine = get_llm_chain("gemini-1.5-flash")
+                continue
+            output = active_parser.invoke(output)
+            if cache and cached is None:
+                cache.set(cache_key, raw_output)
+            logger.enqueue_conversation(
+                [
+                    {
+                        "text": prompt_text,
+                        "from": "Human",
+                        "step": step
+                    },
+                    {
+                        "text": output,
+                        "from": "AI",
+                        "step": step
+                    }
+                ]
+            )
+            return output
+        except OutputParserException as e:
+            logger.log(f"OutputParserException: {e}", "warning")
+            if active_parser is parser:
+                active_parser = _get_fixing_parser(parser, engine)
+            if attempt == max_attempts - 1:
+                logger.log(f"call_chain: {e}", "error")
+                raise e
+        except Exception as e:
+            if attempt < max_attempts - 1 and _is_retryable(e):
+                logger.log(f"Failed to invoke the chain {attempt + 1} times.\n{type(e)}\n{e}", "warning")
+                sleep_time = (backoff_base ** attempt) + random.uniform(0, jitter_max)
+                time.sleep(sleep_time)
+                continue
+            logger.log(f"Failed to invoke the chain {attempt + 1} times.\n{type(e)} <{e}>\n", "error")
+            raise e
+
+async def _acall_llm_chain(prompt: Any, engine: Any, parser: Any, request_kwargs: Dict[str, Any], step: int, max_attempts: int = 12, backoff_base: int = 2, jitter_max: int = 60, prerendered: Optional[Any] = None) -> Any:
+    """
+    Asynchronous counterpart of `call_llm_chain`, awaiting the chain instead of blocking on it.
+
+    Args:
+        prompt (Any): The prompt to be passed to the chain.
+        engine (Any): The engine to be used in the chain.
+        parser (Any): The parser to parse the output.
+        request_kwargs (Dict[str, Any]): The request arguments.
+        step (int): The current step in the process.
+        max_attempts (int, optional): The maximum number of attempts. Defaults to 12.
+        backoff_base (int, optional): The base for exponential backoff. Defaults to 2.
+        jitter_max (int, optional): The maximum jitter in seconds. Defaults to 60.
+        prerendered (Any, optional): The prompt already rendered with request_kwargs, to skip rendering it again.
+
+    Returns:
+        Any: The output from the chain.
+
+    Raises:
+        Exception: If all attempts fail.
+    """
+    logger = Logger()
+    rendered = prerendered if prerendered is not None else prompt.invoke(request_kwargs)
+    prompt_text = rendered.messages[0].content
+    active_parser = parser
+    for attempt in range(max_attempts):
+        try:
+            engine_name, temperature = engine_identity(engine)
+            cache = get_response_cache(temperature)
+            cache_key = make_cache_key(engine_name, prompt_text, request_kwargs, temperature) if cache else None
+            cached = cache.get(cache_key) if cache else None
+            output = cached if cached is not None else await engine.ainvoke(rendered)
+            raw_output = output
+            content = output if isinstance(output, str) else output.content
+            if content.strip() == "":
+                if attempt == max_attempts - 1:
                     raise OutputParserException("Empty output")
-            output = parser.invoke(output)
-            logger.log_conversation(
+                logger.log("Empty output, retrying with gemini-1.5-flash", "warning")
+                engine = get_llm_chain("gemini-1.5-flash")
+                continue
+            output = await active_parser.ainvoke(output)
+            if cache and cached is None:
+                cache.set(cache_key, raw_output)
+            logger.enqueue_conversation(
                 [
                     {
                         "text": prompt_text,
@@ -213,21 +379,36 @@ def call_llm_chain(prompt: Any, engine: Any, parser: Any, request_kwargs: Dict[s
             return output
         except OutputParserException as e:
             logger.log(f"OutputParserException: {e}", "warning")
-            new_parser = OutputFixingParser.from_llm(parser=parser, llm=engine)
-            chain = prompt | engine | new_parser
+            if active_parser is parser:
+                active_parser = _get_fixing_parser(parser, engine)
             if attempt == max_attempts - 1:
                 logger.log(f"call_chain: {e}", "error")
                 raise e
         except Exception as e:
-            # if attempt < max_attempts - 1:
-            #     logger.log(f"Failed to invoke the chain {attempt + 1} times.\n{type(e)}\n{e}", "warning")
-            #     sleep_time = (backoff_base ** attempt) + random.uniform(0, jitter_max)
-            #     time.sleep(sleep_time)
-            # else:
+            if attempt < max_attempts - 1 and _is_retryable(e):
+                logger.log(f"Failed to invoke the chain {attempt + 1} times.\n{type(e)}\n{e}", "warning")
+                await asyncio.sleep((backoff_base ** attempt) + random.uniform(0, jitter_max))
+                continue
             logger.log(f"Failed to invoke the chain {attempt + 1} times.\n{type(e)} <{e}>\n", "error")
             raise e
 
-def async_llm_chain_call(
+def _render_prompt(prompt: Any, request_kwargs: Dict[str, Any]) -> Optional[Any]:
+    """
+    Renders a request's prompt once, to be shared by all of its samples.
+
+    Args:
+        prompt (Any): The prompt template.
+        request_kwargs (Dict[str, Any]): The request arguments.
+
+    Returns:
+        Optional[Any]: The prompt value, or None if rendering failed so each call reports the error itself.
+    """
+    try:
+        return prompt.invoke(request_kwargs)
+    except Exception:
+        return None
+
+async def aasync_llm_chain_call(
     prompt: Any, 
     engine: Any, 
     parser: Any, 
@@ -236,46 +417,128 @@ def async_llm_chain_call(
     sampling_count: int = 1
 ) -> List[List[Any]]:
     """
-    Asynchronously calls the LLM chain using multiple threads.
+    Calls the LLM chain concurrently on the event loop.
 
     Args:
         prompt (Any): The prompt to be passed to the chain.
-        engine (Any): The engine to be used in the chain.
+        engine (Any): The engine, or list of engines assigned round-robin, to be used in the chain.
         parser (Any): The parser to parse the output.
         request_list (List[Dict[str, Any]]): The list of request arguments.
         step (int): The current step in the process.
         sampling_count (int): The number of samples to be taken.
 
     Returns:
-        List[List[Any]]: A list of lists containing the results for each request.
+        List[List[Any]]: A list of lists containing the results for each request. Failed calls yield None.
     """
+    semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+
+    async def _bounded_call(**kwargs: Any) -> Any:
+        async with semaphore:
+            return await _acall_llm_chain(**kwargs)
 
-    call_list = []
-    engine_id = 0
-    for request_id, request_kwargs in enumerate(request_list):
+    # One flat list of request x sample calls, all in flight together so the server can batch them
+    tasks = []
+    engines = itertools.cycle(engine) if isinstance(engine, list) else itertools.repeat(engine)
+    for request_kwargs in request_list:
+        rendered = _render_prompt(prompt, request_kwargs)
         for _ in range(sampling_count):
-            call_list.append({
-                'function': call_llm_chain,
-                'kwargs': {
-                    'prompt': prompt,
-                    'engine': engine[engine_id % len(engine)] if isinstance(engine,list) else engine,
-                    'parser': parser,
-                    'request_kwargs': request_kwargs,
-                    'step': step
-                }
-            })
-            engine_id += 1
-
-    # Execute the functions concurrently
-    results = ordered_concurrent_function_calls(call_list)
-
-    # Group results by sampling_count
-    grouped_results = [
+            tasks.append(_bounded_call(
+                prompt=prompt,
+                engine=next(engines),
+                parser=parser,
+                request_kwargs=request_kwargs,
+                step=step,
+                prerendered=rendered
+            ))
+
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    # Same contract as ordered_concurrent_function_calls: a failed call yields None
+    for idx, result in enumerate(results):
+        if isinstance(result, Exception):
+            logging.error(f"Exception in LLM call with kwargs: {request_list[idx // sampling_count]}\n{result}")
+            results[idx] = None
+
+    return [
         results[i * sampling_count: (i + 1) * sampling_count]
         for i in range(len(request_list))
     ]
 
-    return grouped_results
+_event_loop: Optional[asyncio.AbstractEventLoop] = None
+_event_loop_lock = threading.Lock()
+
+def _get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Returns the event loop that runs all synchronous batch calls, started on first use.
+    Engines are shared across calls and their async HTTP clients keep pooled connections
+    bound to one loop, so a fresh asyncio.run() per call would break the reused connections.
+
+    Returns:
+        asyncio.AbstractEventLoop: The loop, running in a daemon thread.
+    """
+    global _event_loop
+    with _event_loop_lock:
+        if _event_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="llm-event-loop", daemon=True).start()
+            _event_loop = loop
+    return _event_loop
+
+def async_llm_chain_call(
+    prompt: Any, 
+    engine: Any, 
+    parser: Any, 
+    request_list: List[Dict[str, Any]], 
+    step: int, 
+    sampling_count: int = 1
+) -> List[List[Any]]:
+    """
+    Calls the LLM chain concurrently and blocks until all results are available.
+
+    Args:
+        prompt (Any): The prompt to be passed to the chain.
+        engine (Any): The engine to be used in the chain.
+        parser (Any): The parser to parse the output.
+        request_list (List[Dict[str, Any]]): The list of request arguments.
+        step (int): The current step in the process.
+        sampling_count (int): The number of samples to be taken.
+
+    Returns:
+        List[List[Any]]: A list of lists containing the results for each request.
+    """
+    loop = _get_event_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        raise RuntimeError("async_llm_chain_call cannot block the LLM event loop; await aasync_llm_chain_call instead")
+    return asyncio.run_coroutine_threadsafe(
+        aasync_llm_chain_call(prompt, engine, parser, request_list, step, sampling_count), loop
+    ).result()
+
+# Text extractor per response type, resolved on first sight of each type
+_RESPONSE_TEXT_EXTRACTORS: Dict[type, Any] = {str: lambda output: output, AIMessage: lambda output: output.content}
+
+def _response_text(output: Any) -> str:
+    """
+    Extracts the text of an engine response: message content, a plain string, or a string representation.
+
+    Args:
+        output (Any): The engine response.
+
+    Returns:
+        str: The response text.
+    """
+    extractor = _RESPONSE_TEXT_EXTRACTORS.get(type(output))
+    if extractor is None:
+        if hasattr(output, 'content'):
+            extractor = lambda output: output.content
+        elif isinstance(output, str):
+            extractor = lambda output: output
+        else:
+            extractor = str
+        _RESPONSE_TEXT_EXTRACTORS[type(output)] = extractor
+    return extractor(output)
 
 def call_engine(message: str, engine: Any, max_attempts: int = 12, backoff_base: int = 2, jitter_max: int = 60) -> Any:
     """
@@ -294,35 +557,33 @@ def call_engine(message: str, engine: Any, max_attempts: int = 12, backoff_base:
     Raises:
         Exception: If all attempts fail.
     """
-    try:
-        # Try to get the logger, but don't require it
-        from runner.logger import Logger
-        logger = Logger()
-    except Exception:
-        # Create a simple fallback logger that does nothing
-        class NullLogger:
-            def log(self, *args, **kwargs):
-                pass
-        logger = NullLogger()
+    # An empty prompt has no answer worth a round trip
+    if not message or (isinstance(message, str) and not message.strip()):
+        return ""
+
+    # Use the run's logger if one was initialized, but don't require it
+    logger = Logger._instance or _NULL_LOGGER
         
+    engine_name, temperature = engine_identity(engine)
+    cache = get_response_cache(temperature)
+    cache_key = make_cache_key(engine_name, message, None, temperature) if cache else None
+    if cache:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
     for attempt in range(max_attempts):
         try:
-            output = engine.invoke(message)
-            
-            # Handle different response formats
-            if hasattr(output, 'content'):
-                return output.content
-            elif isinstance(output, str):
-                return output
-            else:
-                # Try to get a string representation
-                return str(output)
+            output = _response_text(engine.invoke(message))
+            if cache:
+                cache.set(cache_key, output)
+            return output
                 
         except Exception as e:
-            # if attempt < max_attempts - 1:
-            #     logger.log(f"Failed to invoke the chain {attempt + 1} times.\n{type(e)}\n{e}", "warning")
-            #     sleep_time = (backoff_base ** attempt) + random.uniform(0, jitter_max)
-            #     time.sleep(sleep_time)
-            # else:
+            if attempt < max_attempts - 1 and _is_retryable(e):
+                logger.log(f"Failed to invoke the chain {attempt + 1} times.\n{type(e)}\n{e}", "warning")
+                sleep_time = (backoff_base ** attempt) + random.uniform(0, jitter_max)
+                time.sleep(sleep_time)
+                continue
             logger.log(f"Failed to invoke the chain {attempt + 1} times.\n{type(e)} <{e}>\n", "error")
-            raise e
\ No newline at end of file
+            raise e
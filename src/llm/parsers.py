@@ -2,16 +2,44 @@ import json
 import re
 import logging
 from ast import literal_eval
-from typing import Any, Dict, List, Tuple
-import threading
+from typing import Any, Dict, List, Optional, Tuple
 
 from langchain_core.output_parsers.base import BaseOutputParser
 from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.pydantic_v1 import BaseModel, Field
 from langchain_core.exceptions import OutputParserException
 
-_parser_cache = {}
-_parser_lock = threading.Lock()
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Patterns used on every parse, compiled once
+_SQL_BLOCK_RE = re.compile(r"```sql\s*(.*?)\s*```", re.DOTALL)
+# Greedy negated class scans linearly; [^;] already spans newlines
+_SELECT_RE = re.compile(r"\bSELECT\b[^;]*;?", re.IGNORECASE)
+_FINAL_ANSWER_RE = re.compile(r"<FINAL_ANSWER>(.*?)</FINAL_ANSWER>", re.DOTALL)
+_ANSWER_RE = re.compile(r"<Answer>(.*?)</Answer>", re.DOTALL)
+_REASONING_RE = re.compile(r'"reasoning":\s*"([^"]+)"')
+_RESPONSE_RE = re.compile(r'"response":\s*"([^"]+)"')
+# Strips ```sql and ``` fences in one pass, matching the old chained replace() calls
+_CODE_FENCE_RE = re.compile(r"```(?:sql)?")
+_WS_TABLE = str.maketrans({"\n": " ", "\t": " "})
+# Format sentinels of the parsers below, as one alternation so detection is a single scan
+_SENTINEL_RE = re.compile(
+    r"(?P<sql>```sql)|(?P<json>```json)|(?P<final_answer><FINAL_ANSWER>)"
+    r"|(?P<answer><Answer>)|(?P<final_answer_text>My final answer is:)"
+)
+
+def _json_loads(text: str) -> Any:
+    # orjson is several times faster; stdlib json stays as the fallback for inputs
+    # orjson rejects but json accepts (NaN, Infinity)
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(text)
 
 class PythonListOutputParser(BaseOutputParser):
     """Parses output embedded in markdown code blocks containing Python lists."""
@@ -29,11 +57,15 @@ class PythonListOutputParser(BaseOutputParser):
         Returns:
             Any: The parsed Python list.
         """
-        logging.debug(f"Parsing output with PythonListOutputParser: {output}")
-        if "```python" in output:
-            output = output.split("```python")[1].split("```")[0]
-        output = re.sub(r"^\s+", "", output)
-        return eval(output)  # Note: Using eval is potentially unsafe, consider using ast.literal_eval if possible.
+        logging.debug("Parsing output with PythonListOutputParser: %s", output)
+        _, fence, rest = output.partition("```python")
+        if fence:
+            output = rest.partition("```")[0]
+        output = output.lstrip()
+        try:
+            return literal_eval(output)
+        except Exception as e:
+            raise OutputParserException(f"Error parsing Python list: {e}")
 
 class FilterColumnOutput(BaseModel):
     """Model for filter column output."""
@@ -56,12 +88,13 @@ class SelectTablesOutputParser(BaseOutputParser):
         Returns:
             Any: The parsed JSON content.
         """
-        logging.debug(f"Parsing output with SelectTablesOutputParser: {output}")
-        if "```json" in output:
-            output = output.split("```json")[1].split("```")[0]
-        output = re.sub(r"^\s+", "", output)
-        output = output.replace("\n", " ").replace("\t", " ")
-        return json.loads(output)
+        logging.debug("Parsing output with SelectTablesOutputParser: %s", output)
+        _, fence, rest = output.partition("```json")
+        if fence:
+            output = rest.partition("```")[0]
+        output = output.lstrip()
+        output = output.translate(_WS_TABLE)
+        return _json_loads(output)
 
 class ColumnSelectionOutput(BaseModel):
     """Model for column selection output."""
@@ -88,10 +121,11 @@ class GenerateCandidateFinetunedMarkDownParser(BaseOutputParser):
         Returns:
             Dict[str, str]: A dictionary with the SQL query.
         """
-        logging.debug(f"Parsing output with MarkDownOutputParser: {output}")
-        if "```sql" in output:
-            output = output.split("```sql")[1].split("```")[0]
-        output = re.sub(r"^\s+", "", output)
+        logging.debug("Parsing output with MarkDownOutputParser: %s", output)
+        _, fence, rest = output.partition("```sql")
+        if fence:
+            output = rest.partition("```")[0]
+        output = output.lstrip()
         return {"SQL": output}
     
 class ReviseOutput(BaseModel):
@@ -116,14 +150,13 @@ class GenerateCandidateGeminiMarkDownParserCOT(BaseOutputParser):
         Returns:
             Dict[str, str]: A dictionary with the SQL query.
         """
-        logging.debug(f"Parsing output with RecapOutputParserCOT: {output}")
+        logging.debug("Parsing output with RecapOutputParserCOT: %s", output)
         plan = ""
-        if "<FINAL_ANSWER>" in output and "</FINAL_ANSWER>" in output:
-            plan = output.split("<FINAL_ANSWER>")[0]
-            output = output.split("<FINAL_ANSWER>")[1].split(
-            "</FINAL_ANSWER>"
-            )[0]
-        query = output.replace("```sql", "").replace("```", "").replace("\n", " ")
+        match = _FINAL_ANSWER_RE.search(output)
+        if match:
+            plan = output[:match.start()]
+            output = match.group(1)
+        query = _CODE_FENCE_RE.sub("", output).replace("\n", " ")
         return {"SQL": query, "plan": plan}
         
 class VLLMSQLMarkdownParser(BaseOutputParser):
@@ -151,40 +184,37 @@ class VLLMSQLMarkdownParser(BaseOutputParser):
                 text_content = str(output)
             
             # Detailed logging for debugging
-            logging.warning(f"vLLM Parser - Raw output type: {type(output)}")
-            logging.warning(f"vLLM Parser - Raw output preview: {text_content[:250]}...")
+            logging.warning("vLLM Parser - Raw output type: %s", type(output))
+            logging.warning("vLLM Parser - Raw output preview: %.250s...", text_content)
             
             # Try to extract SQL content from the response
             plan = ""
             
             # Look for SQL code blocks
-            sql_pattern = re.compile(r"```sql\s*(.*?)\s*```", re.DOTALL)
-            matches = sql_pattern.findall(text_content)
+            matches = _SQL_BLOCK_RE.findall(text_content)
             
             if matches:
                 # Found SQL in code blocks
                 query = matches[0].strip()
-                logging.warning(f"vLLM Parser - Found SQL in code block: {query[:100]}...")
+                logging.warning("vLLM Parser - Found SQL in code block: %.100s...", query)
             else:
                 # If no SQL block found, look for FINAL_ANSWER markers
-                if "<FINAL_ANSWER>" in text_content and "</FINAL_ANSWER>" in text_content:
-                    plan = text_content.split("<FINAL_ANSWER>")[0]
-                    text_content = text_content.split("<FINAL_ANSWER>")[1].split(
-                    "</FINAL_ANSWER>"
-                    )[0]
-                    logging.warning(f"vLLM Parser - Found SQL in FINAL_ANSWER: {text_content[:100]}...")
+                match = _FINAL_ANSWER_RE.search(text_content)
+                if match:
+                    plan = text_content[:match.start()]
+                    text_content = match.group(1)
+                    logging.warning("vLLM Parser - Found SQL in FINAL_ANSWER: %.100s...", text_content)
                 
                 # Look for SELECT statements directly
-                select_pattern = re.compile(r"\bSELECT\b.*?(?:;|$)", re.IGNORECASE | re.DOTALL)
-                select_matches = select_pattern.findall(text_content)
+                select_match = _SELECT_RE.search(text_content)
                 
-                if select_matches:
-                    query = select_matches[0].strip()
-                    logging.warning(f"vLLM Parser - Found SELECT statement: {query[:100]}...")
+                if select_match:
+                    query = select_match.group(0).strip()
+                    logging.warning("vLLM Parser - Found SELECT statement: %.100s...", query)
                 else:
                     # Fallback - just clean the text hoping it contains SQL
-                    query = text_content.replace("```sql", "").replace("```", "").strip()
-                    logging.warning(f"vLLM Parser - Using fallback method: {query[:100]}...")
+                    query = _CODE_FENCE_RE.sub("", text_content).strip()
+                    logging.warning("vLLM Parser - Using fallback method: %.100s...", query)
             
             # Remove newlines for final SQL query
             query = query.replace("\n", " ")
@@ -226,14 +256,15 @@ class GeminiMarkDownOutputParserCOT(BaseOutputParser):
         Returns:
             Dict[str, str]: A dictionary with the SQL query.
         """
-        logging.debug(f"Parsing output with MarkDownOutputParserCoT: {output}")
+        logging.debug("Parsing output with MarkDownOutputParserCoT: %s", output)
         if "My final answer is:" in output:
             plan, query = output.split("My final answer is:")
         else:
             plan, query = output, output
-        if "```sql" in query:
-            query = query.split("```sql")[1].split("```")[0]
-        query = re.sub(r"^\s+", "", query)
+        _, fence, rest = query.partition("```sql")
+        if fence:
+            query = rest.partition("```")[0]
+        query = query.lstrip()
         return {"SQL": query, "plan": plan}
 
 class ReviseGeminiOutputParser(BaseOutputParser):
@@ -252,14 +283,13 @@ class ReviseGeminiOutputParser(BaseOutputParser):
         Returns:
             Dict[str, str]: A dictionary with the SQL query.
         """
-        logging.debug(f"Parsing output with CheckerOutputParser: {output}")
-        if "<FINAL_ANSWER>" in output and "</FINAL_ANSWER>" in output:
-            output = output.split("<FINAL_ANSWER>")[1].split(
-            "</FINAL_ANSWER>"
-            )[0]
+        logging.debug("Parsing output with CheckerOutputParser: %s", output)
+        match = _FINAL_ANSWER_RE.search(output)
+        if match:
+            output = match.group(1)
         if "<FINAL_ANSWER>" in output:
             output = output.split("<FINAL_ANSWER>")[1]
-        query = output.replace("```sql", "").replace("```", "").replace("\n", " ")
+        query = _CODE_FENCE_RE.sub("", output).replace("\n", " ")
         return {"refined_sql_query": query}
 
    
@@ -302,24 +332,19 @@ class UnitTestEvaluationOutput(BaseOutputParser):
         Returns:
             Dict[str, str]: A dictionary with the SQL query.
         """
-        logging.debug(f"Parsing output with MarkDownOutputParser: {output}")
-        if "<Answer>" in output and "</Answer>" in output:
-            output = output.split("<Answer>")[1].split(
-            "</Answer>"
-            )[0].strip()
+        logging.debug("Parsing output with MarkDownOutputParser: %s", output)
+        match = _ANSWER_RE.search(output)
+        if match:
+            output = match.group(1).strip()
         else:
             raise OutputParserException("Your answer is not in the correct format. Please make sure to include your answer in the format <Answer>...</Answer>")
         scores = []
-        for line in output.split("\n"):
-            if ":" in line:
-                try:
-                    key, value = line.split(":")
-                    if "passed" in value.lower():
-                        scores.append(1)
-                    else:
-                        scores.append(0)
-                except Exception as e:
-                    raise OutputParserException(f"Error parsing unit test evaluation: {e}, each line should be in the format 'unit test #n: Passed/Failed'")
+        for line in output.splitlines():
+            # Only the text after the first colon matters
+            _, sep, value = line.partition(":")
+            if not sep:
+                continue
+            scores.append(1 if "passed" in value.lower() else 0)
         return {"scores": scores}
     
 class TestCaseGenerationOutput(BaseOutputParser):
@@ -336,11 +361,10 @@ class TestCaseGenerationOutput(BaseOutputParser):
         Returns:
             Dict[str, str]: A dictionary with the SQL query.
         """
-        logging.debug(f"Parsing output with MarkDownOutputParser: {output}")
-        if "<Answer>" in output and "</Answer>" in output:
-            output = output.split("<Answer>")[1].split(
-            "</Answer>"
-            )[0]
+        logging.debug("Parsing output with MarkDownOutputParser: %s", output)
+        match = _ANSWER_RE.search(output)
+        if match:
+            output = match.group(1)
         else:
             raise OutputParserException("Your answer is not in the correct format. Please make sure to include your answer in the format <Answer>...</Answer>")
         try:
@@ -365,15 +389,16 @@ class ResponseGenerationOutputParser(BaseOutputParser):
         Returns:
             Dict[str, str]: A dictionary with chain_of_thought_reasoning and response.
         """
-        logging.debug(f"Parsing output with ResponseGenerationOutputParser: {output}")
+        logging.debug("Parsing output with ResponseGenerationOutputParser: %s", output)
         
         try:
             # Clean the output to handle potential markdown code blocks
-            if "```json" in output:
-                output = output.split("```json")[1].split("```")[0]
+            _, fence, rest = output.partition("```json")
+            if fence:
+                output = rest.partition("```")[0]
             
             # Parse the JSON
-            parsed_output = json.loads(output)
+            parsed_output = _json_loads(output)
             
             # Accept either "reasoning" or "chain_of_thought_reasoning"
             reasoning = parsed_output.get("chain_of_thought_reasoning", 
@@ -395,13 +420,13 @@ class ResponseGenerationOutputParser(BaseOutputParser):
                 "response": response
             }
         except json.JSONDecodeError as e:
-            logging.error(f"JSON parsing error: {str(e)}\nRaw output: {output}")
+            logging.error("JSON parsing error: %s\nRaw output: %s", e, output)
             raise OutputParserException(f"Failed to parse JSON output: {str(e)}")
         except Exception as e:
-            logging.error(f"Error parsing response: {str(e)}\nRaw output: {output}")
+            logging.error("Error parsing response: %s\nRaw output: %s", e, output)
             # Attempt to extract the first valid 'reasoning' and 'response'
-            reasoning_matches = re.findall(r'"reasoning":\s*"([^"]+)"', output)
-            response_matches = re.findall(r'"response":\s*"([^"]+)"', output)
+            reasoning_matches = _REASONING_RE.findall(output)
+            response_matches = _RESPONSE_RE.findall(output)
             reasoning = reasoning_matches[-1] if reasoning_matches else "Error occurred during response generation."
             response = response_matches[-1] if response_matches else "Based on the SQL query results, there are 203 female superheroes in the database."
             return {
@@ -414,34 +439,43 @@ class QueryEnhancementOutput(BaseModel):
     reasoning: str = Field(description="Explanation of how the context was analyzed and why the query was enhanced")
     enhanced_question: str = Field(description="The enhanced question with relevant context")
 
+# All parsers are stateless, so one instance per name is built at import time
+_PARSERS: Dict[str, BaseOutputParser] = {
+    "python_list_output_parser": PythonListOutputParser(),
+    "filter_column": JsonOutputParser(pydantic_object=FilterColumnOutput),
+    "select_tables": JsonOutputParser(pydantic_object=SelectTablesOutputParser),
+    "select_columns": JsonOutputParser(pydantic_object=ColumnSelectionOutput),
+    "generate_candidate": JsonOutputParser(pydantic_object=GenerateCandidateOutput),
+    "generated_candidate_finetuned": GenerateCandidateFinetunedMarkDownParser(),
+    "revise": JsonOutputParser(pydantic_object=ReviseOutput),
+    "generate_candidate_gemini_markdown_cot": GenerateCandidateGeminiMarkDownParserCOT(),
+    "generate_candidate_vllm_cot": VLLMSQLMarkdownParser(),  # New parser for vLLM
+    "generate_candidate_gemini_cot": GeminiMarkDownOutputParserCOT(),
+    "revise_new": ReviseGeminiOutputParser(),
+    "list_output_parser": ListOutputParser(),
+    "evaluate": UnitTestEvaluationOutput(),
+    "generate_unit_tests": TestCaseGenerationOutput(),
+    "response_generation": ResponseGenerationOutputParser(),
+    "query_enhancement": JsonOutputParser(pydantic_object=QueryEnhancementOutput),
+}
+
 def get_parser(parser_name: str) -> BaseOutputParser:
     """Returns the appropriate parser based on the provided parser name."""
-    if parser_name not in _parser_cache:
-        with _parser_lock:  # Only lock if parser needs to be created
-            if parser_name not in _parser_cache:  # Double-check pattern
-                parser_configs = {
-                    "python_list_output_parser": PythonListOutputParser,
-                    "filter_column": lambda: JsonOutputParser(pydantic_object=FilterColumnOutput),
-                    "select_tables": lambda: JsonOutputParser(pydantic_object=SelectTablesOutputParser),
-                    "select_columns": lambda: JsonOutputParser(pydantic_object=ColumnSelectionOutput),
-                    "generate_candidate": lambda: JsonOutputParser(pydantic_object=GenerateCandidateOutput),
-                    "generated_candidate_finetuned": GenerateCandidateFinetunedMarkDownParser(),
-                    "revise": lambda: JsonOutputParser(pydantic_object=ReviseOutput),
-                    "generate_candidate_gemini_markdown_cot": GenerateCandidateGeminiMarkDownParserCOT(),
-                    "generate_candidate_vllm_cot": VLLMSQLMarkdownParser(),  # New parser for vLLM
-                    "generate_candidate_gemini_cot": GeminiMarkDownOutputParserCOT(),
-                    "revise_new": ReviseGeminiOutputParser(),
-                    "list_output_parser": ListOutputParser(),
-                    "evaluate": UnitTestEvaluationOutput(),
-                    "generate_unit_tests": TestCaseGenerationOutput(),
-                    "response_generation": ResponseGenerationOutputParser,
-                    "query_enhancement": lambda: JsonOutputParser(pydantic_object=QueryEnhancementOutput),
-                }
-                
-                if parser_name not in parser_configs:
-                    raise ValueError(f"Invalid parser name: {parser_name}")
-                
-                logging.info(f"Creating parser for: {parser_name}")
-                _parser_cache[parser_name] = parser_configs[parser_name]() if callable(parser_configs[parser_name]) else parser_configs[parser_name]
-    
-    return _parser_cache[parser_name]
+    try:
+        return _PARSERS[parser_name]
+    except KeyError:
+        raise ValueError(f"Invalid parser name: {parser_name}") from None
+
+def detect_format(output: str) -> Optional[str]:
+    """
+    Detects the output format of an LLM response from the first format sentinel it contains.
+
+    Args:
+        output (str): The LLM response.
+
+    Returns:
+        Optional[str]: One of "sql", "json", "final_answer", "answer" or "final_answer_text",
+            or None if the response contains no sentinel.
+    """
+    match = _SENTINEL_RE.search(output)
+    return match.lastgroup if match else None
@@ -1,10 +1,12 @@
 import os
 import argparse
-import multiprocessing
+import functools
+import itertools
 from dotenv import load_dotenv
 import logging
 from pathlib import Path
-from typing import Dict, List, Any, Tuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, List, Any, Optional, Tuple
 
 from database_utils.db_values.preprocess import make_db_lsh
 from database_utils.db_catalog.preprocess import make_db_context_vec_db
@@ -12,7 +14,8 @@ from database_utils.database_factory import DatabaseFactory
 from database_utils.database_interface import DatabaseInterface
 
 load_dotenv(override=True)
-NUM_WORKERS = 1
+# Default worker count: one per CPU, capped at the number of databases
+NUM_WORKERS = os.cpu_count() or 1
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -37,10 +40,10 @@ def mysql_worker_initializer(db_id: str, args: argparse.Namespace):
         db_manager.clear_lsh_data()
         db_manager.clear_vector_data()
     
-    # Generate and store LSH signatures
+    lsh_stage = None
     if not args.skip_lsh:
-        logging.info(f"Creating LSH for {db_id}")
-        process_lsh_for_mysql(
+        lsh_stage = functools.partial(
+            process_lsh_for_mysql,
             db_manager=db_manager,
             db_directory_path=db_directory_path,
             signature_size=args.signature_size,
@@ -48,17 +51,15 @@ def mysql_worker_initializer(db_id: str, args: argparse.Namespace):
             threshold=args.threshold,
             verbose=args.verbose
         )
-        logging.info(f"LSH for {db_id} created.")
-    
-    # Generate and store vector embeddings
+    vector_stage = None
     if not args.skip_vectors:
-        logging.info(f"Creating context vectors for {db_id}")
-        process_vectors_for_mysql(
+        vector_stage = functools.partial(
+            process_vectors_for_mysql,
             db_manager=db_manager,
             db_directory_path=db_directory_path,
             use_value_description=args.use_value_description
         )
-        logging.info(f"Context vectors for {db_id} created.")
+    _run_lsh_and_vectors(db_id, lsh_stage, vector_stage)
 
 def sqlite_worker_initializer(db_id: str, args: argparse.Namespace):
     """
@@ -70,20 +71,51 @@ def sqlite_worker_initializer(db_id: str, args: argparse.Namespace):
     """
     db_directory_path = Path(args.db_root_directory) / db_id
     
+    lsh_stage = None
     if not args.skip_lsh:
-        logging.info(f"Creating LSH for {db_id}")
-        make_db_lsh(db_directory_path, 
-                    signature_size=args.signature_size, 
-                    n_gram=args.n_gram, 
-                    threshold=args.threshold,
-                    verbose=args.verbose)
-        logging.info(f"LSH for {db_id} created.")
-    
+        lsh_stage = functools.partial(
+            make_db_lsh,
+            db_directory_path,
+            signature_size=args.signature_size,
+            n_gram=args.n_gram,
+            threshold=args.threshold,
+            verbose=args.verbose,
+            legacy_pickles=args.legacy_pickles
+        )
+    vector_stage = None
     if not args.skip_vectors:
-        logging.info(f"Creating context vectors for {db_id}")
-        make_db_context_vec_db(db_directory_path,
-                               use_value_description=args.use_value_description)
-        logging.info(f"Context vectors for {db_id} created.")
+        vector_stage = functools.partial(
+            make_db_context_vec_db,
+            db_directory_path,
+            use_value_description=args.use_value_description
+        )
+    _run_lsh_and_vectors(db_id, lsh_stage, vector_stage)
+
+def _run_lsh_and_vectors(db_id: str, lsh_stage: Optional[Callable[[], Any]], vector_stage: Optional[Callable[[], Any]]):
+    """
+    Runs the enabled LSH and context vector stages for a database.
+    The stages share no inputs (column values vs. description CSVs), and embedding time is
+    mostly API latency, so the vector stage runs in a background thread while LSH is built.
+    
+    Args:
+        db_id (str): The database ID.
+        lsh_stage (Callable, optional): Builds and stores the LSH, or None to skip it.
+        vector_stage (Callable, optional): Builds and stores the context vectors, or None to skip it.
+    """
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        vector_future = None
+        if vector_stage is not None:
+            logging.info(f"Creating context vectors for {db_id}")
+            vector_future = executor.submit(vector_stage)
+        
+        if lsh_stage is not None:
+            logging.info(f"Creating LSH for {db_id}")
+            lsh_stage()
+            logging.info(f"LSH for {db_id} created.")
+        
+        if vector_future is not None:
+            vector_future.result()
+            logging.info(f"Context vectors for {db_id} created.")
 
 def worker_initializer(db_id: str, args: argparse.Namespace):
     """
@@ -102,6 +134,25 @@ def worker_initializer(db_id: str, args: argparse.Namespace):
     else:
         sqlite_worker_initializer(db_id, args)
 
+def _preprocess_database(db_id: str, args: argparse.Namespace) -> Optional[str]:
+    """
+    Runs the worker initializer for one database without raising, so a failing database
+    does not stop the remaining ones in a pool map.
+    
+    Args:
+        db_id (str): The database ID.
+        args (argparse.Namespace): The command line arguments.
+        
+    Returns:
+        Optional[str]: The error message if preprocessing failed, otherwise None.
+    """
+    try:
+        worker_initializer(db_id, args)
+    except Exception as e:
+        logging.exception(f"Preprocessing {db_id} failed: {e}")
+        return str(e)
+    return None
+
 def process_lsh_for_mysql(db_manager: DatabaseInterface, db_directory_path: Path, 
                          signature_size: int, n_gram: int, threshold: float, verbose: bool):
     """
@@ -115,65 +166,31 @@ def process_lsh_for_mysql(db_manager: DatabaseInterface, db_directory_path: Path
         threshold: LSH threshold
         verbose: Whether to log verbose output
     """
-    from datasketch import MinHash, MinHashLSH
-    import pickle
-    
-    # This is a modified version of the make_db_lsh function to store in MySQL
-    
-    # First, get data from the original process to generate signatures
-    # (Note: This simplified version assumes make_db_lsh handles the data reading part)
-    # You would typically extract data from your database tables, generate signatures,
-    # and then store them in MySQL
-    
-    # For now, we'll use the original function to generate the LSH data
-    # but then we'll store it in MySQL instead of pickle files
-    make_db_lsh(db_directory_path, 
-                signature_size=signature_size, 
-                n_gram=n_gram, 
-                threshold=threshold,
-                verbose=verbose)
-    
-    # Load the generated pickle files
-    lsh_path = db_directory_path / "preprocessed" / f"{db_manager.db_id}_lsh.pkl"
-    minhashes_path = db_directory_path / "preprocessed" / f"{db_manager.db_id}_minhashes.pkl"
-    
-    if lsh_path.exists() and minhashes_path.exists():
-        with open(lsh_path, "rb") as file:
-            lsh = pickle.load(file)
-        with open(minhashes_path, "rb") as file:
-            minhashes = pickle.load(file)
+    # Stream the signatures into MySQL as they are computed instead of writing pickle files;
+    # a single transaction so a failed run leaves no partial signatures behind
+    db_manager.begin_transaction()
+    
+    try:
+        _, minhashes = make_db_lsh(db_directory_path, 
+                                   signature_size=signature_size, 
+                                   n_gram=n_gram, 
+                                   threshold=threshold,
+                                   verbose=verbose,
+                                   return_data=True,
+                                   signature_store=db_manager,
+                                   write_pickle=False)
         
-        # Now store the signatures in MySQL
-        # Start a transaction for better performance with batch inserts
-        db_manager.begin_transaction()
+        # Commit the transaction
+        db_manager.commit()
         
-        try:
-            # Process each key in minhashes and store in MySQL
-            for data_ref, minhash in minhashes.items():
-                # Get signature from minhash
-                signature = minhash.digest()
-                
-                # Store each signature hash
-                for i, sig_hash in enumerate(signature):
-                    # Store signature hash in MySQL
-                    db_manager.store_lsh_signature(
-                        signature_hash=str(sig_hash),
-                        bucket_id=i,  # Use position as bucket ID
-                        data_ref=data_ref,
-                        source_id=db_manager.db_id
-                    )
-            
-            # Commit the transaction
-            db_manager.commit()
+        if verbose:
+            logging.info(f"Stored {len(minhashes)} LSH signatures in MySQL")
             
-            if verbose:
-                logging.info(f"Stored {len(minhashes)} LSH signatures in MySQL")
-                
-        except Exception as e:
-            # Rollback on error
-            db_manager.rollback()
-            logging.error(f"Error storing LSH data in MySQL: {e}")
-            raise
+    except Exception as e:
+        # Rollback on error
+        db_manager.rollback()
+        logging.error(f"Error storing LSH data in MySQL: {e}")
+        raise
 
 def process_vectors_for_mysql(db_manager: DatabaseInterface, db_directory_path: Path, 
                              use_value_description: bool):
@@ -211,17 +228,22 @@ if __name__ == '__main__':
     args_parser.add_argument('--clear_existing', action='store_true', help="Clear existing LSH and vector data before processing")
     args_parser.add_argument('--skip_lsh', action='store_true', help="Skip LSH generation")
     args_parser.add_argument('--skip_vectors', action='store_true', help="Skip vector generation")
+    args_parser.add_argument('--legacy_pickles', action='store_true', help="Also write the LSH and MinHash pickles next to the signature snapshot")
+    args_parser.add_argument('--workers', type=int, default=None, help="Number of databases processed in parallel (default: one per CPU)")
 
     args = args_parser.parse_args()
 
     if args.db_id == 'all':
-        with multiprocessing.Pool(NUM_WORKERS) as pool:
-            for db_id in os.listdir(args.db_root_directory):
-                # check if the db_id is a directory
-                if os.path.isdir(f"{args.db_root_directory}/{db_id}"):
-                    pool.apply_async(worker_initializer, args=(db_id, args))
-            pool.close()
-            pool.join()
+        with os.scandir(args.db_root_directory) as entries:
+            db_ids = [entry.name for entry in entries if entry.is_dir()]
+        num_workers = max(1, min(args.workers or NUM_WORKERS, len(db_ids)))
+        # Several databases per task payload once there are many more databases than workers
+        chunksize = max(1, len(db_ids) // (num_workers * 4))
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            errors = list(executor.map(_preprocess_database, db_ids, itertools.repeat(args), chunksize=chunksize))
+        failed = [db_id for db_id, error in zip(db_ids, errors) if error is not None]
+        if failed:
+            raise SystemExit(f"Preprocessing failed for: {', '.join(failed)}")
     else:
         worker_initializer(args.db_id, args)
 
@@ -1,7 +1,10 @@
 import os
-import yaml
+import re
+import functools
 from pathlib import Path
-from typing import Callable, Dict, List, Any, Optional
+from threading import Lock
+from collections import OrderedDict
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from dotenv import load_dotenv
 
 from database_utils.database_factory import DatabaseFactory
@@ -12,6 +15,151 @@ load_dotenv(override=True)
 # Default config path
 CONFIG_PATH = os.getenv("DB_CONFIG_PATH", "run/configs/database_config.yaml")
 
+# A whole config value of the form ${ENV_VAR} or ${ENV_VAR:default_value}
+_ENV_VAR_RE = re.compile(r"\$\{([^:]*)(?::(.*))?\}", re.DOTALL)
+
+def _read_config_file(path: str) -> Any:
+    """
+    Parses a YAML config file, reusing the previous result if the file has not changed.
+    
+    Args:
+        path (str): Path to config file
+        
+    Returns:
+        Any: The parsed YAML, before environment variable substitution. Callers must not mutate it.
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    return _parse_config_file(path, stat.st_mtime, stat.st_size)
+
+@functools.lru_cache(maxsize=32)
+def _parse_config_file(path: str, mtime: float, size: int) -> Any:
+    # mtime and size are only part of the cache key, so an edited file is parsed again
+    # PyYAML is only needed once a config file is actually read
+    import yaml
+    # LibYAML's C loader when PyYAML was built with it (the PyPI wheels are)
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(path, 'r') as file:
+        return yaml.load(file, Loader=loader)
+
+def _file_signature(path: str) -> Optional[Tuple[float, int]]:
+    """
+    Returns the (mtime, size) of a file, or None if it cannot be read.
+    
+    Args:
+        path (str): Path to the file
+        
+    Returns:
+        Optional[Tuple[float, int]]: The file's modification time and size
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime, stat.st_size
+
+def _substitute_env_vars(item: Any) -> Any:
+    """
+    Replaces config values of the form ${ENV_VAR:default_value} with the environment value.
+    
+    Args:
+        item (Any): A parsed config node
+        
+    Returns:
+        Any: A copy of the node with substitutions applied
+    """
+    if isinstance(item, dict):
+        return {k: _substitute_env_vars(v) for k, v in item.items()}
+    elif isinstance(item, list):
+        return [_substitute_env_vars(i) for i in item]
+    elif isinstance(item, str) and item.startswith("${"):
+        match = _ENV_VAR_RE.fullmatch(item)
+        if match:
+            env_name, default = match.groups()
+            return os.getenv(env_name, default or "")
+    return item
+
+# Shareable managers by (db_mode, db_id, config_path), with the config file signature they were built from
+_MANAGER_CACHE_SIZE = 8
+_manager_cache: "OrderedDict[Tuple[Optional[str], Optional[str], str], Tuple[Optional[Tuple[float, int]], DatabaseInterface]]" = OrderedDict()
+_manager_cache_lock = Lock()
+
+def _get_manager(db_mode: Optional[str], db_id: Optional[str], config_path: str) -> DatabaseInterface:
+    """
+    Returns the database manager for the given arguments. Shareable managers are reused while the
+    config file is unchanged; an edited file replaces the cached manager instead of adding another.
+    Managers that are not shareable (see DatabaseInterface.shareable) are built for every call.
+    
+    Args:
+        db_mode (str, optional): Database mode (e.g., 'train', 'test')
+        db_id (str, optional): Database identifier
+        config_path (str): Absolute path to config file
+        
+    Returns:
+        DatabaseInterface: The database manager
+    """
+    key = (db_mode, db_id, config_path)
+    config_signature = _file_signature(config_path)
+    with _manager_cache_lock:
+        cached = _manager_cache.get(key)
+        if cached is not None:
+            if cached[0] == config_signature:
+                _manager_cache.move_to_end(key)
+                return cached[1]
+            # Built from an older version of the config file
+            del _manager_cache[key]
+    
+    manager = _build_manager(db_mode, db_id, config_path)
+    if getattr(manager, "shareable", True):
+        with _manager_cache_lock:
+            _manager_cache[key] = (config_signature, manager)
+            while len(_manager_cache) > _MANAGER_CACHE_SIZE:
+                _manager_cache.popitem(last=False)
+    return manager
+
+def _build_manager(db_mode: Optional[str], db_id: Optional[str], config_path: str) -> DatabaseInterface:
+    """
+    Creates the database manager for the given arguments.
+    
+    Args:
+        db_mode (str, optional): Database mode (e.g., 'train', 'test')
+        db_id (str, optional): Database identifier
+        config_path (str): Absolute path to config file
+        
+    Returns:
+        DatabaseInterface: The database manager
+    """
+    # Load config from file
+    config = DatabaseManager._load_config(config_path)
+    
+    # Override with provided parameters if available
+    if db_mode is not None and db_id is not None:
+        # Detect database type from config
+        db_type = config.get('database', {}).get('type', 'sqlite').lower()
+        
+        if db_type == 'mysql':
+            # Update MySQL settings
+            if 'mysql_settings' not in config.get('database', {}):
+                config['database']['mysql_settings'] = {}
+            config['database']['mysql_settings']['db_id'] = db_id
+        else:
+            # Update SQLite settings
+            if 'sqlite_settings' not in config.get('database', {}):
+                config['database']['sqlite_settings'] = {}
+            config['database']['sqlite_settings']['mode'] = db_mode
+            config['database']['sqlite_settings']['id'] = db_id
+    
+    # Create manager using factory with config
+    manager = DatabaseFactory.get_database_manager(config)
+    
+    # Add db_mode and db_id attributes for compatibility if needed
+    if db_mode is not None and not hasattr(manager, 'db_mode'):
+        manager.db_mode = db_mode
+    if db_id is not None and not hasattr(manager, 'db_id'):
+        manager.db_id = db_id
+    
+    return manager
+
 class DatabaseManager:
     """
     A wrapper class that uses the appropriate database manager implementation
@@ -33,28 +181,11 @@ class DatabaseManager:
         path = config_path or CONFIG_PATH
         
         try:
-            with open(path, 'r') as file:
-                config = yaml.safe_load(file)
-                
-                # Process environment variable substitutions
-                # Format: ${ENV_VAR:default_value}
-                def process_env_vars(item):
-                    if isinstance(item, dict):
-                        return {k: process_env_vars(v) for k, v in item.items()}
-                    elif isinstance(item, list):
-                        return [process_env_vars(i) for i in item]
-                    elif isinstance(item, str) and item.startswith("${") and item.endswith("}"):
-                        # Extract env var name and default value
-                        env_var = item[2:-1]
-                        if ":" in env_var:
-                            env_name, default = env_var.split(":", 1)
-                            return os.getenv(env_name, default)
-                        else:
-                            return os.getenv(env_var, "")
-                    else:
-                        return item
-                
-                return process_env_vars(config)
+            config = _read_config_file(path)
+            
+            # Runs on every load so environment changes apply, and rebuilds every container,
+            # so callers get a fresh copy they can modify without touching the cached parse
+            return _substitute_env_vars(config)
         except Exception as e:
             print(f"Error loading config from {path}: {e}")
             # Return a default config
@@ -88,35 +219,9 @@ class DatabaseManager:
         Returns:
             DatabaseManager: A wrapped instance of a DatabaseInterface implementation
         """
-        # Load config from file
-        config = cls._load_config(config_path)
-        
-        # Override with provided parameters if available
-        if db_mode is not None and db_id is not None:
-            # Detect database type from config
-            db_type = config.get('database', {}).get('type', 'sqlite').lower()
-            
-            if db_type == 'mysql':
-                # Update MySQL settings
-                if 'mysql_settings' not in config.get('database', {}):
-                    config['database']['mysql_settings'] = {}
-                config['database']['mysql_settings']['db_id'] = db_id
-            else:
-                # Update SQLite settings
-                if 'sqlite_settings' not in config.get('database', {}):
-                    config['database']['sqlite_settings'] = {}
-                config['database']['sqlite_settings']['mode'] = db_mode
-                config['database']['sqlite_settings']['id'] = db_id
-        
-        # Create manager using factory with config
-        cls._instance = DatabaseFactory.get_database_manager(config)
-        
-        # Add db_mode and db_id attributes for compatibility if needed
-        if db_mode is not None and not hasattr(cls._instance, 'db_mode'):
-            cls._instance.db_mode = db_mode
-        if db_id is not None and not hasattr(cls._instance, 'db_id'):
-            cls._instance.db_id = db_id
-            
+        # Reuse the manager built for the same arguments while the config file is unchanged
+        config_path = os.path.abspath(config_path or CONFIG_PATH)
+        cls._instance = _get_manager(db_mode, db_id, config_path)
         return cls._instance
 
     def __getattr__(self, name):
@@ -1,11 +1,19 @@
 import logging
 import json
-from threading import Lock
+import queue
+import atexit
+import multiprocessing.util
+from threading import Lock, Thread
 from pathlib import Path
 from typing import Any, List, Dict, Union
 
 from runner.task import Task
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 class Logger:
     _instance = None
     _lock = Lock()
@@ -90,20 +98,21 @@ class Logger:
             conversations (List[Dict[str, Any]]): The conversations to log.
         """
         with self.log_file_lock:
-            log_file_path = self.result_directory / "logs" / f"{self.question_id}_{self.db_id}.log"
-            log_file_path.parent.mkdir(parents=True, exist_ok=True)
-            with log_file_path.open("a") as file:
-                for conversation in conversations:
-                    text = conversation["text"]
-                    file.write(f"############################## {conversation['from']} at step {conversation['step']} ##############################\n\n")
-                    if isinstance(text, str):
-                        file.write(text)
-                    elif isinstance(text, (list, dict)):
-                        formatted_text = json.dumps(text, indent=4)
-                        file.write(formatted_text)
-                    elif isinstance(text, bool):
-                        file.write(str(text))
-                    file.write("\n\n")
+            _append_to_file(self._conversation_log_path(), _format_conversations(conversations))
+
+    def enqueue_conversation(self, conversations: List[Dict[str, Any]]):
+        """
+        Logs conversations to a file from a background thread, without blocking the caller.
+        The entries are formatted immediately, so later changes to the objects are not logged.
+
+        Args:
+            conversations (List[Dict[str, Any]]): The conversations to log.
+        """
+        _start_conversation_writer()
+        _conversation_queue.put_nowait((self._conversation_log_path(), _format_conversations(conversations)))
+
+    def _conversation_log_path(self) -> Path:
+        return self.result_directory / "logs" / f"{self.question_id}_{self.db_id}.log"
 
     def dump_history_to_file(self, execution_history: List[Dict[str, Any]]):
         """
@@ -116,3 +125,80 @@ class Logger:
         file_path.parent.mkdir(parents=True, exist_ok=True)
         with file_path.open("w") as file:
             json.dump(execution_history, file, indent=4)
+
+
+def _format_conversations(conversations: List[Dict[str, Any]]) -> str:
+    """
+    Renders conversations in the conversation log format.
+
+    Args:
+        conversations (List[Dict[str, Any]]): The conversations to render.
+
+    Returns:
+        str: The text to append to the log file.
+    """
+    parts = []
+    for conversation in conversations:
+        text = conversation["text"]
+        parts.append(f"############################## {conversation['from']} at step {conversation['step']} ##############################\n\n")
+        if isinstance(text, str):
+            parts.append(text)
+        elif isinstance(text, (list, dict)):
+            parts.append(_dump_json(text))
+        elif isinstance(text, bool):
+            parts.append(str(text))
+        parts.append("\n\n")
+    return "".join(parts)
+
+
+def _dump_json(value: Any) -> str:
+    # orjson is several times faster on large parsed outputs; it only supports 2-space indentation
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(value, indent=2, ensure_ascii=False)
+
+
+def _append_to_file(log_file_path: Path, text: str):
+    log_file_path.parent.mkdir(parents=True, exist_ok=True)
+    with log_file_path.open("a") as file:
+        file.write(text)
+
+
+# Conversations queued by Logger.enqueue_conversation, written in order by a single daemon thread
+_conversation_queue: "queue.Queue" = queue.Queue()
+_conversation_writer: Thread = None
+_conversation_writer_lock = Lock()
+
+
+def _drain_conversation_queue():
+    while True:
+        log_file_path, text = _conversation_queue.get()
+        try:
+            _append_to_file(log_file_path, text)
+        except Exception as e:
+            logging.error(f"Failed to write conversation log {log_file_path}: {e}")
+        finally:
+            _conversation_queue.task_done()
+
+
+def _start_conversation_writer():
+    global _conversation_writer
+    if _conversation_writer is not None:
+        return
+    with _conversation_writer_lock:
+        if _conversation_writer is None:
+            writer = Thread(target=_drain_conversation_queue, name="conversation-log-writer", daemon=True)
+            writer.start()
+            atexit.register(flush_conversations)
+            # multiprocessing children skip atexit; their finalizers with an exit priority still run
+            multiprocessing.util.Finalize(None, flush_conversations, exitpriority=10)
+            _conversation_writer = writer
+
+
+def flush_conversations():
+    """Blocks until every queued conversation has been written."""
+    if _conversation_writer is not None:
+        _conversation_queue.join()
@@ -1,5 +1,9 @@
 import os
+import re
 import time
+import functools
+import itertools
+import contextlib
 import uuid
 import pymysql
 import json
@@ -7,25 +11,71 @@ import logging
 import numpy as np
 from pathlib import Path
 from threading import Lock
-from typing import Dict, List, Any, Optional, Tuple
+from types import ModuleType
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Tuple
 from dotenv import load_dotenv
 from langchain_chroma import Chroma
 from dbutils.pooled_db import PooledDB
 
 from database_utils.database_interface import DatabaseInterface
+from database_utils.init_mysql_schema import ensure_vector_column
 from database_utils.schema import DatabaseSchema
 from database_utils.schema_generator import DatabaseSchemaGenerator
-from database_utils.db_catalog.preprocess import EMBEDDING_FUNCTION
+from database_utils.db_catalog.preprocess import get_embedding_function, encode_vector
 from database_utils.db_catalog.csv_utils import load_tables_description
 
 load_dotenv(override=True)
 
+# Statements whose results execute_sql fetches; matching the leading keyword avoids
+# upper-casing a copy of the whole query
+_RESULT_QUERY_RE = re.compile(r"\s*(?:SELECT|SHOW|DESCRIBE|EXPLAIN)", re.IGNORECASE)
+
+# Names that may be used as bare identifiers or JSON path keys in generated SQL
+_IDENTIFIER_RE = re.compile(r"[A-Za-z0-9_]+\Z")
+
+# Statements after which the cached schema is dropped
+_DDL_QUERY_RE = re.compile(r"\s*(?:CREATE|ALTER|DROP|RENAME)\b", re.IGNORECASE)
+
+@functools.lru_cache(maxsize=1)
+def get_mysql_driver() -> ModuleType:
+    """
+    Returns the DB-API module used for MySQL connections.
+    PyMySQL by default; setting MYSQL_DRIVER=mysqlclient switches to the mysqlclient C extension
+    (MySQLdb), which decodes result sets much faster, when it is installed.
+
+    Returns:
+        ModuleType: The driver module, exposing `connect` and `cursors.Cursor`/`cursors.DictCursor`.
+    """
+    if os.getenv("MYSQL_DRIVER", "pymysql").lower() == "mysqlclient":
+        try:
+            import MySQLdb
+            import MySQLdb.cursors
+            return MySQLdb
+        except ImportError:
+            logging.warning("MYSQL_DRIVER=mysqlclient but mysqlclient is not installed, falling back to PyMySQL")
+    return pymysql
+
+def as_dicts(result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Converts an `execute_sql_rows` result into the dict rows `execute_sql` returns.
+
+    Args:
+        result (Dict[str, Any]): The result of `execute_sql_rows`.
+
+    Returns:
+        List[Dict[str, Any]]: One dict per row, keyed by column name.
+    """
+    columns = result.get("columns") or []
+    return [dict(zip(columns, row)) for row in result.get("rows") or []]
+
 class MySQLDatabaseManager(DatabaseInterface):
     """
     MySQL implementation of the DatabaseInterface.
     Provides database operations including core database functions, LSH/MinHash
     and vector database integration with ChromaDB.
     """
+    # Transactions live on the instance, so DatabaseManager builds one per caller
+    shareable = False
     # Connection pool is shared across all instances
     _pool = None
     _pool_lock = Lock()
@@ -49,6 +99,7 @@ class MySQLDatabaseManager(DatabaseInterface):
         self.vector_db = None
         self._lock = Lock()  # Instance-level lock for thread safety
         self._in_transaction = False  # Track transaction state
+        self._schema_cache: Optional[Dict[str, List[str]]] = None  # Filled by get_db_schema
         
         # Define paths for ChromaDB
         if db_id:
@@ -57,17 +108,20 @@ class MySQLDatabaseManager(DatabaseInterface):
         else:
             self.db_directory_path = None
 
-        # Initialize connection pool if not already created
-        with self.__class__._pool_lock:
-            if self.__class__._pool is None and db_name:
-                self._setup_connection_pool()
+        # Initialize connection pool if not already created; checked before taking the lock
+        # so instances created after the first skip it
+        if self.__class__._pool is None and db_name:
+            with self.__class__._pool_lock:
+                if self.__class__._pool is None:
+                    self._setup_connection_pool()
 
     def _setup_connection_pool(self):
         """Set up a connection pool for MySQL database connections."""
         try:
+            driver = get_mysql_driver()
             self.__class__._pool = PooledDB(
-                creator=pymysql,
-                maxconnections=10,
+                creator=driver,
+                maxconnections=int(os.getenv("MYSQL_POOL_SIZE", "10")),
                 mincached=2,
                 maxcached=5,
                 blocking=True,
@@ -76,7 +130,7 @@ class MySQLDatabaseManager(DatabaseInterface):
                 password=self.password,
                 port=self.port,
                 database=self.db_name,
-                cursorclass=pymysql.cursors.DictCursor
+                cursorclass=driver.cursors.DictCursor
             )
         except Exception as e:
             raise Exception(f"Failed to set up MySQL connection pool: {e}")
@@ -92,6 +146,11 @@ class MySQLDatabaseManager(DatabaseInterface):
         except Exception as e:
             raise Exception(f"Failed to connect to MySQL: {e}")
 
+    def _ensure_connected(self) -> None:
+        """Take the transaction's connection from the pool unless this instance already holds one."""
+        if not self._connection:
+            self.connect()
+
     def disconnect(self) -> None:
         """Return the connection to the pool."""
         if self._cursor:
@@ -112,26 +171,234 @@ class MySQLDatabaseManager(DatabaseInterface):
         Returns:
             Dict[str, Any]: Dictionary containing execution results
         """
-        if not self._connection:
-            self.connect()
+        if _DDL_QUERY_RE.match(query):
+            self.invalidate_schema()
+        
+        # Inside a transaction the query must run on the transaction's connection
+        if self._in_transaction:
+            return self._execute_on(self._connection, self._cursor, query, params)
+        
+        # Otherwise check out a pooled connection per call, so concurrent callers sharing
+        # this manager run in parallel instead of interleaving on one cursor
+        with self._pooled_cursor() as (connection, cursor):
+            return self._execute_on(connection, cursor, query, params)
+
+    def execute_sql_rows(self, query: str, params: tuple = None) -> Dict[str, Any]:
+        """
+        Execute a SQL query and return its rows as tuples, with the column names listed once.
+        Avoids building a dict per row on wide or long result sets; `as_dicts` converts back.
+        
+        Args:
+            query (str): SQL query to execute
+            params (tuple, optional): Parameters for the SQL query
+            
+        Returns:
+            Dict[str, Any]: Dictionary with success, columns, rows, rowcount and error
+        """
+        if _DDL_QUERY_RE.match(query):
+            self.invalidate_schema()
+        
+        cursor_class = get_mysql_driver().cursors.Cursor
+        if self._in_transaction:
+            cursor = self._connection.cursor(cursor_class)
+            try:
+                return self._execute_rows_on(self._connection, cursor, query, params)
+            finally:
+                cursor.close()
+        with self._pooled_cursor(cursor_class) as (connection, cursor):
+            return self._execute_rows_on(connection, cursor, query, params)
+
+    def execute_many(self, query: str, seq_of_params: Iterable[tuple]) -> Dict[str, Any]:
+        """
+        Execute one SQL statement for each parameter tuple in a single batched call.
+        Commits at the end, unless a transaction is already open.
+        
+        Args:
+            query (str): SQL statement to execute
+            seq_of_params (Iterable[tuple]): Parameters for each execution
+            
+        Returns:
+            Dict[str, Any]: Dictionary containing execution results
+        """
+        if _DDL_QUERY_RE.match(query):
+            self.invalidate_schema()
+        if self._in_transaction:
+            return self._execute_many_on(self._connection, self._cursor, query, seq_of_params, commit=False)
+        with self._pooled_cursor() as (connection, cursor):
+            return self._execute_many_on(connection, cursor, query, seq_of_params, commit=True)
+
+    @contextlib.contextmanager
+    def _pooled_cursor(self, *cursor_args) -> Iterator[Tuple[Any, Any]]:
+        """
+        Borrow a connection and cursor from the pool for one operation.
+        
+        Args:
+            *cursor_args: Arguments for `connection.cursor`, e.g. a cursor class
+            
+        Yields:
+            Tuple[Any, Any]: The connection and cursor, returned to the pool afterwards
+        """
+        if self.__class__._pool is None:
+            self._setup_connection_pool()
+        try:
+            connection = self.__class__._pool.connection()
+        except Exception as e:
+            raise Exception(f"Failed to connect to MySQL: {e}")
+        try:
+            cursor = connection.cursor(*cursor_args)
+            try:
+                yield connection, cursor
+            finally:
+                cursor.close()
+        finally:
+            # Returns the connection to the pool
+            connection.close()
+
+    @contextlib.contextmanager
+    def _scoped_cursor(self) -> Iterator[Tuple[Any, Any]]:
+        """
+        Yield the connection and cursor an operation should run on: the open transaction's,
+        or else a pair borrowed from the pool for just this operation.
+        
+        Yields:
+            Tuple[Any, Any]: The connection and cursor
+        """
+        if self._in_transaction:
+            yield self._connection, self._cursor
+        else:
+            with self._pooled_cursor() as (connection, cursor):
+                yield connection, cursor
+
+    def iter_sql(self, query: str, params: tuple = None, fetch_size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Execute a SELECT query and yield its rows in batches.
+        Uses an unbuffered server-side cursor on a pooled connection, so large result sets
+        are streamed instead of being loaded into memory at once as `execute_sql` does.
+        The connection is returned to the pool once the generator is exhausted or closed.
+        
+        Args:
+            query (str): SQL query to execute
+            params (tuple, optional): Parameters for the SQL query
+            fetch_size (int, optional): Maximum number of rows per batch
+            
+        Yields:
+            List[Dict[str, Any]]: The next batch of rows
+        """
+        with self._pooled_cursor(get_mysql_driver().cursors.SSDictCursor) as (connection, cursor):
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(fetch_size)
+                if not rows:
+                    break
+                yield list(rows)
+
+    @staticmethod
+    def _execute_many_on(connection, cursor, query: str, seq_of_params: Iterable[tuple], commit: bool) -> Dict[str, Any]:
+        """
+        Execute a SQL statement for many parameter tuples on the given connection and cursor.
+        
+        Args:
+            connection: The connection to commit on
+            cursor: The cursor to execute the statement with
+            query (str): SQL statement to execute
+            seq_of_params (Iterable[tuple]): Parameters for each execution
+            commit (bool): Whether to commit afterwards
+            
+        Returns:
+            Dict[str, Any]: Dictionary containing execution results
+        """
+        try:
+            # executemany rewrites a plain INSERT ... VALUES into multi-row statements
+            cursor.executemany(query, list(seq_of_params))
+            if commit:
+                connection.commit()
+            return {
+                "success": True,
+                "results": None,
+                "rowcount": cursor.rowcount,
+                "error": None
+            }
+        except Exception as err:
+            return {
+                "success": False,
+                "results": None,
+                "rowcount": 0,
+                "error": str(err)
+            }
+
+    @staticmethod
+    def _execute_rows_on(connection, cursor, query: str, params: tuple = None) -> Dict[str, Any]:
+        """
+        Execute a SQL query on the given connection and a tuple-row cursor.
+        
+        Args:
+            connection: The connection to commit non-result statements on
+            cursor: A cursor returning rows as tuples
+            query (str): SQL query to execute
+            params (tuple, optional): Parameters for the SQL query
             
+        Returns:
+            Dict[str, Any]: Dictionary with success, columns, rows, rowcount and error
+        """
         try:
-            self._cursor.execute(query, params)
+            cursor.execute(query, params)
             
-            if query.strip().upper().startswith(("SELECT", "SHOW", "DESCRIBE", "EXPLAIN")):
-                results = self._cursor.fetchall()
+            if _RESULT_QUERY_RE.match(query):
+                return {
+                    "success": True,
+                    "columns": [column[0] for column in cursor.description or ()],
+                    "rows": cursor.fetchall(),
+                    "rowcount": cursor.rowcount,
+                    "error": None
+                }
+            connection.commit()
+            return {
+                "success": True,
+                "columns": None,
+                "rows": None,
+                "rowcount": cursor.rowcount,
+                "error": None
+            }
+        except Exception as err:
+            return {
+                "success": False,
+                "columns": None,
+                "rows": None,
+                "rowcount": 0,
+                "error": str(err)
+            }
+
+    @staticmethod
+    def _execute_on(connection, cursor, query: str, params: tuple = None) -> Dict[str, Any]:
+        """
+        Execute a SQL query on the given connection and cursor.
+        
+        Args:
+            connection: The connection to commit non-result statements on
+            cursor: The cursor to execute the query with
+            query (str): SQL query to execute
+            params (tuple, optional): Parameters for the SQL query
+            
+        Returns:
+            Dict[str, Any]: Dictionary containing execution results
+        """
+        try:
+            cursor.execute(query, params)
+            
+            if _RESULT_QUERY_RE.match(query):
+                results = cursor.fetchall()
                 return {
                     "success": True,
                     "results": results,
-                    "rowcount": self._cursor.rowcount,
+                    "rowcount": cursor.rowcount,
                     "error": None
                 }
             else:
-                self._connection.commit()
+                connection.commit()
                 return {
                     "success": True,
                     "results": None,
-                    "rowcount": self._cursor.rowcount,
+                    "rowcount": cursor.rowcount,
                     "error": None
                 }
                 
@@ -146,27 +413,44 @@ class MySQLDatabaseManager(DatabaseInterface):
     def get_db_schema(self) -> Dict[str, List[str]]:
         """
         Get the database schema including all tables and their columns.
+        The schema is fetched once per instance; see `invalidate_schema`.
         
         Returns:
             Dict[str, List[str]]: Dictionary with table names as keys and lists of column names as values
         """
+        if self._schema_cache is not None:
+            # Copies, since callers may edit the schema they are given
+            return {table: list(columns) for table, columns in self._schema_cache.items()}
+        
         schema = {}
-        if not self._connection:
-            self.connect()
-            
         try:
-            self._cursor.execute("SHOW TABLES")
-            tables = [table[f"Tables_in_{self.db_name}"] for table in self._cursor.fetchall()]
-            
-            for table in tables:
-                self._cursor.execute(f"DESCRIBE `{table}`")
-                columns = [column["Field"] for column in self._cursor.fetchall()]
-                schema[table] = columns
+            # One round-trip for every table's columns instead of SHOW TABLES plus a DESCRIBE per table
+            with self._scoped_cursor() as (_, cursor):
+                cursor.execute(
+                    """
+                    SELECT TABLE_NAME AS table_name, COLUMN_NAME AS column_name
+                    FROM information_schema.columns
+                    WHERE table_schema = %s
+                    ORDER BY TABLE_NAME, ORDINAL_POSITION
+                    """,
+                    (self.db_name,)
+                )
+                rows = cursor.fetchall()
+            for row in rows:
+                schema.setdefault(row["table_name"], []).append(row["column_name"])
                 
+            self._schema_cache = {table: list(columns) for table, columns in schema.items()}
             return schema
         except Exception as err:
             raise Exception(f"Failed to get database schema: {err}")
 
+    def invalidate_schema(self) -> None:
+        """
+        Drop the cached schema so the next `get_db_schema` call reads it from MySQL again.
+        Called automatically for DDL statements run through `execute_sql`.
+        """
+        self._schema_cache = None
+
     def begin_transaction(self) -> None:
         """
         Begin a database transaction with enhanced error handling.
@@ -175,8 +459,7 @@ class MySQLDatabaseManager(DatabaseInterface):
         with connection pooling in DBUtils+PyMySQL.
         """
         with self._lock:  # Ensure thread safety
-            if not self._connection:
-                self.connect()
+            self._ensure_connected()
                 
             # Mark transaction as active in this instance
             self._in_transaction = True
@@ -222,12 +505,6 @@ class MySQLDatabaseManager(DatabaseInterface):
                 logging.debug("Transaction committed successfully")
             except Exception as e:
                 logging.error(f"Failed to commit transaction: {e}")
-                # Re-establish connection on serious errors
-                try:
-                    self.disconnect()
-                    self.connect()
-                except Exception as reconnect_e:
-                    logging.error(f"Failed to reconnect after commit error: {reconnect_e}")
             finally:
                 # Clear transaction state
                 self._in_transaction = False
@@ -238,6 +515,9 @@ class MySQLDatabaseManager(DatabaseInterface):
                 except Exception:
                     # Ignore errors, as we'll get a fresh connection next time
                     pass
+                
+                # Outside a transaction operations borrow their own pooled connections
+                self.disconnect()
 
     def rollback(self) -> None:
         """
@@ -265,50 +545,51 @@ class MySQLDatabaseManager(DatabaseInterface):
                 except Exception as sql_e:
                     logging.error(f"SQL ROLLBACK also failed: {sql_e}")
             finally:
-                # Always release and re-acquire connection from pool to ensure clean state
-                # This is critical for pooled connections where transaction state may persist
-                old_connection = self._connection
+                # Always release the connection to the pool; the next transaction takes a fresh one.
+                # Outside a transaction operations borrow their own pooled connections
                 self.disconnect()
-                self.connect()
-                logging.debug("Connection reset after rollback attempt")
+                logging.debug("Connection released after rollback attempt")
                 
                 # Clear transaction state
                 self._in_transaction = False
 
     def _ensure_schema_exists(self):
         """Ensure the necessary tables for LSH and vector data exist."""
-        if not self._connection:
-            self.connect()
+        with self._scoped_cursor() as (connection, cursor):
+            # Create LSH signatures table if it doesn't exist
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS `lsh_signatures` (
+                `id` INT AUTO_INCREMENT PRIMARY KEY,
+                `signature_hash` VARCHAR(255) NOT NULL,
+                `bucket_id` INT NOT NULL,
+                `data_reference` VARCHAR(255) NOT NULL,
+                `source_id` VARCHAR(255) NOT NULL,
+                INDEX `idx_signature_hash` (`signature_hash`),
+                INDEX `idx_bucket_id` (`bucket_id`)
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+            """)
+        
+            # Create vector metadata table if it doesn't exist
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS `vector_metadata` (
+                `id` INT AUTO_INCREMENT PRIMARY KEY,
+                `chroma_id` VARCHAR(255) UNIQUE,
+                `source_id` VARCHAR(255) NOT NULL,
+                `text_chunk_id` VARCHAR(255),
+                `metadata` JSON,
+                `vector` VARBINARY(16384),
+                `created_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                INDEX `idx_source_id` (`source_id`),
+                INDEX `idx_text_chunk_id` (`text_chunk_id`),
+                INDEX `idx_chroma_id` (`chroma_id`)
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+            """)
+        
+            # Tables created before the packed vector column still need it
+            ensure_vector_column(cursor)
             
-        # Create LSH signatures table if it doesn't exist
-        self._cursor.execute("""
-        CREATE TABLE IF NOT EXISTS `lsh_signatures` (
-            `id` INT AUTO_INCREMENT PRIMARY KEY,
-            `signature_hash` VARCHAR(255) NOT NULL,
-            `bucket_id` INT NOT NULL,
-            `data_reference` VARCHAR(255) NOT NULL,
-            `source_id` VARCHAR(255) NOT NULL,
-            INDEX `idx_signature_hash` (`signature_hash`),
-            INDEX `idx_bucket_id` (`bucket_id`)
-        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
-        """)
-        
-        # Create vector metadata table if it doesn't exist
-        self._cursor.execute("""
-        CREATE TABLE IF NOT EXISTS `vector_metadata` (
-            `id` INT AUTO_INCREMENT PRIMARY KEY,
-            `chroma_id` VARCHAR(255) UNIQUE,
-            `source_id` VARCHAR(255) NOT NULL,
-            `text_chunk_id` VARCHAR(255),
-            `metadata` JSON,
-            `created_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            INDEX `idx_source_id` (`source_id`),
-            INDEX `idx_text_chunk_id` (`text_chunk_id`),
-            INDEX `idx_chroma_id` (`chroma_id`)
-        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
-        """)
-        
-        self._connection.commit()
+            if not self._in_transaction:
+                connection.commit()
 
     def _init_vector_db(self) -> None:
         """Initialize ChromaDB connection for vector operations."""
@@ -316,7 +597,7 @@ class MySQLDatabaseManager(DatabaseInterface):
             try:
                 vector_db_path = self.db_directory_path / "context_vector_db"
                 vector_db_path.mkdir(parents=True, exist_ok=True)
-                self.vector_db = Chroma(persist_directory=str(vector_db_path), embedding_function=EMBEDDING_FUNCTION)
+                self.vector_db = Chroma(persist_directory=str(vector_db_path), embedding_function=get_embedding_function())
             except Exception as e:
                 raise Exception(f"Failed to initialize vector database: {e}")
 
@@ -324,6 +605,9 @@ class MySQLDatabaseManager(DatabaseInterface):
         """
         Store a vector with its metadata in the vector database with MySQL integration.
         
+        The raw embedding is also kept in MySQL as a packed float32 buffer
+        (see `load_vector` for reading it back).
+        
         Args:
             vector (List[float]): The vector embedding to store
             metadata (Dict[str, Any]): Associated metadata
@@ -341,6 +625,10 @@ class MySQLDatabaseManager(DatabaseInterface):
         # Generate a unique ID for the vector
         chroma_id = str(uuid.uuid4())
         
+        # ChromaDB expects plain lists; MySQL gets the compact float32 buffer
+        if isinstance(vector, np.ndarray):
+            vector = vector.tolist()
+        
         # Prepare metadata for MySQL storage
         mysql_metadata = metadata.copy()
         text_chunk_id = mysql_metadata.pop("text_chunk_id", None)
@@ -350,23 +638,97 @@ class MySQLDatabaseManager(DatabaseInterface):
         metadata_for_chroma["source_id"] = source_id
         metadata_for_chroma["chroma_id"] = chroma_id
         
+        self._add_to_chroma([vector], [metadata_for_chroma], [chroma_id])
+        
+        # Store metadata in MySQL
+        with self._scoped_cursor() as (connection, cursor):
+            cursor.execute(
+                """
+                INSERT INTO vector_metadata 
+                (chroma_id, source_id, text_chunk_id, metadata, vector) 
+                VALUES (%s, %s, %s, %s, %s)
+                """,
+                (chroma_id, source_id, text_chunk_id, json.dumps(mysql_metadata), encode_vector(vector))
+            )
+            if not self._in_transaction:
+                connection.commit()
+        
+        return chroma_id
+
+    def store_vectors_bulk(self, vectors: List[List[float]], metadatas: List[Dict[str, Any]], source_ids: List[str]) -> List[str]:
+        """
+        Store many vectors with one ChromaDB add and one batched MySQL insert.
+        Commits once at the end, unless a transaction is already open.
+        
+        Args:
+            vectors (List[List[float]]): The vector embeddings to store
+            metadatas (List[Dict[str, Any]]): Associated metadata, one per vector
+            source_ids (List[str]): Identifiers for the source documents/data, one per vector
+            
+        Returns:
+            List[str]: Identifiers for the stored vectors (Chroma IDs)
+        """
+        if not len(vectors):
+            return []
+        
+        # Ensure schema exists
+        self._ensure_schema_exists()
+        
+        # Initialize vector DB if not already done
+        self._init_vector_db()
+        
+        chroma_ids = [str(uuid.uuid4()) for _ in range(len(vectors))]
+        embeddings = [vector.tolist() if isinstance(vector, np.ndarray) else vector for vector in vectors]
+        chroma_metadatas = []
+        rows = []
+        for chroma_id, vector, metadata, source_id in zip(chroma_ids, embeddings, metadatas, source_ids):
+            mysql_metadata = metadata.copy()
+            text_chunk_id = mysql_metadata.pop("text_chunk_id", None)
+            chroma_metadatas.append({**metadata, "source_id": source_id, "chroma_id": chroma_id})
+            rows.append((chroma_id, source_id, text_chunk_id, json.dumps(mysql_metadata), encode_vector(vector)))
+        
+        self._add_to_chroma(embeddings, chroma_metadatas, chroma_ids)
+        
+        with self._scoped_cursor() as (connection, cursor):
+            cursor.executemany(
+                """
+                INSERT INTO vector_metadata 
+                (chroma_id, source_id, text_chunk_id, metadata, vector) 
+                VALUES (%s, %s, %s, %s, %s)
+                """,
+                rows
+            )
+            if not self._in_transaction:
+                connection.commit()
+        
+        return chroma_ids
+
+    def _add_to_chroma(self, embeddings: List[List[float]], metadatas: List[Dict[str, Any]], ids: List[str]) -> None:
+        """
+        Add embeddings to ChromaDB, using whichever API the installed version supports.
+        
+        Args:
+            embeddings (List[List[float]]): The vector embeddings
+            metadatas (List[Dict[str, Any]]): ChromaDB metadata, one per embedding
+            ids (List[str]): Chroma IDs, one per embedding
+        """
         # Use the appropriate method for ChromaDB based on the langchain-chroma version
         try:
             # New ChromaDB API method
             from langchain_core.documents import Document
-            document = Document(page_content="", metadata=metadata_for_chroma)
+            documents = [Document(page_content="", metadata=metadata) for metadata in metadatas]
             self.vector_db.add_documents(
-                documents=[document],
-                embeddings=[vector],
-                ids=[chroma_id]
+                documents=documents,
+                embeddings=embeddings,
+                ids=ids
             )
         except (ImportError, AttributeError, TypeError):
             try:
                 # Alternative approach for newer ChromaDB versions
                 self.vector_db._collection.add(
-                    embeddings=[vector],
-                    metadatas=[metadata_for_chroma],
-                    ids=[chroma_id]
+                    embeddings=embeddings,
+                    metadatas=metadatas,
+                    ids=ids
                 )
             except (AttributeError, TypeError):
                 # Fallback for direct ChromaDB client usage
@@ -374,23 +736,10 @@ class MySQLDatabaseManager(DatabaseInterface):
                 client = chromadb.PersistentClient(path=str(self.db_directory_path / "context_vector_db"))
                 collection = client.get_or_create_collection("default_collection")
                 collection.add(
-                    embeddings=[vector],
-                    metadatas=[metadata_for_chroma],
-                    ids=[chroma_id]
+                    embeddings=embeddings,
+                    metadatas=metadatas,
+                    ids=ids
                 )
-        
-        # Store metadata in MySQL
-        self._cursor.execute(
-            """
-            INSERT INTO vector_metadata 
-            (chroma_id, source_id, text_chunk_id, metadata) 
-            VALUES (%s, %s, %s, %s)
-            """,
-            (chroma_id, source_id, text_chunk_id, json.dumps(mysql_metadata))
-        )
-        self._connection.commit()
-        
-        return chroma_id
 
     def query_vector_db(self, query_vector: List[float], top_k: int, filter_criteria: Dict[str, Any] = None) -> List[Dict[str, Any]]:
         """
@@ -410,9 +759,6 @@ class MySQLDatabaseManager(DatabaseInterface):
         # Process filter criteria if provided
         chroma_ids = None
         if filter_criteria:
-            if not self._connection:
-                self.connect()
-                
             # Build WHERE clause for MySQL query
             where_clauses = []
             params = []
@@ -425,9 +771,12 @@ class MySQLDatabaseManager(DatabaseInterface):
                     where_clauses.append("text_chunk_id = %s")
                     params.append(value)
                 else:
-                    # Handle nested JSON fields in metadata
-                    where_clauses.append(f"JSON_CONTAINS(metadata, %s, '$.{key}')")
-                    params.append(json.dumps(value))
+                    # Handle nested JSON fields in metadata; the key is bound as a JSON path,
+                    # so the statement text is the same for every key
+                    if not _IDENTIFIER_RE.match(key):
+                        raise ValueError(f"Invalid metadata filter key: {key!r}")
+                    where_clauses.append("JSON_CONTAINS(metadata, %s, %s)")
+                    params.extend([json.dumps(value), f"$.{key}"])
             
             if where_clauses:
                 query = f"""
@@ -435,8 +784,9 @@ class MySQLDatabaseManager(DatabaseInterface):
                 WHERE {' AND '.join(where_clauses)}
                 """
                 
-                self._cursor.execute(query, params)
-                results = self._cursor.fetchall()
+                with self._scoped_cursor() as (_, cursor):
+                    cursor.execute(query, params)
+                    results = cursor.fetchall()
                 chroma_ids = [row["chroma_id"] for row in results]
                 
                 # If no matching IDs found with filters, return empty list
@@ -581,19 +931,51 @@ class MySQLDatabaseManager(DatabaseInterface):
         # Ensure schema exists
         self._ensure_schema_exists()
         
-        if not self._connection:
-            self.connect()
-            
         # Store the signature
-        self._cursor.execute(
-            """
-            INSERT INTO lsh_signatures 
-            (signature_hash, bucket_id, data_reference, source_id) 
-            VALUES (%s, %s, %s, %s)
-            """,
-            (signature_hash, bucket_id, data_ref, source_id)
-        )
-        self._connection.commit()
+        with self._scoped_cursor() as (connection, cursor):
+            cursor.execute(
+                """
+                INSERT INTO lsh_signatures 
+                (signature_hash, bucket_id, data_reference, source_id) 
+                VALUES (%s, %s, %s, %s)
+                """,
+                (signature_hash, bucket_id, data_ref, source_id)
+            )
+            if not self._in_transaction:
+                connection.commit()
+
+    def store_lsh_signatures_bulk(self, rows: Iterable[Tuple[str, int, str, str]], chunk_size: int = 10000) -> None:
+        """
+        Store many LSH signatures with batched multi-row inserts.
+        Rows are consumed lazily, so at most chunk_size of them are held at once.
+        Commits once at the end, unless a transaction is already open.
+        
+        Args:
+            rows (Iterable[Tuple[str, int, str, str]]): (signature_hash, bucket_id, data_ref, source_id) rows
+            chunk_size (int, optional): Maximum number of rows sent per batch
+        """
+        rows = iter(rows)
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            return
+        
+        # Ensure schema exists
+        self._ensure_schema_exists()
+        
+        with self._scoped_cursor() as (connection, cursor):
+            # executemany rewrites a plain INSERT ... VALUES into multi-row statements
+            while chunk:
+                cursor.executemany(
+                    """
+                    INSERT INTO lsh_signatures 
+                    (signature_hash, bucket_id, data_reference, source_id) 
+                    VALUES (%s, %s, %s, %s)
+                    """,
+                    chunk
+                )
+                chunk = list(itertools.islice(rows, chunk_size))
+            if not self._in_transaction:
+                connection.commit()
 
     def query_lsh(self, query_signature: List[str], top_n: int) -> List[Dict[str, Any]]:
         """
@@ -606,9 +988,6 @@ class MySQLDatabaseManager(DatabaseInterface):
         Returns:
             List[Dict[str, Any]]: List of matching results
         """
-        if not self._connection:
-            self.connect()
-            
         # Convert list of signature hashes to placeholders for SQL query
         placeholders = ", ".join(["%s"] * len(query_signature))
         
@@ -624,8 +1003,9 @@ class MySQLDatabaseManager(DatabaseInterface):
         
         # Execute with parameters
         params = query_signature + [top_n]
-        self._cursor.execute(query, params)
-        results = self._cursor.fetchall()
+        with self._scoped_cursor() as (_, cursor):
+            cursor.execute(query, params)
+            results = cursor.fetchall()
         
         # Format results
         return [
@@ -635,27 +1015,24 @@ class MySQLDatabaseManager(DatabaseInterface):
 
     def clear_lsh_data(self) -> None:
         """Clear all LSH data from the MySQL database."""
-        if not self._connection:
-            self.connect()
-            
-        self._cursor.execute("TRUNCATE TABLE lsh_signatures")
-        self._connection.commit()
+        with self._scoped_cursor() as (connection, cursor):
+            cursor.execute("TRUNCATE TABLE lsh_signatures")
+            connection.commit()
 
     def clear_vector_data(self) -> None:
         """Clear all vector data from MySQL and ChromaDB."""
-        if not self._connection:
-            self.connect()
-            
         # Clear MySQL vector metadata
-        self._cursor.execute("TRUNCATE TABLE vector_metadata")
-        self._connection.commit()
+        with self._scoped_cursor() as (connection, cursor):
+            cursor.execute("TRUNCATE TABLE vector_metadata")
+            connection.commit()
         
         # Clear ChromaDB if initialized
         if self.vector_db:
             try:
                 # Get all vector IDs from MySQL first
-                self._cursor.execute("SELECT chroma_id FROM vector_metadata")
-                results = self._cursor.fetchall()
+                with self._scoped_cursor() as (_, cursor):
+                    cursor.execute("SELECT chroma_id FROM vector_metadata")
+                    results = cursor.fetchall()
                 chroma_ids = [row["chroma_id"] for row in results]
                 
                 # Delete by IDs if we have any
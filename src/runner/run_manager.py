@@ -5,7 +5,7 @@ from multiprocessing import Pool
 from typing import List, Dict, Any, Tuple
 from langgraph.graph import StateGraph
 
-from runner.logger import Logger
+from runner.logger import Logger, flush_conversations
 from runner.task import Task
 from runner.database_manager import DatabaseManager
 from runner.statistics_manager import StatisticsManager
@@ -124,9 +124,13 @@ class RunManager:
                                     tentative_schema=DatabaseManager().get_db_schema(), 
                                     execution_history=[])
         thread_config["recursion_limit"] = 50
-        for state_dict in team.stream(state_values, thread_config, stream_mode="values"):
-            logger.log("________________________________________________________________________________________")
-            continue
+        try:
+            for state_dict in team.stream(state_values, thread_config, stream_mode="values"):
+                logger.log("________________________________________________________________________________________")
+                continue
+        finally:
+            # Pool workers exit through os._exit, which skips atexit, so write queued conversations now
+            flush_conversations()
         system_state = SystemState(**state_dict)
         return system_state, task.db_id, task.question_id
 
@@ -5,7 +5,7 @@ from threading import Lock
 from pathlib import Path
 from dotenv import load_dotenv
 from langchain_chroma import Chroma
-from typing import Callable, Dict, List, Any, Optional, Tuple
+from typing import Callable, Dict, Iterable, List, Any, Optional, Tuple
 import time
 import sqlite3
 
@@ -15,9 +15,10 @@ from database_utils.schema_generator import DatabaseSchemaGenerator
 from database_utils.execution import execute_sql, compare_sqls, validate_sql_query, aggregate_sqls, get_execution_status, subprocess_sql_executor
 from database_utils.db_info import get_db_all_tables, get_table_all_columns, get_db_schema
 from database_utils.sql_parser import get_sql_tables, get_sql_columns_dict, get_sql_condition_literals
-from database_utils.db_values.search import query_lsh as db_query_lsh
+from database_utils.db_values.search import query_lsh as db_query_lsh, load_db_lsh
+from database_utils.db_values.preprocess import LSH_FILE_SUFFIXES
 from database_utils.db_catalog.search import query_vector_db as db_query_vector_db
-from database_utils.db_catalog.preprocess import EMBEDDING_FUNCTION
+from database_utils.db_catalog.preprocess import get_embedding_function
 from database_utils.db_catalog.csv_utils import load_tables_description
 
 load_dotenv(override=True)
@@ -113,14 +114,14 @@ class SQLiteDatabaseManager(DatabaseInterface):
             self._connection.rollback()
 
     def set_lsh(self) -> str:
-        """Sets the LSH and minhashes attributes by loading from pickle files."""
+        """
+        Sets the LSH and minhashes attributes from the preprocessed files.
+        Uses the memory-mapped signature snapshot when present, falling back to the pickles.
+        """
         with self._lock:  # Thread safety for instance-level operations
             if self.lsh is None:
                 try:
-                    with (self.db_directory_path / "preprocessed" / f"{self.db_id}_lsh.pkl").open("rb") as file:
-                        self.lsh = pickle.load(file)
-                    with (self.db_directory_path / "preprocessed" / f"{self.db_id}_minhashes.pkl").open("rb") as file:
-                        self.minhashes = pickle.load(file)
+                    self.lsh, self.minhashes = load_db_lsh(str(self.db_directory_path))
                     return "success"
                 except Exception as e:
                     self.lsh = "error"
@@ -137,7 +138,7 @@ class SQLiteDatabaseManager(DatabaseInterface):
         if self.vector_db is None:
             try:
                 vector_db_path = self.db_directory_path / "context_vector_db"
-                self.vector_db = Chroma(persist_directory=str(vector_db_path), embedding_function=EMBEDDING_FUNCTION)
+                self.vector_db = Chroma(persist_directory=str(vector_db_path), embedding_function=get_embedding_function())
                 return "success"
             except Exception as e:
                 self.vector_db = "error"
@@ -258,6 +259,18 @@ class SQLiteDatabaseManager(DatabaseInterface):
               "LSH data is managed through pickle files.")
         pass
 
+    def store_lsh_signatures_bulk(self, rows: Iterable[Tuple[str, int, str, str]], chunk_size: int = 10000) -> None:
+        """
+        Store many LSH signatures at once.
+        For SQLite implementation, this is a placeholder as LSH is stored in pickle files.
+        
+        Args:
+            rows (Iterable[Tuple[str, int, str, str]]): (signature_hash, bucket_id, data_ref, source_id) rows
+            chunk_size (int, optional): Maximum number of rows sent per batch
+        """
+        print("SQLite implementation doesn't directly support store_lsh_signatures_bulk. "
+              "LSH data is managed through pickle files.")
+
     def clear_lsh_data(self) -> None:
         """
         Clear all LSH data.
@@ -265,13 +278,11 @@ class SQLiteDatabaseManager(DatabaseInterface):
         """
         self.lsh = None
         self.minhashes = None
-        # Optional: Remove pickle files if they should be deleted
-        lsh_path = self.db_directory_path / "preprocessed" / f"{self.db_id}_lsh.pkl"
-        minhash_path = self.db_directory_path / "preprocessed" / f"{self.db_id}_minhashes.pkl"
-        if lsh_path.exists():
-            lsh_path.unlink()
-        if minhash_path.exists():
-            minhash_path.unlink()
+        # Optional: Remove the preprocessed LSH files if they should be deleted
+        for suffix in LSH_FILE_SUFFIXES:
+            lsh_file_path = self.db_directory_path / "preprocessed" / f"{self.db_id}{suffix}"
+            if lsh_file_path.exists():
+                lsh_file_path.unlink()
 
     def clear_vector_data(self) -> None:
         """
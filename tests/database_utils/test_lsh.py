@@ -0,0 +1,65 @@
+import unittest
+import tempfile
+import sqlite3
+from pathlib import Path
+
+from datasketch import MinHashLSH
+
+from src.database_utils.db_values.preprocess import make_db_lsh
+from src.database_utils.db_values.search import (
+    NumpyLSH, SignatureMinHashes, load_db_lsh, invalidate_lsh_cache, query_lsh
+)
+
+class TestDatabaseLSH(unittest.TestCase):
+    """Test cases for building and reloading the value LSH"""
+
+    def setUp(self):
+        """Set up test environment"""
+        # Create a tiny SQLite database in the <db_id>/<db_id>.sqlite layout
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_id = "test_db"
+        self.db_dir = Path(self.temp_dir.name) / self.db_id
+        self.db_dir.mkdir()
+        conn = sqlite3.connect(str(self.db_dir / f"{self.db_id}.sqlite"))
+        conn.execute("CREATE TABLE schools (id INTEGER PRIMARY KEY, city TEXT)")
+        conn.executemany("INSERT INTO schools (city) VALUES (?)",
+                         [("San Francisco",), ("Los Angeles",), ("Sacramento",), ("Fresno",)])
+        conn.commit()
+        conn.close()
+        self.preprocessed_path = self.db_dir / "preprocessed"
+        invalidate_lsh_cache()
+
+    def tearDown(self):
+        """Clean up after test"""
+        invalidate_lsh_cache()
+        self.temp_dir.cleanup()
+
+    def _assert_finds_city(self, lsh, minhashes):
+        result = query_lsh(lsh, minhashes, "San Francisco", signature_size=20, top_n=1)
+        self.assertEqual(result, {"schools": {"city": ["San Francisco"]}})
+
+    def test_load_snapshot(self):
+        """Test that the columnar snapshot is loaded without the pickles"""
+        make_db_lsh(str(self.db_dir), verbose=False)
+        self.assertFalse((self.preprocessed_path / f"{self.db_id}_lsh.pkl").exists())
+
+        lsh, minhashes = load_db_lsh(str(self.db_dir))
+        self.assertIsInstance(lsh, NumpyLSH)
+        self.assertIsInstance(minhashes, SignatureMinHashes)
+        self.assertEqual(len(minhashes), 4)
+        self._assert_finds_city(lsh, minhashes)
+
+    def test_legacy_pickle_fallback(self):
+        """Test that databases preprocessed before the snapshot still load from the pickles"""
+        make_db_lsh(str(self.db_dir), verbose=False, legacy_pickles=True)
+        for snapshot_file in self.preprocessed_path.glob(f"{self.db_id}_minhashes.*"):
+            if snapshot_file.suffix != ".pkl":
+                snapshot_file.unlink()
+
+        lsh, minhashes = load_db_lsh(str(self.db_dir))
+        self.assertIsInstance(lsh, MinHashLSH)
+        self.assertIsInstance(minhashes, dict)
+        self._assert_finds_city(lsh, minhashes)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import os
+import unittest
+from unittest.mock import patch
+
+from src.llm.cache import ResponseCache, _get_cache, get_response_cache, make_cache_key
+
+class TestResponseCache(unittest.TestCase):
+    """Test cases for the LLM response cache"""
+
+    def setUp(self):
+        """Set up test environment"""
+        _get_cache.cache_clear()
+        self.key = make_cache_key("ChatOpenAI:gpt-4o", "SELECT 1", {"question": "q"}, 0)
+
+    def tearDown(self):
+        """Clean up after test"""
+        _get_cache.cache_clear()
+
+    def test_hit_and_miss(self):
+        """Test that stored responses are returned as copies and other keys miss"""
+        cache = ResponseCache(maxsize=4)
+        self.assertIsNone(cache.get(self.key))
+
+        response = {"SQL": "SELECT 1"}
+        cache.set(self.key, response)
+        cached = cache.get(self.key)
+        self.assertEqual(cached, response)
+        self.assertIsNot(cached, response)
+
+        other_key = make_cache_key("ChatOpenAI:gpt-4o", "SELECT 1", {"question": "other"}, 0)
+        self.assertNotEqual(other_key, self.key)
+        self.assertIsNone(cache.get(other_key))
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted"""
+        cache = ResponseCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+
+    def test_llm_cache_gate(self):
+        """Test that the cache is only used when enabled and for temperature 0"""
+        with patch.dict(os.environ, {"LLM_CACHE": "0"}):
+            self.assertIsNone(get_response_cache(0))
+
+        with patch.dict(os.environ, {"LLM_CACHE": "1"}):
+            os.environ.pop("LLM_CACHE_PATH", None)
+            cache = get_response_cache(0)
+            self.assertIsInstance(cache, ResponseCache)
+            self.assertIs(get_response_cache(0.0), cache)
+            self.assertIsNone(get_response_cache(0.7))
+            self.assertIsNone(get_response_cache(None))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import tempfile
+import yaml
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+
+from src.runner.database_manager import DatabaseManager, _manager_cache
+from src.runner.sqlite_manager import SQLiteDatabaseManager
+from src.runner.mysql_manager import MySQLDatabaseManager
+
+class TestDatabaseManager(unittest.TestCase):
+    """Test cases for DatabaseManager's manager reuse"""
+
+    def setUp(self):
+        """Set up test environment"""
+        # Create a temporary directory for test configs
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.config_dir = Path(self.temp_dir.name)
+        _manager_cache.clear()
+
+        # Create SQLite test config
+        self.sqlite_config_path = self.config_dir / "sqlite_config.yaml"
+        with open(self.sqlite_config_path, "w") as f:
+            yaml.dump({"database": {"type": "sqlite", "sqlite_settings": {"mode": "test", "id": "test_db"}}}, f)
+
+        # Create MySQL test config
+        self.mysql_config_path = self.config_dir / "mysql_config.yaml"
+        with open(self.mysql_config_path, "w") as f:
+            yaml.dump({"database": {"type": "mysql", "mysql_settings": {"database": "test_db", "db_id": "test_db_id"}}}, f)
+
+    def tearDown(self):
+        """Clean up after test"""
+        _manager_cache.clear()
+        patch.stopall()
+        self.temp_dir.cleanup()
+
+    @patch('src.runner.sqlite_manager.SQLiteDatabaseManager')
+    def test_reuse_until_config_changes(self, mock_sqlite_manager):
+        """Test that managers are shared until the config file changes"""
+        mock_sqlite_manager.side_effect = lambda **kwargs: MagicMock(spec=SQLiteDatabaseManager)
+
+        # Cache hit: the second call returns the same manager without building another
+        first = DatabaseManager(config_path=str(self.sqlite_config_path))
+        self.assertIs(DatabaseManager(config_path=str(self.sqlite_config_path)), first)
+        mock_sqlite_manager.assert_called_once()
+
+        # Editing the config builds a new manager and replaces the stale entry
+        with open(self.sqlite_config_path, "w") as f:
+            yaml.dump({"database": {"type": "sqlite", "sqlite_settings": {"mode": "dev", "id": "other_db"}}}, f)
+        second = DatabaseManager(config_path=str(self.sqlite_config_path))
+        self.assertIsNot(second, first)
+        self.assertEqual(mock_sqlite_manager.call_count, 2)
+        self.assertEqual(len(_manager_cache), 1)
+
+    @patch.dict('os.environ', {'DB_ROOT_PATH': '/tmp'})
+    def test_mysql_transactions_are_isolated(self):
+        """Test that a transaction on one holder does not capture another holder's queries"""
+        mock_pool = MagicMock()
+        connections = []
+        def new_connection():
+            connection = MagicMock()
+            connection.cursor.return_value.rowcount = 1
+            connections.append(connection)
+            return connection
+        mock_pool.connection.side_effect = new_connection
+        patch('src.runner.mysql_manager.PooledDB', return_value=mock_pool).start()
+        patch.object(MySQLDatabaseManager, "_pool", None).start()
+
+        first = DatabaseManager(config_path=str(self.mysql_config_path))
+        second = DatabaseManager(config_path=str(self.mysql_config_path))
+        self.assertIsNot(first, second)
+
+        # The second holder's write runs and commits on its own pooled connection
+        first.begin_transaction()
+        result = second.execute_sql("INSERT INTO test_table VALUES (1)")
+        self.assertTrue(result["success"])
+        transaction_connection, write_connection = connections
+        write_connection.commit.assert_called_once()
+
+        # Rolling back the first holder's transaction leaves that write alone
+        first.rollback()
+        transaction_connection.rollback.assert_called_once()
+        write_connection.rollback.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
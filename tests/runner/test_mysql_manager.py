@@ -7,7 +7,7 @@ from pathlib import Path
 import pymysql
 from pymysql.cursors import DictCursor
 
-from src.runner.mysql_manager import MySQLDatabaseManager
+from src.runner.mysql_manager import MySQLDatabaseManager, as_dicts
 
 @patch.dict('os.environ', {
     'DB_IP': 'localhost',
@@ -24,8 +24,9 @@ class TestMySQLDatabaseManager(unittest.TestCase):
         self.db_name = "test_db"
         self.db_id = "test_db_id"
         
-        # Create patch for PooledDB
+        # Create patch for PooledDB; the pool is shared class state, so every test builds its own
         self.mock_pooled_db = patch('src.runner.mysql_manager.PooledDB').start()
+        patch.object(MySQLDatabaseManager, "_pool", None).start()
         
         # Mock the pool connection
         self.mock_pool = MagicMock()
@@ -140,13 +141,58 @@ class TestMySQLDatabaseManager(unittest.TestCase):
         self.assertEqual(result["rowcount"], 0)
         self.assertEqual(result["error"], error_msg)
     
+    def test_iter_sql(self):
+        """Test streaming SELECT execution"""
+        self.mock_cursor.fetchmany.side_effect = [[{"id": 1}, {"id": 2}], [{"id": 3}], []]
+        
+        with patch.object(MySQLDatabaseManager, "_pool", self.mock_pool):
+            batches = list(self.manager.iter_sql("SELECT id FROM test_table", fetch_size=2))
+        
+        # Rows arrive in batches from an unbuffered cursor, and the connection goes back to the pool
+        self.assertEqual(batches, [[{"id": 1}, {"id": 2}], [{"id": 3}]])
+        self.mock_connection.cursor.assert_called_once_with(pymysql.cursors.SSDictCursor)
+        self.mock_cursor.fetchmany.assert_called_with(2)
+        self.mock_cursor.close.assert_called_once()
+        self.mock_connection.close.assert_called_once()
+
+    def test_execute_sql_rows(self):
+        """Test SELECT execution returning tuple rows"""
+        self.mock_cursor.description = (("id",), ("name",))
+        self.mock_cursor.fetchall.return_value = ((1, "a"), (2, "b"))
+        self.mock_cursor.rowcount = 2
+
+        with patch.object(MySQLDatabaseManager, "_pool", self.mock_pool):
+            result = self.manager.execute_sql_rows("SELECT id, name FROM test_table")
+
+        # Column names are listed once; as_dicts rebuilds the execute_sql row shape
+        self.assertTrue(result["success"])
+        self.assertEqual(result["columns"], ["id", "name"])
+        self.assertEqual(result["rows"], ((1, "a"), (2, "b")))
+        self.mock_connection.cursor.assert_called_once_with(pymysql.cursors.Cursor)
+        self.assertEqual(as_dicts(result), [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}])
+
+    def test_execute_many(self):
+        """Test batched parameterized execution"""
+        self.mock_cursor.rowcount = 2
+        rows = [(1, "a"), (2, "b")]
+
+        with patch.object(MySQLDatabaseManager, "_pool", self.mock_pool):
+            result = self.manager.execute_many("INSERT INTO test_table VALUES (%s, %s)", rows)
+
+        # All parameter tuples go to one executemany call, committed once
+        self.assertTrue(result["success"])
+        self.assertEqual(result["rowcount"], 2)
+        self.mock_cursor.executemany.assert_called_once_with("INSERT INTO test_table VALUES (%s, %s)", rows)
+        self.mock_connection.commit.assert_called_once()
+
     def test_get_db_schema(self):
         """Test schema retrieval"""
-        # Mock SHOW TABLES result
-        self.mock_cursor.fetchall.side_effect = [
-            [{"Tables_in_test_db": "table1"}, {"Tables_in_test_db": "table2"}],
-            [{"Field": "id"}, {"Field": "name"}],
-            [{"Field": "id"}, {"Field": "value"}]
+        # Mock information_schema.columns result
+        self.mock_cursor.fetchall.return_value = [
+            {"table_name": "table1", "column_name": "id"},
+            {"table_name": "table1", "column_name": "name"},
+            {"table_name": "table2", "column_name": "id"},
+            {"table_name": "table2", "column_name": "value"}
         ]
         
         # Call get_db_schema
@@ -158,14 +204,26 @@ class TestMySQLDatabaseManager(unittest.TestCase):
         self.assertEqual(schema["table1"], ["id", "name"])
         self.assertEqual(schema["table2"], ["id", "value"])
         
-        # Check SQL calls
-        self.assertEqual(self.mock_cursor.execute.call_count, 3)
-        calls = [
-            call("SHOW TABLES"),
-            call("DESCRIBE `table1`"),
-            call("DESCRIBE `table2`")
-        ]
-        self.mock_cursor.execute.assert_has_calls(calls, any_order=False)
+        # Check all columns were fetched in a single query
+        self.mock_cursor.execute.assert_called_once()
+        args, kwargs = self.mock_cursor.execute.call_args
+        self.assertIn("information_schema.columns", args[0])
+        self.assertEqual(args[1], (self.db_name,))
+    
+    def test_get_db_schema_cached(self):
+        """Test schema caching and invalidation"""
+        self.mock_cursor.fetchall.return_value = [{"table_name": "table1", "column_name": "id"}]
+        
+        # Second call is served from the cache, and edits to a result don't leak into it
+        schema = self.manager.get_db_schema()
+        schema["table1"].append("extra")
+        self.assertEqual(self.manager.get_db_schema(), {"table1": ["id"]})
+        self.mock_cursor.execute.assert_called_once()
+        
+        # Invalidation forces a new query
+        self.manager.invalidate_schema()
+        self.manager.get_db_schema()
+        self.assertEqual(self.mock_cursor.execute.call_count, 2)
     
     def test_transactions(self):
         """Test transaction methods"""
@@ -180,16 +238,20 @@ class TestMySQLDatabaseManager(unittest.TestCase):
         self.mock_connection.commit.reset_mock()
         
         # Test rollback
+        self.manager.begin_transaction()
         self.manager.rollback()
         self.mock_connection.rollback.assert_called_once()
+        
+        # The connection is only held while a transaction is open
+        self.assertIsNone(self.manager._connection)
     
     def test_ensure_schema_exists(self):
         """Test schema creation for LSH and vectors"""
         # Call _ensure_schema_exists
         self.manager._ensure_schema_exists()
         
-        # Verify the CREATE TABLE statements were executed
-        self.assertEqual(self.mock_cursor.execute.call_count, 2)
+        # Verify the CREATE TABLE statements and the vector column check were executed
+        self.assertEqual(self.mock_cursor.execute.call_count, 3)
         
         # Check SQL contains expected CREATE TABLE statements
         calls = self.mock_cursor.execute.call_args_list
@@ -266,6 +328,31 @@ class TestMySQLDatabaseManager(unittest.TestCase):
         # Verify commit was called
         self.mock_connection.commit.assert_called_once()
     
+    def test_store_vectors_bulk(self):
+        """Test batched vector storage"""
+        self.manager._ensure_schema_exists = MagicMock()
+        self.manager._init_vector_db = MagicMock()
+        self.manager.vector_db = MagicMock()
+        vectors = [[0.1, 0.2], [0.3, 0.4], [0.5, 0.6]]
+        metadatas = [{"key": i, "text_chunk_id": f"chunk{i}"} for i in range(3)]
+
+        result_ids = self.manager.store_vectors_bulk(vectors, metadatas, ["test_source"] * 3)
+
+        # Verify all vectors went to ChromaDB in one call
+        self.assertEqual(len(result_ids), 3)
+        self.manager.vector_db.add_documents.assert_called_once()
+        args, kwargs = self.manager.vector_db.add_documents.call_args
+        self.assertEqual(kwargs["embeddings"], vectors)
+        self.assertEqual(kwargs["ids"], result_ids)
+
+        # Verify metadata was stored in MySQL with one batched insert and a single commit
+        self.mock_cursor.executemany.assert_called_once()
+        args, kwargs = self.mock_cursor.executemany.call_args
+        self.assertIn("INSERT INTO vector_metadata", args[0])
+        self.assertEqual([row[0] for row in args[1]], result_ids)
+        self.assertEqual(args[1][1][2], "chunk1")  # text_chunk_id
+        self.mock_connection.commit.assert_called_once()
+
     def test_query_vector_db_no_filter(self):
         """Test vector querying without filters"""
         # Mock dependencies
@@ -344,9 +431,10 @@ class TestMySQLDatabaseManager(unittest.TestCase):
         self.assertIn("SELECT chroma_id FROM vector_metadata", args[0])
         self.assertIn("source_id = %s", args[0])
         self.assertIn("text_chunk_id = %s", args[0])
-        self.assertIn("JSON_CONTAINS(metadata, %s, '$.category')", args[0])
+        self.assertIn("JSON_CONTAINS(metadata, %s, %s)", args[0])
         self.assertEqual(args[1][0], "test_source")
         self.assertEqual(args[1][1], "chunk123")
+        self.assertEqual(args[1][3], "$.category")
         
         # Verify ChromaDB query was called with the filtered IDs
         self.manager.vector_db.query.assert_called_once()
@@ -385,7 +473,21 @@ class TestMySQLDatabaseManager(unittest.TestCase):
         
         # Verify commit was called
         self.mock_connection.commit.assert_called_once()
-    
+
+    def test_store_lsh_signatures_bulk(self):
+        """Test batched LSH signature storage"""
+        self.manager._ensure_schema_exists = MagicMock()
+        rows = [(str(i), i % 20, f"ref{i}", "test_source") for i in range(5)]
+
+        self.manager.store_lsh_signatures_bulk(rows, chunk_size=2)
+
+        # Verify the rows were sent in chunks with a single commit
+        self.assertEqual(self.mock_cursor.executemany.call_count, 3)
+        args, kwargs = self.mock_cursor.executemany.call_args_list[0]
+        self.assertIn("INSERT INTO lsh_signatures", args[0])
+        self.assertEqual(args[1], rows[:2])
+        self.mock_connection.commit.assert_called_once()
+
     def test_query_lsh(self):
         """Test LSH querying"""
         # Mock cursor fetchall results
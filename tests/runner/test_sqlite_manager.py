@@ -123,19 +123,13 @@ class TestSQLiteDatabaseManager(unittest.TestCase):
         
         self.manager.disconnect()
     
-    @patch('src.runner.sqlite_manager.pickle.load')
-    def test_set_lsh(self, mock_pickle_load):
+    @patch('src.runner.sqlite_manager.load_db_lsh')
+    def test_set_lsh(self, mock_load_db_lsh):
         """Test LSH loading"""
-        # Mock the pickle load operation
+        # Mock the preprocessed LSH loader
         mock_lsh = MagicMock()
         mock_minhashes = MagicMock()
-        mock_pickle_load.side_effect = [mock_lsh, mock_minhashes]
-        
-        # Create empty pickle files
-        lsh_path = self.preprocessed_dir / f"{self.db_id}_lsh.pkl"
-        minhash_path = self.preprocessed_dir / f"{self.db_id}_minhashes.pkl"
-        lsh_path.touch()
-        minhash_path.touch()
+        mock_load_db_lsh.return_value = (mock_lsh, mock_minhashes)
         
         # Test LSH loading
         result = self.manager.set_lsh()
@@ -144,6 +138,7 @@ class TestSQLiteDatabaseManager(unittest.TestCase):
         self.assertEqual(result, "success")
         self.assertEqual(self.manager.lsh, mock_lsh)
         self.assertEqual(self.manager.minhashes, mock_minhashes)
+        mock_load_db_lsh.assert_called_once_with(str(self.manager.db_directory_path))
     
     @patch('src.runner.sqlite_manager.Chroma')
     def test_set_vector_db(self, mock_chroma):